@@ -0,0 +1,97 @@
+"""
+Concurrent catalog reads through the blocking and the async unit of work, e.g.
+
+    python -m benchmarks.async_db --requests 2000 --concurrency 50
+
+Each "request" is what `GET /electives/` does against the database.  The
+blocking variant calls `UnitOfWork` from a coroutine the way the async
+routers used to, so every round-trip stalls the event loop; the async
+variant awaits `AsyncUnitOfWork` and lets the other requests run meanwhile.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, List
+
+from sqlalchemy import func, select
+
+from src.infrastructure.db.session import async_engine
+from src.infrastructure.db.uow import AsyncUnitOfWork, UnitOfWork
+
+# extra server-side wait per request, standing in for the network distance
+# to a database that is not on the same host
+_latency = 0.0
+
+
+async def _blocking_read() -> None:
+    with UnitOfWork() as uow:
+        if _latency:
+            uow.session.execute(select(func.pg_sleep(_latency)))
+        uow.electives.list()
+
+
+async def _async_read() -> None:
+    async with AsyncUnitOfWork() as uow:
+        if _latency:
+            await uow.session.execute(select(func.pg_sleep(_latency)))
+        await uow.electives.list()
+
+
+async def _run(
+    read: Callable[[], Awaitable[None]], requests: int, concurrency: int
+) -> List[float]:
+    latencies: List[float] = []
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with gate:
+            started = time.perf_counter()
+            await read()
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies
+
+
+def _report(name: str, latencies: List[float], elapsed: float) -> None:
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p95 = latencies[int(len(latencies) * 0.95)] * 1000
+    print(
+        f"{name:>9}: {len(latencies) / elapsed:8.0f} req/s"
+        f"  p50 {p50:7.1f} ms  p95 {p95:7.1f} ms"
+    )
+
+
+async def _main(requests: int, concurrency: int) -> None:
+    # warm both pools so connection setup is not measured
+    await _run(_blocking_read, concurrency, concurrency)
+    await _run(_async_read, concurrency, concurrency)
+
+    for name, read in (("blocking", _blocking_read), ("async", _async_read)):
+        started = time.perf_counter()
+        latencies = await _run(read, requests, concurrency)
+        _report(name, latencies, time.perf_counter() - started)
+    await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=0.0,
+        help="emulated DB round-trip per request",
+    )
+    args = parser.parse_args()
+
+    global _latency
+    _latency = args.latency_ms / 1000
+    asyncio.run(_main(args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
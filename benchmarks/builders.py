@@ -0,0 +1,114 @@
+"""
+Microseconds per entity for each way of building one from a row, e.g.
+
+    python -m benchmarks.builders --rows 100000
+
+Compares `rows.entity_builder` with `model_construct` and plain validation
+on one sample row per entity the repositories read, so the choice in
+`rows.py` can be rechecked after a pydantic upgrade.  No database needed.
+"""
+
+import argparse
+import timeit
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Tuple, Type
+from uuid import uuid4
+
+from pydantic import BaseModel, VERSION
+
+from src.domain.entities import (
+    Allocation,
+    Choice,
+    ChoiceSubmission,
+    Course,
+    Elective,
+    User,
+)
+from src.infrastructure.db.repositories.rows import entity_builder
+
+_NOW = datetime.now(timezone.utc)
+
+SAMPLES: Dict[Type[BaseModel], Dict[str, Any]] = {
+    User: dict(
+        id=uuid4(),
+        sso_id="i.ivanov",
+        name="Ivan Ivanov",
+        email="i.ivanov@innopolis.university",
+        role="Student",
+        course_id=uuid4(),
+        first_choice_at=_NOW,
+        created_at=_NOW,
+        updated_at=_NOW,
+    ),
+    Course: dict(
+        id=uuid4(),
+        name="B24",
+        tech_quota=2,
+        hum_quota=1,
+        created_at=_NOW,
+        updated_at=_NOW,
+    ),
+    Elective: dict(
+        id=uuid4(),
+        code="TECH-101",
+        title="Compilers",
+        description=None,
+        instructor="I. Instructor",
+        category="Tech",
+        course_ids=[uuid4(), uuid4()],
+        created_at=_NOW,
+        updated_at=_NOW,
+    ),
+    Choice: dict(
+        id=uuid4(),
+        user_id=uuid4(),
+        elective_id=uuid4(),
+        priority=1,
+        created_at=_NOW,
+        updated_at=_NOW,
+    ),
+    ChoiceSubmission: dict(
+        user_id=uuid4(),
+        key="retry-1",
+        elective_ids=[uuid4(), uuid4()],
+        version=3,
+        created_at=_NOW,
+    ),
+    Allocation: dict(run_id=uuid4(), user_id=uuid4(), elective_id=uuid4(), priority=1),
+}
+
+
+def ways(entity: Type[BaseModel]) -> Dict[str, Callable[[Tuple[Any, ...]], Any]]:
+    names = tuple(SAMPLES[entity])
+    fields_set = set(names)
+    return {
+        "entity_builder": entity_builder(entity, names),
+        "model_construct": lambda row: entity.model_construct(
+            _fields_set=fields_set.copy(), **dict(zip(names, row))
+        ),
+        "model_validate": lambda row: entity.model_validate(dict(zip(names, row))),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"pydantic {VERSION}, best of {args.repeat}, µs per entity")
+    columns = ("entity_builder", "model_construct", "model_validate")
+    print(f"{'entity':<18}" + "".join(f" {c:>16}" for c in columns))
+    for entity, sample in SAMPLES.items():
+        row = tuple(sample.values())
+        timings = []
+        for build in ways(entity).values():
+            best = min(
+                timeit.repeat(lambda: build(row), number=args.rows, repeat=args.repeat)
+            )
+            timings.append(best / args.rows * 1e6)
+        print(f"{entity.__name__:<18}" + "".join(f" {t:>16.2f}" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+"""
+Bulk synthetic catalog and choices for benchmarks, e.g.
+
+    python -m benchmarks.data --students 20000 --electives 300 --courses 8
+
+Elective popularity follows a Zipf law, so a few electives collect most of
+the choices the way real ones do.  Every generated row is tagged (`bench-`
+sso ids and course names, `BENCH` elective codes) and `--clear` removes
+exactly those rows; the seeded fake students are left alone.  Rows are
+written with COPY; fifty thousand students with five choices each take
+about twenty seconds, most of it foreign-key checks.
+"""
+
+import argparse
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID, uuid4
+
+import numpy as np
+import psycopg
+from sqlalchemy import make_url, text
+
+from src.config import settings
+from src.domain.entities import User
+from src.domain.entities.choice import choice_id
+from src.infrastructure.db.session import engine
+from src.infrastructure.db.uow import UnitOfWork
+
+STUDENT_PREFIX = "bench-"
+ADMIN_SSO_ID = "bench-admin"
+ELECTIVE_PREFIX = "BENCH"
+COURSE_PREFIX = "bench-"
+
+# students are sampled in blocks so the Gumbel keys stay a few MB
+_BLOCK = 4096
+
+
+@dataclass
+class Dataset:
+    students: int
+    electives: int
+    courses: int
+    choices: int
+    seconds: float
+
+
+def zipf_weights(n: int, skew: float, rng: np.random.Generator) -> np.ndarray:
+    """Normalised `1 / rank**skew` popularity, ranks shuffled over `n` items."""
+    weights = 1.0 / np.arange(1, n + 1, dtype=np.float64) ** skew
+    rng.shuffle(weights)
+    return weights / weights.sum()
+
+
+def sample_choices(
+    students: int, weights: np.ndarray, k: int, rng: np.random.Generator
+) -> Iterator[np.ndarray]:
+    """
+    Blocks of `k` distinct item indexes per student, best-liked first,
+    drawn without replacement in proportion to `weights`.
+
+    Adding Gumbel noise to the log-weights and keeping the top `k` is the
+    same as drawing one item at a time without replacement, but vectorised
+    over a whole block of students.
+    """
+    k = min(k, len(weights))
+    log_w = np.log(weights)
+    for start in range(0, students, _BLOCK):
+        n = min(_BLOCK, students - start)
+        keys = log_w + rng.gumbel(size=(n, len(weights)))
+        top = np.argpartition(-keys, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(keys, top, axis=1), axis=1)
+        yield np.take_along_axis(top, order, axis=1)
+
+
+def _copy(cursor, table: str, columns: Sequence[str], rows) -> None:
+    with cursor.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+        for row in rows:
+            copy.write_row(row)
+
+
+def clear() -> None:
+    """Delete every generated row."""
+    with engine.begin() as conn:
+        params = {
+            "students": STUDENT_PREFIX + "%",
+            "electives": ELECTIVE_PREFIX + "%",
+            "courses": COURSE_PREFIX + "%",
+        }
+        conn.execute(
+            text(
+                "DELETE FROM choices WHERE user_id IN"
+                " (SELECT id FROM users WHERE sso_id LIKE :students)"
+                " OR elective_id IN"
+                " (SELECT id FROM electives WHERE code LIKE :electives)"
+            ),
+            params,
+        )
+        conn.execute(
+            text(
+                "DELETE FROM user_rankings WHERE user_id IN"
+                " (SELECT id FROM users WHERE sso_id LIKE :students)"
+            ),
+            params,
+        )
+        conn.execute(
+            text(
+                "DELETE FROM elective_courses WHERE elective_id IN"
+                " (SELECT id FROM electives WHERE code LIKE :electives)"
+                " OR course_id IN (SELECT id FROM courses WHERE name LIKE :courses)"
+            ),
+            params,
+        )
+        conn.execute(text("DELETE FROM electives WHERE code LIKE :electives"), params)
+        conn.execute(text("DELETE FROM courses WHERE name LIKE :courses"), params)
+        conn.execute(text("DELETE FROM users WHERE sso_id LIKE :students"), params)
+
+
+def generate(
+    *,
+    students: int,
+    electives: int,
+    courses: int,
+    choices: int = 5,
+    skew: float = 1.1,
+    seed: int = 0,
+) -> Dataset:
+    """
+    Insert `students` students (plus one admin), `electives` electives
+    offered to 1–3 of `courses` courses each, and `choices` Zipf-skewed
+    choices per student among the electives of their course.  Call `clear()` first to replace an earlier set.
+    """
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    now = datetime.now(timezone.utc)
+
+    course_ids = [uuid4() for _ in range(courses)]
+    elective_ids = [uuid4() for _ in range(electives)]
+    student_ids = [uuid4() for _ in range(students)]
+    # spread sign-ups over a semester so time-ordered pages look real
+    joined = rng.integers(0, 120 * 24 * 3600, size=students)
+    weights = zipf_weights(electives, skew, rng)
+    offered_to = [
+        rng.choice(courses, size=min(courses, rng.integers(1, 4)), replace=False)
+        for _ in elective_ids
+    ]
+    student_course = rng.integers(0, courses, size=students)
+    per_course = np.zeros(courses, dtype=np.int64)
+    for offered in offered_to:
+        per_course[offered] += 1
+
+    # COPY through psycopg 3 directly; the sync engine may be on psycopg2
+    conninfo = (
+        make_url(settings.DATABASE_URL)
+        .set(drivername="postgresql")
+        .render_as_string(hide_password=False)
+    )
+    with psycopg.connect(conninfo) as conn:
+        with conn.cursor() as cur:
+            _copy(
+                cur,
+                "courses",
+                ("id", "name", "tech_quota", "hum_quota", "created_at", "updated_at"),
+                (
+                    (cid, f"{COURSE_PREFIX}{i:03d}", 3, 2, now, now)
+                    for i, cid in enumerate(course_ids)
+                ),
+            )
+            _copy(
+                cur,
+                "electives",
+                (
+                    "id",
+                    "code",
+                    "title",
+                    "description",
+                    "instructor",
+                    "category",
+                    "created_at",
+                    "updated_at",
+                ),
+                (
+                    (
+                        eid,
+                        f"{ELECTIVE_PREFIX}{i:05d}",
+                        f"Elective {i}",
+                        f"Synthetic elective number {i}",
+                        f"Instructor {i % 97}",
+                        "Tech" if i % 5 < 3 else "Hum",
+                        now,
+                        now,
+                    )
+                    for i, eid in enumerate(elective_ids)
+                ),
+            )
+            _copy(
+                cur,
+                "elective_courses",
+                ("elective_id", "course_id"),
+                (
+                    (eid, course_ids[c])
+                    for eid, offered in zip(elective_ids, offered_to)
+                    for c in offered
+                ),
+            )
+            _copy(
+                cur,
+                "users",
+                (
+                    "id",
+                    "sso_id",
+                    "name",
+                    "email",
+                    "role",
+                    "course_id",
+                    "created_at",
+                    "updated_at",
+                ),
+                _users(
+                    student_ids,
+                    [course_ids[c] for c in student_course.tolist()],
+                    joined,
+                    now,
+                ),
+            )
+            _copy(
+                cur,
+                "choices",
+                (
+                    "id",
+                    "user_id",
+                    "elective_id",
+                    "priority",
+                    "created_at",
+                    "updated_at",
+                ),
+                _choices(
+                    student_ids,
+                    student_course,
+                    elective_ids,
+                    offered_to,
+                    weights,
+                    choices,
+                    rng,
+                    now,
+                ),
+            )
+            # the same choices as rankings, for CHOICE_STORAGE=rankings
+            cur.execute(
+                "INSERT INTO user_rankings"
+                " (user_id, elective_ids, version, replaced_at, updated_at)"
+                " SELECT user_id, array_agg(elective_id ORDER BY priority), 1,"
+                " min(created_at), max(updated_at)"
+                " FROM choices WHERE user_id = ANY(%s) GROUP BY user_id",
+                (student_ids,),
+            )
+            cur.execute(
+                "UPDATE users u SET first_choice_at = r.replaced_at"
+                " FROM user_rankings r"
+                " WHERE r.user_id = u.id AND u.id = ANY(%s)",
+                (student_ids,),
+            )
+
+    return Dataset(
+        students=students,
+        electives=electives,
+        courses=courses,
+        choices=int(np.minimum(per_course[student_course], choices).sum()),
+        seconds=round(time.perf_counter() - started, 2),
+    )
+
+
+def _users(
+    ids: List[UUID], course_ids: List[UUID], joined: np.ndarray, now: datetime
+) -> Iterator[Tuple[object, ...]]:
+    yield (
+        uuid4(),
+        ADMIN_SSO_ID,
+        "Bench Admin",
+        f"{ADMIN_SSO_ID}@example.com",
+        "Admin",
+        None,
+        now,
+        now,
+    )
+    for i, (uid, cid, ago) in enumerate(zip(ids, course_ids, joined.tolist())):
+        created = now - timedelta(seconds=ago)
+        yield (
+            uid,
+            f"{STUDENT_PREFIX}{i:07d}",
+            f"Student {i}",
+            f"{STUDENT_PREFIX}{i:07d}@example.com",
+            "Student",
+            cid,
+            created,
+            created,
+        )
+
+
+def _choices(
+    student_ids: List[UUID],
+    student_course: np.ndarray,
+    elective_ids: List[UUID],
+    offered_to: List[np.ndarray],
+    weights: np.ndarray,
+    k: int,
+    rng: np.random.Generator,
+    now: datetime,
+) -> Iterator[Tuple[object, ...]]:
+    """Each student's picks among the electives offered to their course."""
+    for course in np.unique(student_course).tolist():
+        offered = np.array([e for e, cs in enumerate(offered_to) if course in cs])
+        if not len(offered):
+            continue
+        members = np.flatnonzero(student_course == course)
+        own = weights[offered] / weights[offered].sum()
+        s = 0
+        for block in sample_choices(len(members), own, k, rng):
+            for picks in block.tolist():
+                uid = student_ids[members[s]]
+                for priority, e in enumerate(picks, start=1):
+                    eid = elective_ids[offered[e]]
+                    yield (choice_id(uid, eid), uid, eid, priority, now, now)
+                s += 1
+
+
+def students(count: Optional[int] = None) -> List[User]:
+    """Generated students in generation order, the first `count` of them."""
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text(
+                "SELECT id, sso_id, name, email, role, course_id, created_at,"
+                " updated_at"
+                " FROM users WHERE sso_id LIKE :p AND role = 'Student'"
+                " ORDER BY sso_id LIMIT :n"
+            ),
+            {"p": STUDENT_PREFIX + "%", "n": count},
+        )
+        return [User(**row._mapping) for row in rows]
+
+
+def admin() -> Optional[User]:
+    with UnitOfWork() as uow:
+        return uow.users.get_by_sso_id(ADMIN_SSO_ID)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=20_000)
+    parser.add_argument("--electives", type=int, default=300)
+    parser.add_argument("--courses", type=int, default=8)
+    parser.add_argument(
+        "--choices", type=int, default=5, choices=range(1, 6), help="per student"
+    )
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--clear", action="store_true", help="only delete generated rows"
+    )
+    args = parser.parse_args()
+
+    clear()
+    if args.clear:
+        return
+    dataset = generate(
+        students=args.students,
+        electives=args.electives,
+        courses=args.courses,
+        choices=args.choices,
+        skew=args.skew,
+        seed=args.seed,
+    )
+    print(", ".join(f"{k}={v}" for k, v in asdict(dataset).items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Replay the opening of the selection window against a running API, e.g.
+
+    python -m benchmarks.load --students 2000 --rate 100
+
+Each simulated student logs in through mock_sso (its `login_hint`
+shortcut skips the form), reads the catalog, posts Zipf-skewed choices and
+reads them back.  Students arrive as a Poisson process at `--rate` per
+second whether or not earlier ones have finished, so a slow server builds
+a queue the way it would on the real day.  Latency percentiles and error
+rates are reported per step.
+
+Needs the API on `--api` with `SSO_DISCOVERY_URL` pointing at mock_sso,
+e.g. both on localhost:
+
+    ISSUER_URL=http://localhost:8080 uvicorn app:app --port 8080  # mock_sso/
+    SSO_DISCOVERY_URL=http://localhost:8080/.well-known/openid-configuration \\
+        uvicorn src.api.app:app --port 8000
+
+Students are registered on their first login as `bench-load-000001`, ...,
+so `python -m benchmarks.data --clear` removes them again.
+"""
+
+import argparse
+import asyncio
+import json
+import ssl
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+
+from benchmarks.data import STUDENT_PREFIX, sample_choices, zipf_weights
+
+STEPS = ("login", "electives", "post_choices", "get_choices")
+
+
+class Load:
+    def __init__(self, api: str, choices: int, skew: float, seed: int) -> None:
+        self.api = api.rstrip("/")
+        self.choices = choices
+        self.skew = skew
+        self.rng = np.random.default_rng(seed)
+        self.weights: Optional[np.ndarray] = None
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        # one per client would cost ~50 ms of the generator's own CPU each
+        self.ssl = ssl.create_default_context()
+
+    def picks(self, catalog: List[dict]) -> List[str]:
+        ids = sorted(e["id"] for e in catalog)
+        if self.weights is None or len(self.weights) != len(ids):
+            # one popularity ranking for everybody, like a real cohort
+            self.weights = zipf_weights(len(ids), self.skew, self.rng)
+        block = next(sample_choices(1, self.weights, self.choices, self.rng))
+        return [ids[e] for e in block[0]]
+
+    async def _login(
+        self, http: httpx.AsyncClient, user: str
+    ) -> Optional[httpx.Response]:
+        # API -> SSO authorize -> API callback, which sets the access token
+        r = await http.get(f"{self.api}/auth/login")
+        if r.status_code != 302:
+            return r
+        authorize = httpx.URL(r.headers["location"])
+        r = await http.get(authorize.copy_add_param("login_hint", user))
+        if r.status_code != 302:
+            return r
+        r = await http.get(r.headers["location"])
+        return r if "access_token" in http.cookies else None
+
+    async def _step(self, name: str, request) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            r = await request
+        except httpx.HTTPError:
+            r = None
+        self.latencies[name].append(time.perf_counter() - started)
+        if r is None or r.status_code >= 400:
+            self.errors[name] += 1
+            return None
+        return r
+
+    async def student(self, user: str, timeout: float) -> None:
+        async with httpx.AsyncClient(timeout=timeout, verify=self.ssl) as http:
+            if await self._step("login", self._login(http, user)) is None:
+                return
+            r = await self._step("electives", http.get(f"{self.api}/electives/"))
+            if r is None:
+                return
+            picks = self.picks(r.json())
+            r = await self._step(
+                "post_choices", http.post(f"{self.api}/choices/", json=picks)
+            )
+            if r is None:
+                return
+            await self._step("get_choices", http.get(f"{self.api}/choices/"))
+
+    async def run(
+        self, students: int, rate: float, prefix: str, timeout: float
+    ) -> float:
+        started = time.perf_counter()
+        arrivals = np.cumsum(self.rng.exponential(1 / rate, size=students))
+        tasks = []
+        for i, at in enumerate(arrivals.tolist(), start=1):
+            delay = started + at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(self.student(f"{prefix}{i:06d}", timeout)))
+        await asyncio.gather(*tasks)
+        return time.perf_counter() - started
+
+    def report(self, students: int, elapsed: float) -> Dict[str, dict]:
+        summary = {}
+        for step in STEPS:
+            ms = np.array(self.latencies.get(step, [0.0])) * 1000
+            count = len(self.latencies.get(step, []))
+            summary[step] = {
+                "requests": count,
+                "errors": self.errors.get(step, 0),
+                "error_rate": (
+                    round(self.errors.get(step, 0) / count, 4) if count else 0.0
+                ),
+                "p50_ms": round(float(np.percentile(ms, 50)), 1),
+                "p95_ms": round(float(np.percentile(ms, 95)), 1),
+                "p99_ms": round(float(np.percentile(ms, 99)), 1),
+            }
+        done = students - sum(self.errors.values())
+        print(f"{students} students in {elapsed:.1f}s, {done} completed the flow")
+        print(
+            f"{'step':<13} {'requests':>8} {'errors':>7} {'err %':>6}"
+            f" {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+        )
+        for step, s in summary.items():
+            print(
+                f"{step:<13} {s['requests']:>8} {s['errors']:>7}"
+                f" {s['error_rate'] * 100:>6.1f} {s['p50_ms']:>8.1f}"
+                f" {s['p95_ms']:>8.1f} {s['p99_ms']:>8.1f}"
+            )
+        return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--api", default="http://localhost:8000")
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=50, help="arrivals per second")
+    parser.add_argument("--choices", type=int, default=5, help="per student")
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=30, help="per request")
+    parser.add_argument("--prefix", default=f"{STUDENT_PREFIX}load-")
+    parser.add_argument("--out", default=None, help="also write the report as JSON")
+    args = parser.parse_args()
+
+    load = Load(args.api, args.choices, args.skew, args.seed)
+    elapsed = asyncio.run(load.run(args.students, args.rate, args.prefix, args.timeout))
+    summary = load.report(args.students, elapsed)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(
+                {"options": vars(args), "seconds": elapsed, "steps": summary},
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Rows per second the repositories turn into entities on their list reads, e.g.
+
+    python -m benchmarks.data --students 20000
+    python -m benchmarks.mapping --repeat 5
+
+Each read is a whole-table `list()` through the sync and the async unit of
+work, so the figure covers fetching, row decoding and entity construction
+together.  The best of `--repeat` runs is reported.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from src.infrastructure.db.session import async_engine
+from src.infrastructure.db.uow import AsyncUnitOfWork, UnitOfWork
+
+TABLES = ("users", "choices", "electives", "courses")
+
+
+def _sync_read(table: str) -> int:
+    with UnitOfWork() as uow:
+        return len(getattr(uow, table).list())
+
+
+async def _async_read(table: str) -> int:
+    async with AsyncUnitOfWork() as uow:
+        return len(await getattr(uow, table).list())
+
+
+async def _best(read: Callable[[], Awaitable[int]], repeat: int) -> Dict[str, float]:
+    times: List[float] = []
+    rows = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = await read()
+        times.append(time.perf_counter() - started)
+    best = min(times)
+    return {"rows": rows, "seconds": best, "rows_per_second": rows / best}
+
+
+async def _main(repeat: int) -> None:
+    print(f"{'read':<18} {'rows':>8} {'ms':>9} {'rows/s':>11}")
+    for table in TABLES:
+        for flavour, read in (
+            ("sync", lambda: asyncio.to_thread(_sync_read, table)),
+            ("async", lambda: _async_read(table)),
+        ):
+            await read()  # warm the pool and the statement cache
+            r = await _best(read, repeat)
+            print(
+                f"{table + ' ' + flavour:<18} {r['rows']:>8}"
+                f" {r['seconds'] * 1000:>9.1f} {r['rows_per_second']:>11,.0f}"
+            )
+    await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(_main(args.repeat))
+
+
+if __name__ == "__main__":
+    main()
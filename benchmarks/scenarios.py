@@ -0,0 +1,264 @@
+"""
+End-to-end API scenarios over the synthetic data set, e.g.
+
+    python -m benchmarks.data --students 20000
+    python -m benchmarks.scenarios --iterations 500 --compare last.json
+
+Every scenario sends real requests through the app in-process (routing,
+auth, services, Postgres) and records latency percentiles, throughput and
+SQL statements per request.  Results go to a JSON file so two runs, e.g.
+before and after a change, can be compared with `--compare`.
+
+Choice writes change the generated data; regenerate it to get identical
+runs.
+"""
+
+import argparse
+import io
+import json
+import subprocess
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+from src.api.app import app
+from benchmarks import data
+from src.infrastructure.db.session import async_engine, engine
+from src.services.user_cache import user_cache
+from src.services.user_service import UserService
+
+
+@dataclass
+class Result:
+    requests: int
+    errors: int
+    per_second: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    statements: float  # per request
+
+
+class _Statements:
+    """Counts SQL statements on both engines."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        for e in (engine, async_engine.sync_engine):
+            event.listen(e, "after_cursor_execute", self._seen)
+
+    def _seen(self, *args) -> None:
+        self.count += 1
+
+
+class Bench:
+    """Clients and data the scenarios share."""
+
+    def __init__(self, students: int, seed: int) -> None:
+        self.rng = np.random.default_rng(seed)
+        self.users = data.students(students)
+        if not self.users:
+            raise SystemExit("no generated data; run `python -m benchmarks.data`")
+        tokens = UserService()
+        self.tokens = [tokens.create_access_token(u) for u in self.users]
+        self.http = TestClient(app)
+        self.admin = TestClient(app)
+        self.admin.cookies.set("access_token", tokens.create_access_token(data.admin()))
+
+        with engine.connect() as conn:
+            rows = conn.execute(
+                text(
+                    "SELECT e.id, count(c.id) FROM electives e"
+                    " LEFT JOIN choices c ON c.elective_id = e.id"
+                    " WHERE e.code LIKE :p GROUP BY e.id"
+                ),
+                {"p": data.ELECTIVE_PREFIX + "%"},
+            ).all()
+            courses = conn.execute(
+                text("SELECT id FROM courses WHERE name LIKE :p"),
+                {"p": data.COURSE_PREFIX + "%"},
+            ).scalars()
+            self.course_ids = [str(c) for c in courses]
+        self.elective_ids = [str(r[0]) for r in rows]
+        # how often each elective is picked now: new choices keep the skew
+        counts = np.array([r[1] for r in rows], dtype=np.float64) + 1
+        self.popularity = counts / counts.sum()
+
+    def client(self, i: int) -> TestClient:
+        """The client signed in as the `i`-th student (negative: from the end)."""
+        self.http.cookies.set("access_token", self.tokens[i % len(self.tokens)])
+        return self.http
+
+    def picks(self, k: int = 5) -> List[str]:
+        block = next(data.sample_choices(1, self.popularity, k, self.rng))
+        return [self.elective_ids[e] for e in block[0]]
+
+
+# ─────────────────────── scenarios ───────────────────────
+def catalog_read(bench: Bench, i: int):
+    return bench.client(i).get("/electives/")
+
+
+def choice_replace(bench: Bench, i: int):
+    return bench.client(i).post("/choices/", json=bench.picks())
+
+
+def choice_delete(bench: Bench, i: int):
+    # students from the other end, apart from the ones choice_replace uses;
+    # priority 1 exists until a student has been hit five times
+    return bench.client(-1 - i).delete("/choices/1")
+
+
+def auth_lookup(bench: Bench, i: int):
+    user_cache.clear()  # measure the lookup, not the cache
+    return bench.client(i).get("/users/me")
+
+
+def catalog_import(bench: Bench, i: int, rows: int = 500):
+    buf = io.StringIO()
+    buf.write("code,title,description,instructor,category,course_ids\n")
+    for n in range(rows):
+        courses = ";".join(bench.course_ids[: 1 + n % 3])
+        buf.write(
+            f"{data.ELECTIVE_PREFIX}IMP{n:05d},Imported {n},Run {i},"
+            f"Instructor {n % 13},{'Tech' if n % 2 else 'Hum'},{courses}\n"
+        )
+    files = {"file": ("electives.csv", buf.getvalue().encode(), "text/csv")}
+    return bench.admin.post("/electives/from_file", files=files)
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "catalog_read": catalog_read,
+    "choice_replace": choice_replace,
+    "choice_delete": choice_delete,
+    "auth_lookup": auth_lookup,
+    "import": catalog_import,
+}
+
+
+def measure(
+    scenario: Callable, bench: Bench, statements: _Statements, iterations: int
+) -> Result:
+    latencies = np.empty(iterations)
+    errors = 0
+    before = statements.count
+    started = time.perf_counter()
+    for i in range(iterations):
+        t = time.perf_counter()
+        response = scenario(bench, i)
+        latencies[i] = time.perf_counter() - t
+        errors += response.status_code >= 400
+    elapsed = time.perf_counter() - started
+    ms = latencies * 1000
+    return Result(
+        requests=iterations,
+        errors=errors,
+        per_second=round(iterations / elapsed, 1),
+        mean_ms=round(float(ms.mean()), 2),
+        p50_ms=round(float(np.percentile(ms, 50)), 2),
+        p95_ms=round(float(np.percentile(ms, 95)), 2),
+        p99_ms=round(float(np.percentile(ms, 99)), 2),
+        max_ms=round(float(ms.max()), 2),
+        statements=round((statements.count - before) / iterations, 2),
+    )
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _dataset() -> Dict[str, int]:
+    with engine.connect() as conn:
+        return {
+            table: conn.execute(text(f"SELECT count(*) FROM {table}")).scalar_one()
+            for table in ("users", "electives", "courses", "choices")
+        }
+
+
+def _compare(results: Dict[str, dict], baseline: Dict[str, dict]) -> None:
+    print(f"\n{'vs baseline':<16} {'p50':>9} {'p95':>9} {'req/s':>9}")
+    for name, now in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        change = [
+            (now[k] - old[k]) / old[k] * 100 if old[k] else 0.0
+            for k in ("p50_ms", "p95_ms", "per_second")
+        ]
+        print(f"{name:<16} " + " ".join(f"{c:>+8.1f}%" for c in change))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=list(SCENARIOS),
+        help="repeat to pick several; all by default",
+    )
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--students", type=int, default=2000, help="clients to use")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--out", default=None, help="JSON file (default: bench-<utc time>.json)"
+    )
+    parser.add_argument("--compare", default=None, help="earlier JSON file")
+    args = parser.parse_args()
+
+    bench = Bench(args.students, args.seed)
+    statements = _Statements()
+    results: Dict[str, dict] = {}
+    print(
+        f"{'scenario':<16} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8}"
+        f" {'p99 ms':>8} {'sql/req':>8} {'errors':>7}"
+    )
+    for name in args.scenario or SCENARIOS:
+        scenario = SCENARIOS[name]
+        for i in range(args.warmup):
+            scenario(bench, args.iterations + i)
+        result = measure(scenario, bench, statements, args.iterations)
+        results[name] = asdict(result)
+        print(
+            f"{name:<16} {result.per_second:>8.1f} {result.p50_ms:>8.2f}"
+            f" {result.p95_ms:>8.2f} {result.p99_ms:>8.2f}"
+            f" {result.statements:>8.2f} {result.errors:>7}"
+        )
+
+    now = datetime.now(timezone.utc)
+    out = args.out or f"bench-{now:%Y%m%dT%H%M%SZ}.json"
+    with open(out, "w") as f:
+        json.dump(
+            {
+                "started_at": now.isoformat(),
+                "commit": _commit(),
+                "dataset": _dataset(),
+                "options": vars(args),
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+    print(f"\nwritten to {out}")
+    if args.compare:
+        with open(args.compare) as f:
+            _compare(results, json.load(f)["results"])
+
+
+if __name__ == "__main__":
+    main()
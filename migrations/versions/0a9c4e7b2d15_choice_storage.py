@@ -0,0 +1,39 @@
+"""record which table holds the choices
+
+Revision ID: 0a9c4e7b2d15
+Revises: f6b2d81c4e07
+Create Date: 2026-10-18 15:02:37.118604
+
+"""
+
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0a9c4e7b2d15"
+down_revision: Union[str, None] = "f6b2d81c4e07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    table = op.create_table(
+        "choice_storage",
+        sa.Column("id", sa.Boolean(), primary_key=True),
+        sa.Column("mode", sa.Text(), nullable=False),
+        sa.CheckConstraint("id", name="chk_choice_storage_one_row"),
+        sa.CheckConstraint(
+            "mode IN ('rows', 'rankings')", name="chk_choice_storage_mode"
+        ),
+    )
+    # whatever this deployment runs with is what has been written so far
+    op.bulk_insert(table, [{"id": True, "mode": os.getenv("CHOICE_STORAGE", "rows")}])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("choice_storage")
@@ -0,0 +1,51 @@
+"""link users to a course, keep each run's seed and capacities
+
+Revision ID: 4c1e8b7a9d30
+Revises: 0a9c4e7b2d15
+Create Date: 2026-10-18 16:20:44.907215
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "4c1e8b7a9d30"
+down_revision: Union[str, None] = "0a9c4e7b2d15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # no backfill: admins assign courses, students cannot be allocated before
+    op.add_column(
+        "users", sa.Column("course_id", postgresql.UUID(as_uuid=True), nullable=True)
+    )
+    op.create_foreign_key(
+        "users_course_id_fkey",
+        "users",
+        "courses",
+        ["course_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    op.create_index("ix_users_course_id", "users", ["course_id"])
+
+    op.add_column("allocation_runs", sa.Column("seed", sa.BigInteger(), nullable=True))
+    op.add_column(
+        "allocation_runs",
+        sa.Column("capacities", postgresql.JSONB(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("allocation_runs", "capacities")
+    op.drop_column("allocation_runs", "seed")
+    op.drop_index("ix_users_course_id", table_name="users")
+    op.drop_constraint("users_course_id_fkey", "users", type_="foreignkey")
+    op.drop_column("users", "course_id")
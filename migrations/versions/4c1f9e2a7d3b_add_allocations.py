@@ -0,0 +1,39 @@
+"""add allocations
+
+Revision ID: 4c1f9e2a7d3b
+Revises: 73aa2ca4cc14
+Create Date: 2026-10-18 11:20:41.418503
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4c1f9e2a7d3b"
+down_revision: Union[str, None] = "73aa2ca4cc14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "allocations",
+        sa.Column("run_id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("elective_id", sa.UUID(), nullable=False),
+        sa.Column("priority", sa.SmallInteger(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["elective_id"], ["electives.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("run_id", "user_id", "elective_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("allocations")
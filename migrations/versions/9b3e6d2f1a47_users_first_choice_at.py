@@ -0,0 +1,41 @@
+"""remember when each student first submitted choices
+
+Revision ID: 9b3e6d2f1a47
+Revises: 4c1e8b7a9d30
+Create Date: 2026-10-18 13:10:05.318244
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "9b3e6d2f1a47"
+down_revision: Union[str, None] = "4c1e8b7a9d30"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users", sa.Column("first_choice_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    # the best guess for choices made so far: the oldest time either
+    # storage still holds, which a later replace may already have moved
+    op.execute("""
+        UPDATE users u SET first_choice_at = f.at
+          FROM (SELECT user_id, min(at) AS at
+                  FROM (SELECT user_id, created_at AS at FROM choices
+                        UNION ALL
+                        SELECT user_id, replaced_at FROM user_rankings) s
+                 GROUP BY user_id) f
+         WHERE u.id = f.user_id
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "first_choice_at")
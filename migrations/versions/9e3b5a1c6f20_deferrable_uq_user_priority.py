@@ -0,0 +1,38 @@
+"""make uq_user_priority deferrable
+
+Revision ID: 9e3b5a1c6f20
+Revises: 4c1f9e2a7d3b
+Create Date: 2026-10-18 11:42:07.215930
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9e3b5a1c6f20"
+down_revision: Union[str, None] = "4c1f9e2a7d3b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # checked at the end of each statement, so shifting priorities by one
+    # in a single UPDATE does not trip over rows not yet moved
+    op.drop_constraint("uq_user_priority", "choices", type_="unique")
+    op.create_unique_constraint(
+        "uq_user_priority",
+        "choices",
+        ["user_id", "priority"],
+        deferrable=True,
+        initially="IMMEDIATE",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("uq_user_priority", "choices", type_="unique")
+    op.create_unique_constraint("uq_user_priority", "choices", ["user_id", "priority"])
@@ -0,0 +1,30 @@
+"""index users and choices for keyset pagination
+
+Revision ID: b7d2e4f81a90
+Revises: 9e3b5a1c6f20
+Create Date: 2026-10-18 12:05:31.402817
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d2e4f81a90"
+down_revision: Union[str, None] = "9e3b5a1c6f20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_users_created_at_id", "users", ["created_at", "id"])
+    op.create_index("ix_choices_created_at_id", "choices", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_choices_created_at_id", table_name="choices")
+    op.drop_index("ix_users_created_at_id", table_name="users")
@@ -0,0 +1,81 @@
+"""store each student's choices as one ranking row
+
+Revision ID: c3a8f5e19d42
+Revises: b7d2e4f81a90
+Create Date: 2026-10-18 12:41:09.517204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "c3a8f5e19d42"
+down_revision: Union[str, None] = "b7d2e4f81a90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "user_rankings",
+        sa.Column(
+            "user_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "elective_ids",
+            postgresql.ARRAY(postgresql.UUID(as_uuid=True)),
+            nullable=False,
+        ),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("replaced_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(
+        "ix_user_rankings_elective_ids",
+        "user_rankings",
+        ["elective_ids"],
+        postgresql_using="gin",
+    )
+    # an array cannot reference electives, so do what ON DELETE CASCADE
+    # does for `choices`: drop a deleted elective from every ranking
+    op.execute("""
+        CREATE FUNCTION user_rankings_drop_elective() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE user_rankings
+               SET elective_ids = array_remove(elective_ids, OLD.id),
+                   version = version + 1,
+                   updated_at = now()
+             WHERE elective_ids @> ARRAY[OLD.id];
+            RETURN OLD;
+        END
+        $$
+        """)
+    op.execute(
+        "CREATE TRIGGER electives_drop_from_rankings AFTER DELETE ON electives"
+        " FOR EACH ROW EXECUTE FUNCTION user_rankings_drop_elective()"
+    )
+    # start from what `choices` holds, so either storage can be switched on
+    op.execute("""
+        INSERT INTO user_rankings (user_id, elective_ids, version, replaced_at, updated_at)
+        SELECT user_id, array_agg(elective_id ORDER BY priority), 1,
+               min(created_at), max(updated_at)
+          FROM choices
+         GROUP BY user_id
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER electives_drop_from_rankings ON electives")
+    op.execute("DROP FUNCTION user_rankings_drop_elective()")
+    op.drop_index("ix_user_rankings_elective_ids", table_name="user_rankings")
+    op.drop_table("user_rankings")
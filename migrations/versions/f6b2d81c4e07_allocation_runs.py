@@ -0,0 +1,52 @@
+"""allocation runs table
+
+Revision ID: f6b2d81c4e07
+Revises: e1f7a3c90b52
+Create Date: 2026-10-18 14:05:12.530148
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "f6b2d81c4e07"
+down_revision: Union[str, None] = "e1f7a3c90b52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "allocation_runs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("seats", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_allocation_runs_created_at", "allocation_runs", ["created_at"])
+    # runs stored so far only exist as their seats
+    op.execute("""
+        INSERT INTO allocation_runs (id, seats, created_at)
+        SELECT run_id, count(*), min(created_at)
+        FROM allocations
+        GROUP BY run_id
+        """)
+    op.create_foreign_key(
+        "allocations_run_id_fkey",
+        "allocations",
+        "allocation_runs",
+        ["run_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("allocations_run_id_fkey", "allocations", type_="foreignkey")
+    op.drop_index("ix_allocation_runs_created_at", table_name="allocation_runs")
+    op.drop_table("allocation_runs")
@@ -2,6 +2,7 @@ import base64
 import os
 import time
 from uuid import uuid4
+from typing import Optional
 from fastapi import FastAPI, Header, Request, Form, HTTPException, status
 from fastapi.responses import HTMLResponse, RedirectResponse
 from jose import jwt
@@ -31,6 +32,34 @@ def discovery():
     }
 
 
+def _redirect_with_code(redirect_uri: str, state: str, nonce: str, user: str):
+    code = uuid4().hex
+    nonce_store[code] = (nonce, user)
+
+    # 302 so browser will GET callback
+    return RedirectResponse(
+        url=f"{redirect_uri}?code={code}&state={state}", status_code=302
+    )
+
+
+def _id_token(user: str, client_id: str, nonce: str) -> str:
+    now = int(time.time())
+
+    is_admin = user.startswith("admin-")
+    id_payload = {
+        "iss": ISSUER_URL,
+        "sub": user,
+        "aud": client_id,
+        "exp": now + 3600,
+        "iat": now,
+        "nonce": nonce,
+        "email": f"{user}@example.com",
+        "commonname": "Admin User" if is_admin else "Student User",
+        "group": ["Innopoints_Admins"] if is_admin else [],
+    }
+    return jwt.encode(id_payload, SECRET_KEY, algorithm="HS256")
+
+
 @app.get("/authorize", response_class=HTMLResponse)
 async def authorize_form(
     response_type: str,
@@ -39,9 +68,13 @@ async def authorize_form(
     scope: str,
     state: str,
     nonce: str,
+    login_hint: Optional[str] = None,
 ):
     if response_type != "code" or client_id != CLIENT_ID:
         raise HTTPException(400, "Bad authorize request")
+    # non-interactive login for scripts and load tests: any user id, no form
+    if login_hint:
+        return _redirect_with_code(redirect_uri, state, nonce, login_hint)
     return f"""
     <!DOCTYPE html>
     <html><head><meta charset="utf-8"><title>Mock SSO</title></head>
@@ -77,13 +110,7 @@ async def authorize_submit(
     if response_type != "code" or client_id != CLIENT_ID:
         raise HTTPException(400, "Invalid authorize submission")
 
-    code = uuid4().hex
-    nonce_store[code] = (nonce, user)
-
-    # 302 so browser will GET callback
-    return RedirectResponse(
-        url=f"{redirect_uri}?code={code}&state={state}", status_code=302
-    )
+    return _redirect_with_code(redirect_uri, state, nonce, user)
 
 
 @app.post("/token")
@@ -107,27 +134,11 @@ async def token(
 
     nonce, user = nonce_store.pop(code)
 
-    now = int(time.time())
-
-    is_admin = user.startswith("admin-")
-    id_payload = {
-        "iss": ISSUER_URL,
-        "sub": user,
-        "aud": client_id,
-        "exp": now + 3600,
-        "iat": now,
-        "nonce": nonce,
-        "email": f"{user}@example.com",
-        "commonname": "Admin User" if is_admin else "Student User",
-        "group": ["Innopoints_Admins"] if is_admin else [],
-    }
-    id_token = jwt.encode(id_payload, SECRET_KEY, algorithm="HS256")
-
     return {
         "access_token": "dev-access-token",
         "token_type": "Bearer",
         "expires_in": 3600,
-        "id_token": id_token,
+        "id_token": _id_token(user, client_id, nonce),
     }
 
 
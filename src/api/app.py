@@ -1,3 +1,8 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional
+from uuid import UUID
+
 from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
 from src.config import settings
@@ -9,22 +14,77 @@ from src.api.routers import (
     electives_router,
     choices_router,
     courses_router,
+    allocations_router,
 )
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
 from src.api.error_handler import code_map
+from src.api.metrics import MetricsMiddleware, metrics
+from src.api.pagination import NEXT_CURSOR_HEADER
+from src.infrastructure.db import choice_storage
+from src.infrastructure.db.invalidation import invalidation_bus
+from src.infrastructure.db.session import create_session
+from src.infrastructure.db.uow import UnitOfWork
+from src.services.allocation_service import TOPIC as CHOICES_TOPIC, AllocationService
+from src.services.catalog_cache import TOPIC as CATALOG_TOPIC, catalog_cache
+from src.services.user_cache import TOPIC as USER_TOPIC, user_cache
+
+
+def _evict_user(key: Optional[str]) -> None:
+    if key:
+        user_cache.invalidate(UUID(key))
+    else:
+        user_cache.clear()
+
+
+def _catalog_changed(key: Optional[str]) -> None:
+    catalog_cache.bump()
+    # the live allocation holds its own copy of electives and categories
+    AllocationService().drop_live()
+
+
+def _choices_changed(key: Optional[str]) -> None:
+    AllocationService().choices_changed(key, UnitOfWork())
+
+
+def _check_choice_storage() -> None:
+    with create_session() as session:
+        choice_storage.check(session)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Refuse to start on the wrong choice storage, then keep this worker's
+    caches in step with writes made by the others.
+    """
+    await asyncio.to_thread(_check_choice_storage)
+    listener = asyncio.create_task(invalidation_bus.listen())
+    try:
+        yield
+    finally:
+        listener.cancel()
 
 
 def create_app() -> FastAPI:
     setup_logging()
 
-    app = FastAPI(title=settings.APP_NAME, openapi_prefix="/api")
+    invalidation_bus.subscribe(CATALOG_TOPIC, _catalog_changed)
+    invalidation_bus.subscribe(USER_TOPIC, _evict_user)
+    invalidation_bus.subscribe(CHOICES_TOPIC, _choices_changed)
+
+    app = FastAPI(title=settings.APP_NAME, openapi_prefix="/api", lifespan=lifespan)
 
     @app.exception_handler(AppError)
     async def app_error_handler(request: Request, exc: AppError):
         status_code = code_map.get(type(exc), status.HTTP_500_INTERNAL_SERVER_ERROR)
-        return JSONResponse(status_code=status_code, content={"detail": str(exc)})
+        retry_after = getattr(exc, "retry_after", None)
+        return JSONResponse(
+            status_code=status_code,
+            content={"detail": str(exc)},
+            headers={"Retry-After": str(retry_after)} if retry_after else None,
+        )
 
     app.add_middleware(
         SessionMiddleware,
@@ -40,13 +100,19 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Idempotent-Replayed"],
     )
 
+    # outermost, so the time spent in the other middleware is counted too
+    app.add_middleware(MetricsMiddleware)
+    app.add_route("/metrics", metrics, include_in_schema=False)
+
     app.include_router(auth_router, prefix="/auth", tags=["auth"])
     app.include_router(users_router, prefix="/users", tags=["users"])
     app.include_router(electives_router, tags=["electives"])
     app.include_router(choices_router, tags=["choices"])
     app.include_router(courses_router, tags=["courses"])
+    app.include_router(allocations_router, tags=["allocations"])
 
     return app
 
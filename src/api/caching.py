@@ -0,0 +1,76 @@
+from typing import Any, Awaitable, Callable, List
+
+from fastapi import Request, Response, status
+from pydantic import TypeAdapter
+
+from src.services.catalog_cache import CachedCatalog, catalog_cache
+
+
+async def catalog_entry(
+    name: str,
+    adapter: TypeAdapter,
+    load: Callable[[], Awaitable[List[Any]]],
+) -> CachedCatalog:
+    """
+    The cached `name` catalog, loading and serializing it on a miss.
+    """
+    entry = catalog_cache.get(name)
+    if entry is None:
+        version = catalog_cache.version
+        items = adapter.validate_python(await load(), from_attributes=True)
+        entry = catalog_cache.put(name, version, adapter.dump_json(items))
+    return entry
+
+
+def _matches(if_none_match: str, etags: tuple) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return any(etag in candidates for etag in etags)
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Whether `Accept-Encoding` gives gzip a nonzero q-value, by name or by
+    `*`; the named entry wins.  A malformed q counts as 0.
+    """
+    named = wildcard = None
+    for item in accept_encoding.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        coding = coding.lower()
+        if coding in ("gzip", "x-gzip"):
+            named = q if named is None else max(named, q)
+        elif coding == "*":
+            wildcard = q
+    q = named if named is not None else wildcard
+    return q is not None and q > 0
+
+
+def cached_json(request: Request, entry: CachedCatalog) -> Response:
+    """
+    Serve a cached catalog: 304 if the client already has it, the gzipped
+    body if the client accepts gzip, the plain body otherwise.
+    """
+    # the gzipped bytes are a different representation, so a different ETag
+    gzip_etag = entry.etag[:-1] + '-gzip"'
+    gzipped = bool(entry.gzipped) and _accepts_gzip(
+        request.headers.get("accept-encoding", "")
+    )
+    headers = {"ETag": gzip_etag if gzipped else entry.etag, "Vary": "Accept-Encoding"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, (entry.etag, gzip_etag)):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+        return Response(entry.gzipped, media_type="application/json", headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
@@ -1,5 +1,27 @@
-from src.infrastructure.db.uow import UnitOfWork
+from typing import AsyncIterator
 
+from src.domain.unit_of_work import AbstractAsyncUnitOfWork
+from src.infrastructure.db.uow import AsyncUnitOfWork, UnitOfWork
 
-def get_uow():
+
+async def get_uow() -> AsyncIterator[AbstractAsyncUnitOfWork]:
+    """
+    One unit of work per request, shared by every dependency that asks for
+    it (auth included).  Services entering it join this transaction, which
+    commits once when the handler returns and rolls back if it raises.
+    """
+    async with AsyncUnitOfWork() as uow:
+        yield uow
+
+
+def get_stream_uow() -> AbstractAsyncUnitOfWork:
+    """
+    A unit of work of its own for streamed responses: their body is read
+    after the request-scoped one has already been closed.
+    """
+    return AsyncUnitOfWork()
+
+
+def get_sync_uow():
+    """For handlers that run in the threadpool, e.g. the allocation solver."""
     return UnitOfWork()
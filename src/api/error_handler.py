@@ -13,9 +13,19 @@ from src.domain.exceptions import (
     # choices
     ChoiceNotFoundError,
     DuplicateChoiceError,
+    TooManyChoicesError,
+    ChoiceConflictError,
+    ChoiceWriteInProgressError,
+    IdempotencyKeyReuseError,
+    CourseNotAssignedError,
+    ElectiveNotOfferedError,
     # courses
     DuplicateCourseNameError,
     CourseNotFoundError,
+    # allocations
+    AllocationRunNotFoundError,
+    AllocationInputError,
+    AllocationPendingError,
 )
 
 # Maps domain exceptions to HTTP status codes
@@ -26,6 +36,11 @@ code_map = {
     DuplicateCourseNameError: status.HTTP_400_BAD_REQUEST,
     UnknownCourseIDsError: status.HTTP_400_BAD_REQUEST,
     DuplicateChoiceError: status.HTTP_400_BAD_REQUEST,
+    TooManyChoicesError: status.HTTP_400_BAD_REQUEST,
+    IdempotencyKeyReuseError: status.HTTP_422_UNPROCESSABLE_ENTITY,
+    CourseNotAssignedError: status.HTTP_422_UNPROCESSABLE_ENTITY,
+    ElectiveNotOfferedError: status.HTTP_422_UNPROCESSABLE_ENTITY,
+    AllocationInputError: status.HTTP_422_UNPROCESSABLE_ENTITY,
     # ─── auth / authz ───
     AdminRequiredError: status.HTTP_403_FORBIDDEN,
     # ─── not-found ───
@@ -33,4 +48,10 @@ code_map = {
     ElectiveNotFoundError: status.HTTP_404_NOT_FOUND,
     ChoiceNotFoundError: status.HTTP_404_NOT_FOUND,
     CourseNotFoundError: status.HTTP_404_NOT_FOUND,
+    AllocationRunNotFoundError: status.HTTP_404_NOT_FOUND,
+    # ─── conflicts ───
+    ChoiceConflictError: status.HTTP_409_CONFLICT,
+    ChoiceWriteInProgressError: status.HTTP_409_CONFLICT,
+    # ─── not ready ───
+    AllocationPendingError: status.HTTP_503_SERVICE_UNAVAILABLE,
 }
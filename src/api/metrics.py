@@ -0,0 +1,132 @@
+"""
+Per-request instrumentation, the SQL query budget and the `/metrics`
+endpoint.
+"""
+
+import logging
+import time
+from typing import Optional
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import settings
+from src.metrics import (
+    COUNT_BUCKETS,
+    Counter,
+    Histogram,
+    RequestStats,
+    current_request,
+    render,
+)
+
+logger = logging.getLogger(__name__)
+
+requests_total = Counter(
+    "http_requests_total",
+    "Finished HTTP requests",
+    labels=("method", "route", "status"),
+)
+request_seconds = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of its response",
+    labels=("method", "route"),
+)
+request_statements = Histogram(
+    "http_request_db_statements",
+    "SQL statements issued while handling one request",
+    labels=("method", "route"),
+    buckets=COUNT_BUCKETS,
+)
+request_db_seconds = Histogram(
+    "http_request_db_seconds",
+    "Time one request spent waiting on SQL statements",
+    labels=("method", "route"),
+)
+budget_exceeded_total = Counter(
+    "http_request_query_budget_exceeded_total",
+    "Requests that issued more SQL statements than their route's budget",
+    labels=("method", "route"),
+)
+
+
+def query_budget(method: str, route: str) -> int:
+    """Statements allowed for one request to `route`; 0 means no limit."""
+    return settings.QUERY_BUDGET_ROUTES.get(f"{method} {route}", settings.QUERY_BUDGET)
+
+
+def over_budget(stats: RequestStats) -> Optional[str]:
+    """What is wrong if the request went over its budget so far, else None."""
+    budget = query_budget(stats.method, stats.route)
+    if not budget or stats.statements <= budget:
+        return None
+    return (
+        f"{stats.method} {stats.route} issued {stats.statements} SQL statements,"
+        f" budget is {budget}"
+    )
+
+
+def check_query_budget(stats: RequestStats) -> None:
+    """Count and log a finished request that went over its budget."""
+    if message := over_budget(stats):
+        budget_exceeded_total.inc(stats.method, stats.route)
+        logger.warning(message)
+
+
+class MetricsMiddleware:
+    """
+    Times every HTTP request and records it under its route template
+    (`/electives/{elective_id}`, never the raw path), with the SQL it
+    caused, and holds it to its query budget.
+
+    With `QUERY_BUDGET_ACTION=reject` a request already over budget when
+    its response starts gets a 500 instead of that response.  Statements a
+    streamed body issues later are only logged: the status is sent.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = current_request.set(stats)
+        status = 500
+        rejected = False
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, rejected
+            if rejected:
+                return
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.QUERY_BUDGET_ACTION == "reject" and (
+                    problem := over_budget(stats)
+                ):
+                    rejected, status = True, 500
+                    await JSONResponse({"detail": problem}, status_code=status)(
+                        scope, receive, send
+                    )
+                    return
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_request.reset(token)
+            method, route = stats.method, stats.route
+            requests_total.inc(method, route, str(status))
+            request_seconds.observe(elapsed, method, route)
+            request_statements.observe(stats.statements, method, route)
+            request_db_seconds.observe(stats.db_seconds, method, route)
+        check_query_budget(stats)
+
+
+async def metrics(request: Request) -> Response:
+    return Response(render(), media_type="text/plain; version=0.0.4")
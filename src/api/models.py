@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
 from uuid import UUID
-from typing import Optional, List
+from typing import Dict, Optional, List
+from src.domain.entities import Allocation
 from pydantic import BaseModel
 
 
@@ -40,7 +41,12 @@ class SkippedElective(BaseModel):
 
 class ImportElectiveReport(BaseModel):
     imported: List[ElectiveResponse]
-    skipped: List[SkippedElective]
+    updated: List[ElectiveResponse] = Field(
+        default_factory=list, description="Existing codes overwritten by the file"
+    )
+    skipped: List[SkippedElective] = Field(
+        default_factory=list, description="Rows repeating a code seen earlier"
+    )
 
 
 class ChoiceItem(BaseModel):
@@ -54,3 +60,28 @@ class ChoiceItem(BaseModel):
                 "elective_id": "550e8400-e29b-41d4-a716-446655440000",
             }
         }
+
+
+class SimulationRequest(BaseModel):
+    policy: str = Field("lottery", pattern="^(lottery|seniority|submission)$")
+    # a run of 10k students × 200 electives takes ~3 s of one core, so a
+    # request stays at a few CPU-minutes; more runs: `python -m src.simulate`
+    runs: int = Field(100, ge=1, le=100)
+    seed: int = 0
+    capacities: Dict[UUID, int] = Field(
+        ..., description="Seats per elective, for every elective"
+    )
+
+
+class AllocationRunRequest(BaseModel):
+    seed: Optional[int] = Field(None, description="Lottery seed; random if omitted")
+    capacities: Dict[UUID, int] = Field(
+        ..., description="Seats per elective, for every elective"
+    )
+
+
+class AllocationPage(BaseModel):
+    items: List[Allocation]
+    next: Optional[str] = Field(
+        None, description="Cursor for the following page; absent on the last one"
+    )
@@ -0,0 +1,65 @@
+"""
+Keyset-paginated list responses.
+
+A page is a JSON array of rows trimmed to the requested `fields`; when it
+is full, the cursor for the next one is sent in the `X-Next-Cursor` header
+and goes back as `after`.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import Query, Response
+from pydantic import TypeAdapter
+
+from src.domain.exceptions import ValidationError
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_rows = TypeAdapter(List[Dict[str, Any]])
+
+Row = Dict[str, Any]
+
+
+def fields_query(
+    fields: Optional[str] = Query(
+        None, description="comma-separated fields to return, e.g. `id,name`"
+    ),
+) -> Optional[List[str]]:
+    if fields is None:
+        return None
+    return [f.strip() for f in fields.split(",") if f.strip()]
+
+
+def time_cursor(row: Row) -> str:
+    """`after` value for the page following `row`, keyed on (created_at, id)."""
+    return f"{(row['created_at'] - _EPOCH) // _MICROSECOND}:{row['id']}"
+
+
+def parse_time_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        micros, row_id = cursor.split(":")
+        return _EPOCH + int(micros) * _MICROSECOND, UUID(row_id)
+    except ValueError:
+        raise ValidationError(f"malformed cursor '{cursor}'")
+
+
+def page_response(
+    rows: List[Row],
+    *,
+    limit: int,
+    fields: Optional[List[str]],
+    cursor: Callable[[Row], str],
+) -> Response:
+    headers = {}
+    if len(rows) == limit:
+        headers[NEXT_CURSOR_HEADER] = cursor(rows[-1])
+    if fields is not None:
+        # the repositories also return the key columns the cursor needs
+        rows = [{f: row[f] for f in fields} for row in rows]
+    return Response(
+        _rows.dump_json(rows), media_type="application/json", headers=headers
+    )
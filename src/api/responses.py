@@ -0,0 +1,144 @@
+"""
+JSON written by pydantic-core straight from what an endpoint returns.
+
+FastAPI's default path dumps a returned model to a dict, validates it
+against `response_model`, serializes it back to plain Python and only
+then runs `json.dumps` over that: three passes over every item of a
+list.  A router created with `route_class=ModelJSONRoute` does one,
+`TypeAdapter(response_model).dump_json`, plus a validation only when the
+endpoint returns something other than the response model, e.g.
+
+    router = APIRouter(prefix="/choices", route_class=ModelJSONRoute)
+"""
+
+import asyncio
+from dataclasses import replace
+from typing import Any, Callable, List, Mapping, Optional, get_args, get_origin
+
+from fastapi.routing import APIRoute, get_request_handler
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter
+from starlette.background import BackgroundTask
+
+
+class ModelJSONResponse(Response):
+    """
+    `content` serialized by `adapter`, after validating it against the
+    adapter's type unless `validate=False`.  Pass that only for content
+    known to be of exactly that type: pydantic-core writes a model's
+    fields from whatever object it is given, and silently leaves out the
+    ones that object does not have.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Any,
+        adapter: TypeAdapter,
+        *,
+        validate: bool = True,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        background: Optional[BackgroundTask] = None,
+    ) -> None:
+        self.adapter = adapter
+        self.validate = validate
+        super().__init__(content, status_code, headers, background=background)
+
+    def render(self, content: Any) -> bytes:
+        if self.validate:
+            content = self.adapter.validate_python(content, from_attributes=True)
+        return self.adapter.dump_json(content)
+
+
+class ModelJSONRoute(APIRoute):
+    """
+    A route answering with `ModelJSONResponse` for its `response_model`.
+    The model still documents the endpoint in OpenAPI; endpoints that
+    return a `Response` of their own are passed through untouched.
+
+    The `response_model_*` filters are not supported, nor are headers or
+    a status code set on an injected `Response` parameter: the endpoint
+    makes the response itself.
+    """
+
+    def get_route_handler(self):
+        if self.response_field is None:
+            return super().get_route_handler()
+        if (
+            self.response_model_include is not None
+            or self.response_model_exclude is not None
+            or not self.response_model_by_alias
+            or self.response_model_exclude_unset
+            or self.response_model_exclude_defaults
+            or self.response_model_exclude_none
+            or self.dependant.response_param_name is not None
+        ):
+            raise ValueError(
+                f"{self.path}: ModelJSONRoute does not support response_model"
+                " filters or an injected Response"
+            )
+        return get_request_handler(
+            dependant=replace(
+                self.dependant,
+                call=_responding(
+                    self.dependant.call,
+                    self.response_model,
+                    self.status_code or 200,
+                ),
+            ),
+            body_field=self.body_field,
+            status_code=self.status_code,
+            response_class=self.response_class,
+            response_field=None,
+            dependency_overrides_provider=self.dependency_overrides_provider,
+            embed_body_fields=self._embed_body_fields,
+        )
+
+
+def _trusted(model: Any) -> Callable[[Any], bool]:
+    """
+    Whether content is already `model`: an instance of it, or for
+    `List[model]` a list of instances.  Models are only ever built by
+    validation or from our own rows, so their contents are trusted too.
+    """
+    if get_origin(model) in (list, List):
+        (item,) = get_args(model)
+        if isinstance(item, type) and issubclass(item, BaseModel):
+            return lambda content: isinstance(content, list) and all(
+                isinstance(i, item) for i in content
+            )
+    elif isinstance(model, type) and issubclass(model, BaseModel):
+        return lambda content: isinstance(content, model)
+    return lambda content: False
+
+
+def _responding(
+    endpoint: Callable[..., Any], model: Any, status_code: int
+) -> Callable[..., Any]:
+    """
+    `endpoint`, but wrapping what it returns in a `ModelJSONResponse`.
+    FastAPI runs a sync endpoint in the threadpool, and with it the dump.
+    """
+    adapter = TypeAdapter(model)
+    trusted = _trusted(model)
+
+    def respond(content: Any) -> Any:
+        if isinstance(content, Response):
+            return content
+        return ModelJSONResponse(
+            content, adapter, validate=not trusted(content), status_code=status_code
+        )
+
+    if asyncio.iscoroutinefunction(endpoint):
+
+        async def call_async(**values: Any) -> Any:
+            return respond(await endpoint(**values))
+
+        return call_async
+
+    def call(**values: Any) -> Any:
+        return respond(endpoint(**values))
+
+    return call
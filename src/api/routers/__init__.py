@@ -3,6 +3,7 @@ from .choices import router as choices_router
 from .users import router as users_router
 from .electives import router as electives_router
 from .courses import router as courses_router
+from .allocations import router as allocations_router
 
 __all__ = [
     "users_router",
@@ -10,4 +11,5 @@ __all__ = [
     "auth_router",
     "electives_router",
     "courses_router",
+    "allocations_router",
 ]
@@ -0,0 +1,141 @@
+import json
+from typing import Iterator, List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
+
+from src.api.dependencies import get_sync_uow
+from src.api.models import AllocationPage, AllocationRunRequest, SimulationRequest
+from src.api.responses import ModelJSONRoute
+from src.api.routers.auth import require_admin
+from src.domain.entities import AllocationRun, RankSummary
+from src.domain.exceptions import ValidationError
+from src.domain.unit_of_work import AbstractUnitOfWork
+from src.services.allocation_service import AllocationService
+from src.services.allocation_simulation import TieBreak
+
+router = APIRouter(
+    prefix="/allocations", tags=["allocations"], route_class=ModelJSONRoute
+)
+
+
+@router.post(
+    "/simulations",
+    response_model=List[RankSummary],
+    dependencies=[require_admin],
+)
+def simulate_allocations(
+    payload: SimulationRequest,
+    svc: AllocationService = Depends(),
+    uow: AbstractUnitOfWork = Depends(get_sync_uow),
+):
+    """
+    Run seeded lottery allocations under one tie-break policy and return how
+    many seats each priority got across the runs (priority 0 = seats missed).
+    """
+    return svc.simulate(
+        uow,
+        policy=TieBreak(payload.policy),
+        runs=payload.runs,
+        seed=payload.seed,
+        capacities=payload.capacities,
+    )
+
+
+@router.post(
+    "/runs",
+    response_model=AllocationRun,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[require_admin],
+)
+def create_run(
+    payload: AllocationRunRequest,
+    svc: AllocationService = Depends(),
+    uow: AbstractUnitOfWork = Depends(get_sync_uow),
+):
+    """Allocate everyone now and store the result as a new run."""
+    return svc.run(uow, capacities=payload.capacities, seed=payload.seed)
+
+
+@router.get(
+    "/runs",
+    response_model=List[AllocationRun],
+    dependencies=[require_admin],
+)
+def list_runs(
+    svc: AllocationService = Depends(),
+    uow: AbstractUnitOfWork = Depends(get_sync_uow),
+):
+    """Stored runs, newest first."""
+    return svc.list_runs(uow)
+
+
+def _parse_cursor(cursor: str) -> tuple[UUID, UUID]:
+    try:
+        user_id, elective_id = cursor.split(":")
+        return UUID(user_id), UUID(elective_id)
+    except ValueError:
+        raise ValidationError(f"malformed cursor '{cursor}'")
+
+
+@router.get(
+    "/runs/{run_id}",
+    response_model=AllocationPage,
+    dependencies=[require_admin],
+)
+def get_run_page(
+    run_id: UUID,
+    after: Optional[str] = Query(None, description="`next` of the previous page"),
+    limit: int = Query(1000, ge=1, le=10_000),
+    svc: AllocationService = Depends(),
+    uow: AbstractUnitOfWork = Depends(get_sync_uow),
+):
+    """One page of a run's seats, ordered by user then elective."""
+    items = svc.get_page(
+        run_id,
+        uow,
+        after=_parse_cursor(after) if after else None,
+        limit=limit,
+    )
+    cursor = None
+    if len(items) == limit:
+        cursor = f"{items[-1].user_id}:{items[-1].elective_id}"
+    return AllocationPage(items=items, next=cursor)
+
+
+@router.get("/runs/{run_id}/stream", dependencies=[require_admin])
+def stream_run(
+    run_id: UUID,
+    svc: AllocationService = Depends(),
+    uow: AbstractUnitOfWork = Depends(get_sync_uow),
+):
+    """The whole run as newline-delimited JSON, read from the DB in batches."""
+    # the response has started by the time the generator runs
+    svc.get_run(run_id, uow)
+
+    def lines() -> Iterator[str]:
+        for a in svc.stream_run(run_id, uow):
+            yield json.dumps(
+                {
+                    "user_id": str(a.user_id),
+                    "elective_id": str(a.elective_id),
+                    "priority": a.priority,
+                }
+            ) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.delete(
+    "/runs/{run_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[require_admin],
+)
+def delete_run(
+    run_id: UUID,
+    svc: AllocationService = Depends(),
+    uow: AbstractUnitOfWork = Depends(get_sync_uow),
+):
+    """Drop a stored run."""
+    svc.delete_run(run_id, uow)
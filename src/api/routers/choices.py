@@ -1,14 +1,53 @@
-from typing import List
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Body, status, Path
+from fastapi import APIRouter, Depends, Body, Header, Query, status, Path
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 
 from src.api.models import ChoiceItem, UserResponse
-from src.api.routers.auth import get_current_user
-from src.api.dependencies import get_uow
-from src.services.choice_service import ChoiceService
+from src.api.responses import ModelJSONResponse, ModelJSONRoute
+from src.api.pagination import (
+    fields_query,
+    page_response,
+    parse_time_cursor,
+    time_cursor,
+)
+from src.api.routers.auth import get_current_user, require_admin
+from src.api.dependencies import get_stream_uow, get_sync_uow, get_uow
+from src.services.allocation_service import AllocationService
+from src.domain.exceptions import ValidationError
+from src.services.choice_service import ChoiceService, Ranking
+
+router = APIRouter(prefix="/choices", tags=["choices"], route_class=ModelJSONRoute)
+
+_ITEMS = TypeAdapter(List[ChoiceItem])
+
 
-router = APIRouter(prefix="/choices", tags=["choices"])
+def _if_match(value: Optional[str]) -> Optional[int]:
+    """The version an `If-Match` header names; None for none or `*`."""
+    if value is None or value.strip() == "*":
+        return None
+    try:
+        return int(value.strip().strip('"'))
+    except ValueError:
+        raise ValidationError(f"malformed If-Match '{value}'") from None
+
+
+def _ranking_response(ranking: Ranking) -> ModelJSONResponse:
+    """The ranking's items, with its version as the ETag for `If-Match`."""
+    headers = {"ETag": f'"{ranking.version}"'}
+    if ranking.replayed:
+        headers["Idempotent-Replayed"] = "true"
+    items = [
+        ChoiceItem(priority=c.priority, elective_id=c.elective_id)
+        for c in ranking.choices
+    ]
+    return ModelJSONResponse(items, _ITEMS, validate=False, headers=headers)
 
 
 @router.get("/", response_model=List[ChoiceItem])
@@ -17,13 +56,110 @@ async def list_choices(
     svc: ChoiceService = Depends(ChoiceService),
     uow=Depends(get_uow),
 ):
-    """Return this student’s choices, ordered by priority ascending."""
-    user_id = UUID(user.sub)
-    choices = svc.list_user_choices(user_id, uow)
-    return [
-        ChoiceItem(priority=choice.priority, elective_id=choice.elective_id)
-        for choice in choices
-    ]
+    """
+    Return this student’s choices, ordered by priority ascending.  The
+    ETag is their version, to send back as `If-Match` when changing them.
+    """
+    return _ranking_response(await svc.get_ranking(UUID(user.sub), uow))
+
+
+@router.get("/all", dependencies=[require_admin])
+async def list_all_choices(
+    after: Optional[str] = Query(None, description="`X-Next-Cursor` of the last page"),
+    limit: int = Query(100, ge=1, le=1000),
+    fields: Optional[List[str]] = Depends(fields_query),
+    svc: ChoiceService = Depends(ChoiceService),
+    uow=Depends(get_uow),
+):
+    """Every student's choices, oldest first, one page at a time."""
+    rows = await svc.list_choices(
+        uow,
+        after=parse_time_cursor(after) if after else None,
+        limit=limit,
+        fields=fields,
+    )
+    return page_response(rows, limit=limit, fields=fields, cursor=time_cursor)
+
+
+_EXPORT_COLUMNS = (
+    "user_id",
+    "email",
+    "elective_id",
+    "elective_code",
+    "priority",
+    "created_at",
+)
+
+
+def _plain(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+async def _csv(rows: AsyncIterator[Dict[str, Any]], batch: int = 1000):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(_EXPORT_COLUMNS)
+    yield _drain(buf)  # first byte before the first row is fetched
+    n = 0
+    async for row in rows:
+        writer.writerow([_plain(row[c]) for c in _EXPORT_COLUMNS])
+        n += 1
+        if n % batch == 0:
+            yield _drain(buf)
+    yield _drain(buf)
+
+
+async def _ndjson(rows: AsyncIterator[Dict[str, Any]], batch: int = 1000):
+    buf = io.StringIO()
+    n = 0
+    async for row in rows:
+        buf.write(json.dumps(row, default=_plain))
+        buf.write("\n")
+        n += 1
+        if n % batch == 0:
+            yield _drain(buf)
+    yield _drain(buf)
+
+
+def _drain(buf: io.StringIO) -> str:
+    chunk = buf.getvalue()
+    buf.seek(0)
+    buf.truncate()
+    return chunk
+
+
+@router.get("/export", dependencies=[require_admin])
+async def export_choices(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    svc: ChoiceService = Depends(ChoiceService),
+    uow=Depends(get_stream_uow),
+):
+    """
+    Every student's choices with email and elective code, streamed from a
+    server-side cursor so neither side holds the whole table.
+    """
+    rows = svc.export_choices(uow)
+    if format == "csv":
+        return StreamingResponse(
+            _csv(rows),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="choices.csv"'},
+        )
+    return StreamingResponse(_ndjson(rows), media_type="application/x-ndjson")
+
+
+@router.get("/assignment", response_model=List[ChoiceItem])
+def current_assignment(
+    user: UserResponse = Depends(get_current_user),
+    alloc: AllocationService = Depends(AllocationService),
+    uow=Depends(get_sync_uow),
+):
+    """
+    Electives this student would get if the allocation ran right now;
+    503 with Retry-After while the first one is still being computed.
+    """
+    seats = alloc.current_assignment(UUID(user.sub), uow)
+    return [ChoiceItem(priority=a.priority, elective_id=a.elective_id) for a in seats]
 
 
 @router.post(
@@ -41,19 +177,31 @@ async def replace_choices(
             "fc2dcd26-3b69-4fdd-ad30-c0f1a7c4b595",
         ],
     ),
+    if_match: Optional[str] = Header(
+        None, description="ETag of the choices being replaced; 409 if stale"
+    ),
+    idempotency_key: Optional[str] = Header(
+        None,
+        max_length=255,
+        description="Retries with the same key get the first answer back",
+    ),
     user: UserResponse = Depends(get_current_user),
     svc: ChoiceService = Depends(ChoiceService),
     uow=Depends(get_uow),
 ):
+    """
+    A write that would have to wait for another one to the same student's
+    choices fails with 409 instead, as does a stale `If-Match`.
+    """
     user_id = UUID(user.sub)
-    created = svc.replace_user_choices(
-        user_id=user_id, elective_ids=elective_ids, uow=uow
+    ranking = await svc.replace_user_choices(
+        user_id=user_id,
+        elective_ids=elective_ids,
+        uow=uow,
+        expected_version=_if_match(if_match),
+        idempotency_key=idempotency_key,
     )
-
-    return [
-        ChoiceItem(priority=choice.priority, elective_id=choice.elective_id)
-        for choice in created
-    ]
+    return _ranking_response(ranking)
 
 
 @router.delete(
@@ -64,6 +212,9 @@ async def replace_choices(
 )
 async def delete_choice(
     priority: int = Path(..., ge=1),
+    if_match: Optional[str] = Header(
+        None, description="ETag of the choices being changed; 409 if stale"
+    ),
     user: UserResponse = Depends(get_current_user),
     svc: ChoiceService = Depends(ChoiceService),
     uow=Depends(get_uow),
@@ -72,6 +223,10 @@ async def delete_choice(
     Deletes the choice at `priority` and shifts lower priorities up.
     """
     user_id = UUID(user.sub)
-    updated = svc.remove_choice(user_id=user_id, priority=priority, uow=uow)
-
-    return [ChoiceItem(priority=c.priority, elective_id=c.elective_id) for c in updated]
+    ranking = await svc.remove_choice(
+        user_id=user_id,
+        priority=priority,
+        uow=uow,
+        expected_version=_if_match(if_match),
+    )
+    return _ranking_response(ranking)
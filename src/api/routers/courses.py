@@ -2,15 +2,17 @@ from datetime import datetime
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, Request, status
+from pydantic import BaseModel, Field, TypeAdapter
 
+from src.api.caching import cached_json, catalog_entry
 from src.api.dependencies import get_uow
+from src.api.responses import ModelJSONRoute
 from src.api.routers.auth import require_admin
-from src.domain.unit_of_work import AbstractUnitOfWork
+from src.domain.unit_of_work import AbstractAsyncUnitOfWork
 from src.services.course_service import CourseService
 
-router = APIRouter(prefix="/courses", tags=["courses"])
+router = APIRouter(prefix="/courses", tags=["courses"], route_class=ModelJSONRoute)
 
 
 class CourseCreateRequest(BaseModel):
@@ -31,23 +33,28 @@ class CourseResponse(CourseCreateRequest):
     status_code=status.HTTP_201_CREATED,
     dependencies=[require_admin],
 )
-def create_course(
+async def create_course(
     payload: CourseCreateRequest,
     svc: CourseService = Depends(),
-    uow: AbstractUnitOfWork = Depends(get_uow),
+    uow: AbstractAsyncUnitOfWork = Depends(get_uow),
 ):
-    course = svc.create_course(
+    course = await svc.create_course(
         name=payload.name,
         tech_quota=payload.tech_quota,
         hum_quota=payload.hum_quota,
         uow=uow,
     )
-    return CourseResponse(**course.model_dump())
+    return course
+
+
+_catalog = TypeAdapter(List[CourseResponse])
 
 
 @router.get("/", response_model=List[CourseResponse])
-def list_courses(
+async def list_courses(
+    request: Request,
     svc: CourseService = Depends(),
-    uow: AbstractUnitOfWork = Depends(get_uow),
+    uow: AbstractAsyncUnitOfWork = Depends(get_uow),
 ):
-    return [CourseResponse(**c.model_dump()) for c in svc.list_courses(uow)]
+    entry = await catalog_entry("courses", _catalog, lambda: svc.list_courses(uow))
+    return cached_json(request, entry)
@@ -1,47 +1,79 @@
-from typing import Any, Dict, List
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 from uuid import UUID
+import codecs
 import csv
-import io
+import re
 
 from fastapi import (
     APIRouter,
     Depends,
     File,
     HTTPException,
+    Query,
     Request,
     UploadFile,
     status,
 )
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter, ValidationError as PydanticValidationError
+
+from src.api.caching import cached_json, catalog_entry
+from src.api.pagination import fields_query, page_response
 from src.api.models import (
     ElectiveCreateRequest,
     ElectiveResponse,
     ImportElectiveReport,
-    SkippedElective,
 )
+from src.api.responses import ModelJSONRoute
 from src.api.routers.auth import get_current_user, require_admin
-from src.domain.unit_of_work import AbstractUnitOfWork
+from src.domain.unit_of_work import AbstractAsyncUnitOfWork
 from src.services.elective_service import ElectiveService
 from src.api.dependencies import get_uow
 
-router = APIRouter(prefix="/electives", tags=["electives"])
+router = APIRouter(prefix="/electives", tags=["electives"], route_class=ModelJSONRoute)
+
+_catalog = TypeAdapter(List[ElectiveResponse])
+_COURSE_ID_SEPARATORS = re.compile(r"[;,\s]+")
 
 
 @router.get("/", response_model=List[ElectiveResponse])
 async def list_electives(
     request: Request,
+    after: Optional[str] = Query(None, description="`X-Next-Cursor` of the last page"),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    fields: Optional[List[str]] = Depends(fields_query),
     elective_service: ElectiveService = Depends(),
-    uow: AbstractUnitOfWork = Depends(get_uow),
+    uow: AbstractAsyncUnitOfWork = Depends(get_uow),
 ):
-    return elective_service.list_electives(uow=uow)
+    """
+    The whole catalog, served from memory with an ETag until it changes;
+    send `If-None-Match` to get `304 Not Modified` instead of the body.
+
+    With `limit`, `after` or `fields` it is read page by page instead,
+    ordered by code and with only the requested fields.
+    """
+    if limit is not None or after is not None or fields is not None:
+        limit = limit or 100
+        rows = await elective_service.page_electives(
+            uow, after=after, limit=limit, fields=fields
+        )
+        return page_response(
+            rows, limit=limit, fields=fields, cursor=lambda row: row["code"]
+        )
+    entry = await catalog_entry(
+        "electives", _catalog, lambda: elective_service.list_electives(uow=uow)
+    )
+    return cached_json(request, entry)
 
 
 @router.get("/{elective_id}", response_model=ElectiveResponse)
 async def get_elective(
     elective_id: UUID,
     elective_service: ElectiveService = Depends(),
-    uow: AbstractUnitOfWork = Depends(get_uow),
+    uow: AbstractAsyncUnitOfWork = Depends(get_uow),
 ):
-    elective = elective_service.get_elective(elective_id, uow)
+    elective = await elective_service.get_elective(elective_id, uow)
     if not elective:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "elective not found")
     return elective
@@ -51,9 +83,9 @@ async def get_elective(
 async def create_elective(
     payload: ElectiveCreateRequest,
     svc: ElectiveService = Depends(),
-    uow: AbstractUnitOfWork = Depends(get_uow),
+    uow: AbstractAsyncUnitOfWork = Depends(get_uow),
 ):
-    return svc.create_elective(**payload.model_dump(), uow=uow)
+    return await svc.create_elective(**payload.model_dump(), uow=uow)
 
 
 @router.put(
@@ -65,9 +97,9 @@ async def update_elective(
     elective_id: UUID,
     payload: ElectiveCreateRequest,
     elective_service: ElectiveService = Depends(),
-    uow: AbstractUnitOfWork = Depends(get_uow),
+    uow: AbstractAsyncUnitOfWork = Depends(get_uow),
 ):
-    updated = elective_service.update_elective(
+    updated = await elective_service.update_elective(
         elective_id, **payload.model_dump(), uow=uow
     )
     if not updated:
@@ -83,9 +115,9 @@ async def update_elective(
 async def delete_elective(
     elective_id: UUID,
     elective_service: ElectiveService = Depends(),
-    uow: AbstractUnitOfWork = Depends(get_uow),
+    uow: AbstractAsyncUnitOfWork = Depends(get_uow),
 ):
-    if not elective_service.delete_elective(elective_id, uow):
+    if not await elective_service.delete_elective(elective_id, uow):
         raise HTTPException(status.HTTP_404_NOT_FOUND, "elective not found")
 
 
@@ -96,12 +128,51 @@ async def delete_elective(
 )
 async def delete_all_electives(
     elective_service: ElectiveService = Depends(),
-    uow: AbstractUnitOfWork = Depends(get_uow),
+    uow: AbstractAsyncUnitOfWork = Depends(get_uow),
 ):
-    count = elective_service.delete_all_electives(uow)
+    count = await elective_service.delete_all_electives(uow)
     return {"deleted": count}
 
 
+def _read_electives(file: UploadFile) -> Iterator[Dict[str, Any]]:
+    """
+    Validated rows of an uploaded catalog CSV, decoded and parsed as they
+    are read.  `course_ids` holds ids separated by `;`, `,` or spaces.
+    """
+    reader = csv.DictReader(codecs.iterdecode(file.file, "utf-8"))
+    try:
+        for row in reader:
+            try:
+                yield ElectiveCreateRequest(
+                    code=row.get("code"),
+                    title=row.get("title"),
+                    description=row.get("description") or None,
+                    instructor=row.get("instructor"),
+                    category=row.get("category"),
+                    course_ids=_COURSE_ID_SEPARATORS.split(
+                        (row.get("course_ids") or "").strip()
+                    ),
+                ).model_dump()
+            except PydanticValidationError as e:
+                raise HTTPException(
+                    422, f"Invalid data in CSV line {reader.line_num}: {e}"
+                )
+    except UnicodeDecodeError:
+        raise HTTPException(400, "File must be UTF-8 encoded")
+
+
+async def _off_the_loop(
+    rows: Iterator[Dict[str, Any]], chunk: int = 500
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    `rows`, advanced `chunk` at a time on the threadpool: reading the
+    spooled upload and parsing it block.
+    """
+    while batch := await run_in_threadpool(list, islice(rows, chunk)):
+        for row in batch:
+            yield row
+
+
 @router.post(
     "/from_file",
     response_model=ImportElectiveReport,
@@ -110,36 +181,21 @@ async def delete_all_electives(
 async def import_electives_from_file(
     file: UploadFile = File(...),
     elective_service: ElectiveService = Depends(),
-    uow: AbstractUnitOfWork = Depends(get_uow),
+    uow: AbstractAsyncUnitOfWork = Depends(get_uow),
 ):
-    raw = await file.read()
-    try:
-        text = raw.decode("utf-8")
-    except UnicodeDecodeError:
-        raise HTTPException(400, "File must be UTF-8 encoded")
-
-    reader = csv.DictReader(io.StringIO(text))
-    electives_data: List[Dict[str, Any]] = []
-    for row in reader:
-        try:
-            row["max_seats"] = int(row["max_seats"])
-        except Exception as e:
-            raise HTTPException(422, f"Invalid data in CSV row: {e}")
-        electives_data.append(row)
-
-    if not electives_data:
+    """
+    Create or update (by code) every elective in a CSV with the columns
+    `code,title,description,instructor,category,course_ids`, atomically.
+    """
+    inserted, updated, skipped = await elective_service.import_electives(
+        _off_the_loop(_read_electives(file)), uow=uow
+    )
+    if not (inserted or updated or skipped):
         raise HTTPException(400, "No elective records found in file")
 
-    # perform the import inside a unit of work
-    imported, skipped = elective_service.import_electives(electives_data, uow=uow)
-
-    imported_out = [ElectiveResponse(**c.model_dump()) for c in imported]
-    skipped_out = [
-        SkippedElective(
-            input=ElectiveCreateRequest(**inp),
-            existing=ElectiveResponse(**existing.model_dump()),
-        )
-        for inp, existing in skipped
-    ]
-
-    return ImportElectiveReport(imported=imported_out, skipped=skipped_out)
+    # plain entities: `response_model` checks them once on the way out
+    return {
+        "imported": inserted,
+        "updated": updated,
+        "skipped": [{"input": inp, "existing": existing} for inp, existing in skipped],
+    }
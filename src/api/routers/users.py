@@ -1,9 +1,62 @@
-from fastapi import APIRouter, Depends
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel, Field
+from src.api.dependencies import get_uow
 from src.api.models import UserResponse
+from src.api.responses import ModelJSONRoute
+from src.api.pagination import (
+    fields_query,
+    page_response,
+    parse_time_cursor,
+    time_cursor,
+)
+from src.domain.entities import User
+from src.domain.unit_of_work import AbstractAsyncUnitOfWork
+from src.services.user_service import UserService
+
+from .auth import get_current_user, require_admin
+
+router = APIRouter(route_class=ModelJSONRoute)
 
-from .auth import get_current_user
 
-router = APIRouter()
+class UserCourseRequest(BaseModel):
+    course_id: Optional[UUID] = Field(..., description="None takes the user off")
+
+
+@router.get("/", dependencies=[require_admin])
+async def list_users(
+    after: Optional[str] = Query(None, description="`X-Next-Cursor` of the last page"),
+    limit: int = Query(100, ge=1, le=1000),
+    fields: Optional[List[str]] = Depends(fields_query),
+    svc: UserService = Depends(),
+    uow: AbstractAsyncUnitOfWork = Depends(get_uow),
+):
+    """
+    Users oldest first, one page at a time, optionally only some `fields`.
+    """
+    rows = await svc.list_users(
+        uow,
+        after=parse_time_cursor(after) if after else None,
+        limit=limit,
+        fields=fields,
+    )
+    return page_response(rows, limit=limit, fields=fields, cursor=time_cursor)
+
+
+@router.put("/{user_id}/course", response_model=User, dependencies=[require_admin])
+async def set_course(
+    user_id: UUID,
+    payload: UserCourseRequest,
+    svc: UserService = Depends(),
+    uow: AbstractAsyncUnitOfWork = Depends(get_uow),
+):
+    """
+    Put a student on a course: its quotas apply to them in the allocation,
+    and they may only choose electives it offers.
+    """
+    return await svc.set_course(user_id, payload.course_id, uow)
 
 
 @router.get("/me", response_model=UserResponse)
@@ -0,0 +1,41 @@
+"""
+Check or switch which table holds the choices (`CHOICE_STORAGE`), e.g.
+
+    python -m src.choice_storage check
+    python -m src.choice_storage switch rankings
+
+Switch with the API stopped, then start it with the new `CHOICE_STORAGE`;
+see `src/infrastructure/db/choice_storage.py`.
+"""
+
+import argparse
+import sys
+
+from src.infrastructure.db import choice_storage
+from src.infrastructure.db.session import create_session
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("check", help="exit 1 unless CHOICE_STORAGE can be used")
+    switch = commands.add_parser("switch", help="copy the choices to another table")
+    switch.add_argument("to", choices=choice_storage.MODES)
+    args = parser.parse_args()
+
+    with create_session() as session:
+        try:
+            if args.command == "check":
+                choice_storage.check(session)
+                print(f"choices are in {choice_storage.current_mode(session)!r}")
+                return
+            before = choice_storage.current_mode(session)
+            copied = choice_storage.switch(session, args.to)
+            session.commit()
+        except choice_storage.ChoiceStorageError as err:
+            sys.exit(str(err))
+    print(f"{before!r} -> {args.to!r}, {copied} students copied")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,14 @@
 import os
+from typing import Dict
+
+
+def _route_budgets(raw: str) -> Dict[str, int]:
+    """`"GET /electives/=1,POST /choices/=4"` -> `{"GET /electives/": 1, ...}`"""
+    budgets = {}
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        route, _, limit = item.rpartition("=")
+        budgets[" ".join(route.split())] = int(limit)
+    return budgets
 
 
 class Settings:
@@ -8,6 +18,29 @@ class Settings:
     # Database (required)
     DATABASE_URL: str = os.environ["DATABASE_URL"]
     SQL_ECHO: bool = os.getenv("SQL_ECHO", "false").lower() in ("1", "true", "yes")
+    # Log statements slower than this with their parameter shapes (0 = off)
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "0"))
+    # Statements one request may issue (0 = no limit), overridable per route
+    # as "GET /electives/{elective_id}=2,POST /choices/=4"
+    QUERY_BUDGET: int = int(os.getenv("QUERY_BUDGET", "0"))
+    QUERY_BUDGET_ROUTES: Dict[str, int] = _route_budgets(
+        os.getenv("QUERY_BUDGET_ROUTES", "")
+    )
+    # "reject" answers 500 instead of an over-budget response, e.g. in tests
+    QUERY_BUDGET_ACTION: str = os.getenv("QUERY_BUDGET_ACTION", "log")  # log|reject
+
+    # Where choices live: "rows" (one `choices` row each) or "rankings" (one
+    # `user_rankings` row per student).  `choices` caps priorities at 5, so
+    # rows needs MAX_CHOICES <= 5.  The API will not start on a storage the
+    # database does not hold the choices in: `python -m src.choice_storage`.
+    CHOICE_STORAGE: str = os.getenv("CHOICE_STORAGE", "rows")  # rows|rankings
+    MAX_CHOICES: int = int(os.getenv("MAX_CHOICES", "5"))
+    # How long POST /choices answers a repeated Idempotency-Key from storage
+    IDEMPOTENCY_TTL_SECONDS: float = float(
+        os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400")
+    )
+    # How long a repeated key waits for the attempt still writing it
+    IDEMPOTENCY_WAIT_SECONDS: float = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "2"))
 
     # JWT (required)
     JWT_SECRET_KEY: str = os.environ["JWT_SECRET_KEY"]
@@ -15,6 +48,12 @@ class Settings:
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(
         os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
     )
+    # Take role/name/email from a valid token instead of looking the user up
+    AUTH_TRUST_TOKEN_CLAIMS: bool = os.getenv(
+        "AUTH_TRUST_TOKEN_CLAIMS", "false"
+    ).lower() in ("1", "true", "yes")
+    USER_CACHE_SIZE: int = int(os.getenv("USER_CACHE_SIZE", "10000"))
+    USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
 
     SSO_CLIENT_ID: str = os.getenv("SSO_CLIENT_ID", "your-client-id")
     SSO_CLIENT_SECRET: str = os.getenv("SSO_CLIENT_SECRET", "your-client-secret")
@@ -1,6 +1,16 @@
 from .user import User
 from .elective import Elective
-from .choice import Choice
+from .choice import Choice, ChoiceSubmission
 from .course import Course
+from .allocation import Allocation, AllocationRun, RankSummary
 
-__all__ = ["User", "Elective", "Choice", "Course"]
+__all__ = [
+    "User",
+    "Elective",
+    "Choice",
+    "ChoiceSubmission",
+    "Course",
+    "Allocation",
+    "AllocationRun",
+    "RankSummary",
+]
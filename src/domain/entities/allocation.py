@@ -0,0 +1,46 @@
+from datetime import datetime
+from typing import Dict, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class Allocation(BaseModel):
+    """
+    A seat in an elective handed to a student by an allocation run.
+    """
+
+    user_id: UUID
+    elective_id: UUID
+    priority: int
+    run_id: Optional[UUID] = None
+
+
+class AllocationRun(BaseModel):
+    """
+    One persisted allocation result; several runs can be kept side by side.
+    """
+
+    id: UUID
+    seats: int
+    created_at: datetime
+    # what it was run with; unknown for runs stored before they were kept
+    seed: Optional[int] = None
+    capacities: Optional[Dict[UUID, int]] = None
+
+
+class RankSummary(BaseModel):
+    """
+    Spread of the number of seats given at one priority over simulated
+    allocation runs.  `priority=0` counts seats students were entitled to by
+    their course quotas but did not get.
+    """
+
+    priority: int
+    mean: float
+    std: float
+    min: int
+    p5: float
+    p50: float
+    p95: float
+    max: int
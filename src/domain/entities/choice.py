@@ -1,5 +1,6 @@
 from datetime import datetime
-from uuid import UUID
+from typing import List
+from uuid import UUID, uuid3
 
 from pydantic import BaseModel
 
@@ -15,3 +16,26 @@ class Choice(BaseModel):
     priority: int
     created_at: datetime
     updated_at: datetime
+
+
+class ChoiceSubmission(BaseModel):
+    """
+    A ranking submitted under an idempotency key, and the version writing
+    it produced: what a retry with the same key is answered with.
+    """
+
+    user_id: UUID
+    key: str
+    elective_ids: List[UUID]
+    version: int
+    created_at: datetime
+
+
+def choice_id(user_id: UUID, elective_id: UUID) -> UUID:
+    """
+    The id of `user_id`'s choice of `elective_id`.  A student picks an
+    elective at most once, so the pair is the identity; deriving the id
+    from it lets storage that keeps only the pair (`user_rankings`) give
+    the same ids as the `choices` table.
+    """
+    return uuid3(user_id, str(elective_id))
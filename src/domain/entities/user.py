@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Optional
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -10,5 +11,9 @@ class User(BaseModel):
     name: str
     email: str
     role: str
+    # the course whose quotas and electives apply; set by an admin
+    course_id: Optional[UUID] = None
+    # when the student first submitted choices; later edits keep it
+    first_choice_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
@@ -66,5 +66,58 @@ class DuplicateChoiceError(ValidationError):
     """
 
 
+class TooManyChoicesError(ValidationError):
+    """A student submitted more choices than `MAX_CHOICES` allows."""
+
+
 class ChoiceNotFoundError(AppError):
     """No choice exists at the requested priority."""
+
+
+class ChoiceConflictError(AppError):
+    """
+    The student's choices cannot be written right now: another request is
+    writing them, or they have changed since the version the client sent.
+    """
+
+
+class ChoiceWriteInProgressError(ChoiceConflictError):
+    """
+    A request with an idempotency key found the choices still being
+    written, possibly by its own first attempt: retrying may replay it.
+    """
+
+    # seconds a client should wait before retrying with the same key
+    retry_after = 1
+
+
+class IdempotencyKeyReuseError(ValidationError):
+    """An idempotency key was sent again with a different request."""
+
+
+class CourseNotAssignedError(ValidationError):
+    """The student has no course yet, so has no electives to choose from."""
+
+
+class ElectiveNotOfferedError(ValidationError):
+    """An elective is not offered to the student's course."""
+
+
+# ───────────────────────── allocations ────────────────────────────
+class AllocationRunNotFoundError(AppError):
+    """No stored allocation run has the requested id."""
+
+
+class AllocationPendingError(AppError):
+    """The live allocation is being rebuilt and there is no older one."""
+
+    # seconds a client should wait before asking again
+    retry_after = 5
+
+
+class AllocationInputError(ValidationError):
+    """
+    The allocation cannot run as things stand: a student with choices has
+    no course or chose electives it does not offer, or an elective has no
+    seat count.
+    """
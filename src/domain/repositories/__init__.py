@@ -1,10 +1,33 @@
-from .abstract_user_repository import AbstractUserRepository
-from .abstract_elective_repository import AbstractElectiveRepository
-from .abstract_choice_repository import AbstractChoiceRepository
-from .abstract_course_repository import AbstractCourseRepository
+from .abstract_user_repository import (
+    AbstractUserRepository,
+    AbstractAsyncUserRepository,
+)
+from .abstract_elective_repository import (
+    AbstractElectiveRepository,
+    AbstractAsyncElectiveRepository,
+)
+from .abstract_choice_repository import (
+    AbstractChoiceRepository,
+    AbstractAsyncChoiceRepository,
+)
+from .abstract_choice_submission_repository import (
+    AbstractAsyncChoiceSubmissionRepository,
+)
+from .abstract_course_repository import (
+    AbstractCourseRepository,
+    AbstractAsyncCourseRepository,
+)
+from .abstract_allocation_repository import AbstractAllocationRepository
 
 __all__ = [
     "AbstractUserRepository",
     "AbstractElectiveRepository",
     "AbstractChoiceRepository",
+    "AbstractCourseRepository",
+    "AbstractAllocationRepository",
+    "AbstractAsyncUserRepository",
+    "AbstractAsyncElectiveRepository",
+    "AbstractAsyncChoiceRepository",
+    "AbstractAsyncChoiceSubmissionRepository",
+    "AbstractAsyncCourseRepository",
 ]
@@ -0,0 +1,53 @@
+from abc import ABC, abstractmethod
+from typing import Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from src.domain.entities import Allocation, AllocationRun
+
+
+class AbstractAllocationRepository(ABC):
+    """Interface for persisted allocation runs."""
+
+    @abstractmethod
+    def add_run(self, run: AllocationRun, allocations: List[Allocation]) -> None:
+        """Store the run, and every seat of it in a single bulk write."""
+        ...
+
+    @abstractmethod
+    def list_runs(self) -> List[AllocationRun]:
+        """Return all stored runs, newest first."""
+        ...
+
+    @abstractmethod
+    def get_run(self, run_id: UUID) -> Optional[AllocationRun]:
+        """Return one stored run, or None."""
+        ...
+
+    @abstractmethod
+    def latest_run(self) -> Optional[AllocationRun]:
+        """Return the newest run that recorded its capacities, or None."""
+        ...
+
+    @abstractmethod
+    def page(
+        self,
+        run_id: UUID,
+        *,
+        after: Optional[Tuple[UUID, UUID]] = None,
+        limit: int = 1000,
+    ) -> List[Allocation]:
+        """
+        Return up to `limit` seats of a run ordered by (user_id, elective_id),
+        starting after the given key.
+        """
+        ...
+
+    @abstractmethod
+    def stream(self, run_id: UUID, *, batch_size: int = 1000) -> Iterator[Allocation]:
+        """Yield every seat of a run without loading the whole run at once."""
+        ...
+
+    @abstractmethod
+    def delete_run(self, run_id: UUID) -> bool:
+        """Remove a run with its seats; False if there was no such run."""
+        ...
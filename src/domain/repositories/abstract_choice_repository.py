@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 from src.domain.entities.choice import Choice
 
@@ -37,7 +38,92 @@ class AbstractChoiceRepository(ABC):
         """Return all Choices for a given elective."""
         ...
 
+    @abstractmethod
+    def replace_for_user(self, user_id: UUID, choices: List[Choice]) -> None:
+        """
+        Drop every Choice of `user_id` and insert `choices` in their place,
+        as one DELETE and one bulk INSERT.  Bumps the user's version.
+        """
+        ...
+
+    @abstractmethod
+    def remove_and_compact(
+        self, user_id: UUID, priority: int
+    ) -> Optional[List[Choice]]:
+        """
+        Delete the user's Choice at `priority` and move every later one up
+        by one.  Returns the remaining Choices ordered by priority, or None
+        if there was nothing at `priority`.  Bumps the user's version if it
+        deleted something.
+        """
+        ...
+
     @abstractmethod
     def delete(self, choice_id: UUID) -> None:
         """Remove a Choice by its UUID."""
         ...
+
+
+class AbstractAsyncChoiceRepository(ABC):
+    """Async flavour of `AbstractChoiceRepository`."""
+
+    @abstractmethod
+    async def add(self, choice: Choice) -> None: ...
+    @abstractmethod
+    async def update(self, choice: Choice) -> None: ...
+    @abstractmethod
+    async def get(self, choice_id: UUID) -> Optional[Choice]: ...
+    @abstractmethod
+    async def list(self) -> List[Choice]: ...
+
+    @abstractmethod
+    async def page(
+        self,
+        fields: Sequence[str],
+        *,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        """
+        Up to `limit` choices following the `(created_at, id)` key `after`,
+        in that order, as rows of `fields` plus the two key columns.
+        """
+        ...
+
+    @abstractmethod
+    def export(self, *, batch_size: int = 1000) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield every choice, in no particular order, with its student's
+        email and its elective's code, fetching `batch_size` rows at a time.
+        """
+        ...
+
+    @abstractmethod
+    async def list_by_user(self, user_id: UUID) -> List[Choice]: ...
+    @abstractmethod
+    async def list_by_elective(self, elective_id: UUID) -> List[Choice]: ...
+    @abstractmethod
+    async def replace_for_user(self, user_id: UUID, choices: List[Choice]) -> None: ...
+    @abstractmethod
+    async def remove_and_compact(
+        self, user_id: UUID, priority: int
+    ) -> Optional[List[Choice]]: ...
+    @abstractmethod
+    async def delete(self, choice_id: UUID) -> None: ...
+
+    @abstractmethod
+    async def version(self, user_id: UUID) -> int:
+        """
+        The version of `user_id`'s choices: 0 until they are first written,
+        then one more after every `replace_for_user`/`remove_and_compact`.
+        """
+        ...
+
+    @abstractmethod
+    async def try_lock(self, user_id: UUID) -> bool:
+        """
+        Claim the writing of `user_id`'s choices until the transaction ends,
+        without waiting: False if another transaction has claimed it, True
+        again if this one already has.
+        """
+        ...
@@ -0,0 +1,25 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from src.domain.entities.choice import ChoiceSubmission
+
+
+class AbstractAsyncChoiceSubmissionRepository(ABC):
+    """Interface for the rankings remembered under an idempotency key."""
+
+    @abstractmethod
+    async def get(self, user_id: UUID, key: str) -> Optional[ChoiceSubmission]:
+        """Fetch what `user_id` submitted under `key`, however old."""
+        ...
+
+    @abstractmethod
+    async def put(self, submission: ChoiceSubmission) -> None:
+        """Store `submission`, replacing any older one under the same key."""
+        ...
+
+    @abstractmethod
+    async def prune(self, user_id: UUID, before: datetime) -> None:
+        """Forget `user_id`'s submissions made before `before`."""
+        ...
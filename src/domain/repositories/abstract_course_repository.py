@@ -13,7 +13,33 @@ class AbstractCourseRepository(ABC):
     def get_by_name(self, name: str) -> Optional[Course]: ...
     @abstractmethod
     def list(self) -> List[Course]: ...
+    @abstractmethod
+    def missing_ids(self, course_ids: List[UUID]) -> List[UUID]:
+        """
+        Those of `course_ids` that do not exist, checked in one query.
+        """
+        ...
+
     @abstractmethod
     def update(self, course: Course) -> None: ...
     @abstractmethod
     def delete(self, course_id: UUID) -> None: ...
+
+
+class AbstractAsyncCourseRepository(ABC):
+    """Async flavour of `AbstractCourseRepository`."""
+
+    @abstractmethod
+    async def add(self, course: Course) -> None: ...
+    @abstractmethod
+    async def get(self, course_id: UUID) -> Optional[Course]: ...
+    @abstractmethod
+    async def get_by_name(self, name: str) -> Optional[Course]: ...
+    @abstractmethod
+    async def list(self) -> List[Course]: ...
+    @abstractmethod
+    async def missing_ids(self, course_ids: List[UUID]) -> List[UUID]: ...
+    @abstractmethod
+    async def update(self, course: Course) -> None: ...
+    @abstractmethod
+    async def delete(self, course_id: UUID) -> None: ...
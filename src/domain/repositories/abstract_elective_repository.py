@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 from uuid import UUID
 
 from src.domain.entities import Elective
@@ -16,6 +16,13 @@ class AbstractElectiveRepository(ABC):
     def get_by_code(self, code: str) -> Optional[Elective]: ...
     @abstractmethod
     def list(self) -> List[Elective]: ...
+    @abstractmethod
+    def missing_ids(self, elective_ids: List[UUID]) -> List[UUID]:
+        """
+        Those of `elective_ids` that do not exist, checked in one query.
+        """
+        ...
+
     @abstractmethod
     def update(self, elective: Elective) -> None: ...
     @abstractmethod
@@ -27,3 +34,79 @@ class AbstractElectiveRepository(ABC):
         Replace the (many-to-many) course list for the given elective.
         """
         ...
+
+
+class AbstractAsyncElectiveRepository(ABC):
+    """Async flavour of `AbstractElectiveRepository`."""
+
+    @abstractmethod
+    async def add(self, elective: Elective) -> None: ...
+    @abstractmethod
+    async def get(self, elective_id: UUID) -> Optional[Elective]: ...
+    @abstractmethod
+    async def get_by_code(self, code: str) -> Optional[Elective]: ...
+    @abstractmethod
+    async def list(self) -> List[Elective]: ...
+
+    @abstractmethod
+    async def page(
+        self, fields: Sequence[str], *, after: Optional[str] = None, limit: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Up to `limit` electives with a code after `after`, ordered by code,
+        as rows of `fields` plus `code`.
+        """
+        ...
+
+    @abstractmethod
+    async def missing_ids(self, elective_ids: List[UUID]) -> List[UUID]: ...
+
+    @abstractmethod
+    async def not_offered_to(
+        self, user_id: UUID, elective_ids: List[UUID]
+    ) -> List[UUID]:
+        """
+        Those of `elective_ids` not offered to the course of user
+        `user_id` (all of them if the user has no course), in one query.
+        """
+        ...
+
+    @abstractmethod
+    async def update(self, elective: Elective) -> None: ...
+
+    @abstractmethod
+    async def delete(self, elective_id: UUID) -> bool:
+        """
+        Remove one elective; False if it did not exist.
+        """
+        ...
+
+    @abstractmethod
+    async def delete_all(self) -> int:
+        """
+        Remove every elective and return how many there were.
+        """
+        ...
+
+    @abstractmethod
+    async def set_courses(self, elective_id: UUID, course_ids: List[UUID]) -> None: ...
+
+    @abstractmethod
+    async def upsert_many(
+        self, electives: List[Elective]
+    ) -> List[Tuple[Elective, bool]]:
+        """
+        Insert `electives` in one statement; one whose code already exists
+        overwrites that row instead, keeping its id and `created_at`.
+        Returns the stored rows (without course ids), each with True if it
+        was inserted.  Codes must be unique within `electives`.
+        """
+        ...
+
+    @abstractmethod
+    async def replace_courses(self, course_ids: Mapping[UUID, List[UUID]]) -> None:
+        """
+        `set_courses` for many electives at once, in one DELETE and one
+        bulk INSERT.
+        """
+        ...
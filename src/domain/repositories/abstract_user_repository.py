@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 from src.domain.entities.user import User
 
@@ -36,3 +37,43 @@ class AbstractUserRepository(ABC):
     def update(self, user: User) -> None:
         """Persist changes to an existing User."""
         ...
+
+
+class AbstractAsyncUserRepository(ABC):
+    """Async flavour of `AbstractUserRepository`."""
+
+    @abstractmethod
+    async def add(self, user: User) -> None: ...
+    @abstractmethod
+    async def get(self, user_id: UUID) -> Optional[User]: ...
+    @abstractmethod
+    async def get_by_sso_id(self, sso_id: str) -> Optional[User]: ...
+    @abstractmethod
+    async def get_by_email(self, email: str) -> Optional[User]: ...
+    @abstractmethod
+    async def list(self) -> List[User]: ...
+
+    @abstractmethod
+    async def page(
+        self,
+        fields: Sequence[str],
+        *,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        """
+        Up to `limit` users following the `(created_at, id)` key `after`, in
+        that order, as rows of `fields` plus the two key columns.
+        """
+        ...
+
+    @abstractmethod
+    async def update(self, user: User) -> None: ...
+
+    @abstractmethod
+    async def mark_first_choice(self, user_id: UUID, at: datetime) -> bool:
+        """
+        Record `at` as when `user_id` first submitted choices, unless an
+        earlier submission already did.  True if this one did.
+        """
+        ...
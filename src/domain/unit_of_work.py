@@ -1,19 +1,29 @@
+import logging
 from abc import ABC, abstractmethod
-from typing import Optional, Type, Any
+from typing import Any, Callable, List, Optional, Tuple, Type
 
 from src.domain.repositories import (
     AbstractUserRepository,
     AbstractElectiveRepository,
     AbstractChoiceRepository,
     AbstractCourseRepository,
+    AbstractAllocationRepository,
+    AbstractAsyncUserRepository,
+    AbstractAsyncElectiveRepository,
+    AbstractAsyncChoiceRepository,
+    AbstractAsyncChoiceSubmissionRepository,
+    AbstractAsyncCourseRepository,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class AbstractUnitOfWork(ABC):
     users: AbstractUserRepository
     electives: AbstractElectiveRepository
     choices: AbstractChoiceRepository
     courses: AbstractCourseRepository
+    allocations: AbstractAllocationRepository
 
     def __enter__(self) -> "AbstractUnitOfWork":
         """
@@ -44,3 +54,101 @@ class AbstractUnitOfWork(ABC):
     def rollback(self) -> None:
         """Revert all changes."""
         ...
+
+
+class AbstractAsyncUnitOfWork(ABC):
+    """
+    Same contract as `AbstractUnitOfWork`, for `async with`.
+
+    Blocks nest: entering a UoW that is already open joins its transaction
+    instead of starting a new one, and only the outermost exit commits or
+    rolls back.  That lets one request share a single UoW between the auth
+    dependency and the services it calls.
+    """
+
+    users: AbstractAsyncUserRepository
+    electives: AbstractAsyncElectiveRepository
+    choices: AbstractAsyncChoiceRepository
+    courses: AbstractAsyncCourseRepository
+    submissions: AbstractAsyncChoiceSubmissionRepository
+
+    _depth: int = 0
+    _after_commit: List[Callable[[], None]]
+    _published: List[Tuple[str, str]]
+
+    async def __aenter__(self) -> "AbstractAsyncUnitOfWork":
+        """
+        Begin a transaction, or join the one already open.
+        """
+        self._depth += 1
+        if self._depth == 1:
+            self._after_commit = []
+            self._published = []
+            await self._begin()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[Any],
+    ) -> None:
+        """
+        On the outermost exit, commit if no exception, else rollback.
+        A nested block only flushes, so its writes are visible to the next.
+        """
+        self._depth -= 1
+        if self._depth:
+            if not exc_type:
+                await self._flush()
+            return
+        try:
+            if exc_type:
+                await self.rollback()
+            else:
+                await self._commit()
+                # the commit stands; a failing callback must not hide that
+                for callback in self._after_commit:
+                    try:
+                        callback()
+                    except Exception:
+                        logger.exception("on_commit callback failed")
+        finally:
+            self._after_commit = []
+            self._published = []
+            await self._end()
+
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        """
+        Run `callback` once the surrounding transaction has committed, e.g.
+        to drop caches only when other readers can see the new rows.  It is
+        discarded on rollback; if it raises, the error is logged and the
+        remaining callbacks still run.
+        """
+        self._after_commit.append(callback)
+
+    def publish(self, topic: str, key: str = "") -> None:
+        """
+        Announce that cached `topic` data (only `key`, if given) is stale,
+        to every worker, once the surrounding transaction has committed.
+        """
+        self._published.append((topic, key))
+
+    async def _begin(self) -> None:
+        """Acquire whatever the transaction needs."""
+
+    async def _end(self) -> None:
+        """Release it again."""
+
+    async def _flush(self) -> None:
+        """Send pending writes without committing."""
+
+    @abstractmethod
+    async def _commit(self) -> None:
+        """Persist all changes."""
+        ...
+
+    @abstractmethod
+    async def rollback(self) -> None:
+        """Revert all changes."""
+        ...
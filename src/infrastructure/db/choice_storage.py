@@ -0,0 +1,130 @@
+"""
+Which table holds the choices, and moving them from one to the other.
+
+Only the table named by `CHOICE_STORAGE` is written, so the other one is
+stale.  The database records which table is current (`choice_storage`),
+and the API refuses to start when that is not the configured one: run
+
+    python -m src.choice_storage switch rankings
+
+with the API stopped, then restart it with `CHOICE_STORAGE=rankings`.
+"""
+
+from sqlalchemy import delete, insert, select, text, update
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.infrastructure.db.models import (
+    MAX_PRIORITY,
+    ChoiceModel,
+    ChoiceStorageModel,
+)
+from src.infrastructure.db.repositories.ranking_repo import exploded_rankings
+
+MODES = ("rows", "rankings")
+
+
+class ChoiceStorageError(RuntimeError):
+    """The configured choice storage cannot be used as the database is."""
+
+
+def current_mode(session: Session) -> str:
+    return session.scalar(select(ChoiceStorageModel.mode))
+
+
+def check(session: Session) -> None:
+    """
+    Raise ChoiceStorageError unless `CHOICE_STORAGE` is the table that
+    holds the current choices and can take `MAX_CHOICES` of them.
+    """
+    configured = settings.CHOICE_STORAGE
+    if configured not in MODES:
+        raise ChoiceStorageError(f"CHOICE_STORAGE must be one of {MODES}")
+    if configured == "rows" and settings.MAX_CHOICES > MAX_PRIORITY:
+        raise ChoiceStorageError(
+            f"MAX_CHOICES={settings.MAX_CHOICES}, but the `choices` table holds"
+            f" at most {MAX_PRIORITY} per student; use CHOICE_STORAGE=rankings"
+        )
+    current = current_mode(session)
+    if current != configured:
+        raise ChoiceStorageError(
+            f"the choices are in {current!r} storage, not {configured!r};"
+            f" run `python -m src.choice_storage switch {configured}` first"
+        )
+
+
+# rows -> rankings: one array per student in priority order.  Students
+# known to either side get a ranking, empty if they have no choices now.
+_TO_RANKINGS = text("""
+    WITH ranked AS (
+        SELECT user_id, array_agg(elective_id ORDER BY priority) AS elective_ids,
+               min(created_at) AS replaced_at, max(updated_at) AS updated_at
+          FROM choices
+         GROUP BY user_id
+    ), everyone AS (
+        SELECT user_id FROM ranked
+         UNION SELECT user_id FROM choice_versions
+         UNION SELECT user_id FROM user_rankings
+    )
+    INSERT INTO user_rankings AS r
+           (user_id, elective_ids, version, replaced_at, updated_at)
+    SELECT e.user_id, coalesce(k.elective_ids, '{}'), coalesce(v.version, 0),
+           coalesce(k.replaced_at, now()), coalesce(k.updated_at, now())
+      FROM everyone e
+      LEFT JOIN ranked k USING (user_id)
+      LEFT JOIN choice_versions v USING (user_id)
+    ON CONFLICT (user_id) DO UPDATE
+       SET elective_ids = EXCLUDED.elective_ids,
+           version = greatest(r.version + 1, EXCLUDED.version),
+           replaced_at = EXCLUDED.replaced_at,
+           updated_at = EXCLUDED.updated_at
+    """)
+
+# rankings -> rows: the `choice_versions` side of the same version rule
+_ROW_VERSIONS = text("""
+    INSERT INTO choice_versions AS v (user_id, version)
+    SELECT user_id, version FROM user_rankings
+    ON CONFLICT (user_id) DO UPDATE
+       SET version = greatest(v.version + 1, EXCLUDED.version)
+    """)
+
+
+def switch(session: Session, to: str) -> int:
+    """
+    Copy the current choices into the `to` table and make it current;
+    returns the number of students copied.  Versions carry over, so an
+    ETag a client holds stays valid, and never go back to one the
+    target table handed out before.
+
+    The tables are locked against writes until the caller commits.
+    """
+    if to not in MODES:
+        raise ChoiceStorageError(f"storage must be one of {MODES}")
+    session.execute(
+        text(
+            "LOCK TABLE choice_storage, choices, choice_versions, user_rankings"
+            " IN EXCLUSIVE MODE"
+        )
+    )
+    if current_mode(session) == to:
+        return 0
+    if to == "rankings":
+        copied = session.execute(_TO_RANKINGS).rowcount
+    else:
+        longest = session.scalar(
+            text("SELECT max(cardinality(elective_ids)) FROM user_rankings")
+        )
+        if longest and longest > MAX_PRIORITY:
+            raise ChoiceStorageError(
+                f"a ranking holds {longest} choices, the `choices` table at"
+                f" most {MAX_PRIORITY}"
+            )
+        x = exploded_rankings()
+        names = ("id", "user_id", "elective_id", "priority", "created_at", "updated_at")
+        session.execute(delete(ChoiceModel))
+        session.execute(
+            insert(ChoiceModel).from_select(names, select(*(x.c[n] for n in names)))
+        )
+        copied = session.execute(_ROW_VERSIONS).rowcount
+    session.execute(update(ChoiceStorageModel).values(mode=to))
+    return copied
@@ -0,0 +1,124 @@
+"""
+Engine event hooks feeding `src.metrics`: statement counts and time,
+overall and per request, plus connection-pool gauges.  Statements slower
+than `settings.SLOW_QUERY_MS` are logged with the route that issued them.
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict
+
+from sqlalchemy import Engine, event
+from sqlalchemy.pool import Pool
+
+from src.config import settings
+from src.metrics import Counter, Gauge, Labels, current_request
+
+logger = logging.getLogger(__name__)
+
+_engines: Dict[str, Engine] = {}
+
+statements_total = Counter(
+    "db_statements_total", "SQL statements executed", labels=("engine",)
+)
+statement_seconds_total = Counter(
+    "db_statement_seconds_total",
+    "Time spent executing SQL statements",
+    labels=("engine",),
+)
+checkouts_total = Counter(
+    "db_pool_checkouts_total", "Connections handed out by the pool", labels=("engine",)
+)
+
+
+def _pool_stat(read: Callable[[Pool], float]) -> Callable[[], Dict[Labels, float]]:
+    return lambda: {(name,): read(engine.pool) for name, engine in _engines.items()}
+
+
+Gauge(
+    "db_pool_size",
+    "Connections the pool keeps open",
+    _pool_stat(lambda p: p.size()),
+    labels=("engine",),
+)
+Gauge(
+    "db_pool_checked_out",
+    "Connections in use",
+    _pool_stat(lambda p: p.checkedout()),
+    labels=("engine",),
+)
+Gauge(
+    "db_pool_checked_in",
+    "Idle connections",
+    _pool_stat(lambda p: p.checkedin()),
+    labels=("engine",),
+)
+Gauge(
+    "db_pool_overflow",
+    "Connections beyond the pool size; negative while the pool is not full",
+    _pool_stat(lambda p: p.overflow()),
+    labels=("engine",),
+)
+
+
+def _kind(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    """
+    Types (and array lengths) of bound parameters, never their values:
+    `{id_1: UUID, code_1: list[500]}`.
+    """
+    if executemany:
+        rows = list(parameters)
+        return f"{len(rows)} x {parameter_shape(rows[0])}" if rows else "[]"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {_kind(v)}" for k, v in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(_kind(v) for v in parameters) + ")"
+    return _kind(parameters)
+
+
+def _log_slow(
+    statement: str, parameters: Any, executemany: bool, elapsed: float
+) -> None:
+    stats = current_request.get()
+    origin = f"{stats.method} {stats.route}" if stats is not None else "-"
+    logger.warning(
+        "slow query %.1f ms on %s: %s params=%s",
+        elapsed * 1000,
+        origin,
+        " ".join(statement.split())[:1000],
+        parameter_shape(parameters, executemany),
+    )
+
+
+def instrument(engine: Engine, name: str) -> None:
+    """
+    Count and time every statement `engine` runs; for the async engine,
+    pass its `sync_engine`.
+    """
+    _engines[name] = engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _started(conn, cursor, statement, parameters, context, executemany):
+        context._started_at = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finished(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._started_at
+        statements_total.inc(name)
+        statement_seconds_total.inc(name, amount=elapsed)
+        stats = current_request.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_seconds += elapsed
+        if settings.SLOW_QUERY_MS and elapsed * 1000 >= settings.SLOW_QUERY_MS:
+            _log_slow(statement, parameters, executemany, elapsed)
+
+    @event.listens_for(engine.pool, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        checkouts_total.inc(name)
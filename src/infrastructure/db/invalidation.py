@@ -0,0 +1,86 @@
+"""
+Cache invalidation across workers over Postgres LISTEN/NOTIFY.
+
+A unit of work queues `(topic, key)` events while it runs and sends them
+with `pg_notify` inside its transaction, so Postgres delivers them only if
+it commits.  Every worker keeps one extra connection listening on
+`CHANNEL` and hands each event to the handler subscribed to its topic; the
+worker that made the change runs its handlers straight after the commit
+and ignores its own echo.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Callable, Dict, Optional
+from uuid import uuid4
+
+import psycopg
+from sqlalchemy import make_url
+
+from src.config import settings
+
+CHANNEL = "cache_invalidation"
+
+# `key` is None when everything under the topic may be stale
+Handler = Callable[[Optional[str]], None]
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidationBus:
+    def __init__(self) -> None:
+        self.origin = uuid4().hex
+        self._handlers: Dict[str, Handler] = {}
+
+    def subscribe(self, topic: str, handler: Handler) -> None:
+        self._handlers[topic] = handler
+
+    def dispatch(self, topic: str, key: Optional[str]) -> None:
+        if handler := self._handlers.get(topic):
+            handler(key)
+
+    def dispatch_all(self) -> None:
+        for handler in self._handlers.values():
+            handler(None)
+
+    def payload(self, topic: str, key: str) -> str:
+        return json.dumps({"origin": self.origin, "topic": topic, "key": key})
+
+    def receive(self, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning("ignoring malformed invalidation %r", payload)
+            return
+        if event.get("origin") != self.origin:
+            self.dispatch(event["topic"], event.get("key") or None)
+
+    async def listen(self, retry_delay: float = 1.0) -> None:
+        """
+        Consume notifications until cancelled, reconnecting on failure.
+        Events sent while disconnected are lost, so every (re)connect
+        starts by dropping all cached data.
+        """
+        conninfo = (
+            make_url(settings.DATABASE_URL)
+            .set(drivername="postgresql")
+            .render_as_string(hide_password=False)
+        )
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    conninfo, autocommit=True
+                ) as conn:
+                    await conn.execute(f"LISTEN {CHANNEL}")
+                    self.dispatch_all()
+                    async for notify in conn.notifies():
+                        self.receive(notify.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("invalidation listener lost its connection")
+            await asyncio.sleep(retry_delay)
+
+
+invalidation_bus = InvalidationBus()
@@ -1,6 +1,8 @@
 from uuid import uuid4
 from datetime import datetime, timezone
 from sqlalchemy import (
+    BigInteger,
+    Boolean,
     Column,
     Text,
     Integer,
@@ -9,14 +11,18 @@ from sqlalchemy import (
     CheckConstraint,
     UniqueConstraint,
     ForeignKey,
+    Index,
     Table,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
 Base = declarative_base()
 
+# the highest priority a `choices` row may hold; `user_rankings` has no cap
+MAX_PRIORITY = 5
+
 
 class UserModel(Base):
     __tablename__ = "users"
@@ -28,11 +34,21 @@ class UserModel(Base):
 
     # Single role field
     role = Column(Text, nullable=False, default="Student")
+    # whose quotas and electives apply to the student; set by an admin
+    course_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("courses.id", ondelete="SET NULL"),
+        index=True,
+    )
+    # the SUBMISSION tie-break: set by the first ranking, kept by later ones
+    first_choice_at = Column(DateTime(timezone=True))
     __table_args__ = (
         CheckConstraint(
             "role IN ('Admin', 'Student', 'Instructor')",
             name="chk_users_role",
         ),
+        # keyset pagination order
+        Index("ix_users_created_at_id", "created_at", "id"),
     )
 
     created_at = Column(
@@ -87,8 +103,18 @@ class ChoiceModel(Base):
     __tablename__ = "choices"
     __table_args__ = (
         UniqueConstraint("user_id", "elective_id", name="uq_user_elective"),
-        UniqueConstraint("user_id", "priority", name="uq_user_priority"),
-        CheckConstraint("priority BETWEEN 1 AND 5", name="chk_priority_range"),
+        UniqueConstraint(
+            "user_id",
+            "priority",
+            name="uq_user_priority",
+            deferrable=True,
+            initially="IMMEDIATE",
+        ),
+        CheckConstraint(
+            f"priority BETWEEN 1 AND {MAX_PRIORITY}", name="chk_priority_range"
+        ),
+        # keyset pagination order
+        Index("ix_choices_created_at_id", "created_at", "id"),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
@@ -115,6 +141,95 @@ class ChoiceModel(Base):
     elective = relationship("ElectiveModel", back_populates="choices")
 
 
+class UserRankingModel(Base):
+    """
+    A student's choices as one row: elective ids in priority order.  The
+    alternative to `choices` rows, see `CHOICE_STORAGE` in the config.
+    """
+
+    __tablename__ = "user_rankings"
+    __table_args__ = (
+        # "who ranked this elective": elective_ids @> ARRAY[:id]
+        Index("ix_user_rankings_elective_ids", "elective_ids", postgresql_using="gin"),
+    )
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    elective_ids = Column(ARRAY(UUID(as_uuid=True)), nullable=False)
+    # bumped by every write to the ranking
+    version = Column(Integer, nullable=False, default=1)
+    # when the ranking was last submitted as a whole: its choices' created_at
+    replaced_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+
+class ChoiceStorageModel(Base):
+    """
+    The one row saying which table holds the current choices, `choices`
+    ("rows") or `user_rankings` ("rankings").  The other one goes stale.
+    """
+
+    __tablename__ = "choice_storage"
+    __table_args__ = (
+        CheckConstraint("id", name="chk_choice_storage_one_row"),
+        CheckConstraint("mode IN ('rows', 'rankings')", name="chk_choice_storage_mode"),
+    )
+
+    id = Column(Boolean, primary_key=True, default=True)
+    mode = Column(Text, nullable=False)
+
+
+class ChoiceVersionModel(Base):
+    """
+    The version of a student's `choices` rows, bumped by every write to
+    them; `user_rankings` keeps its own.  No row means version 0.
+    """
+
+    __tablename__ = "choice_versions"
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    version = Column(Integer, nullable=False, default=1)
+
+
+class ChoiceSubmissionModel(Base):
+    """
+    A ranking submitted with an `Idempotency-Key` and the version it was
+    written as, so a retry with the same key is answered from here.  Rows
+    older than `IDEMPOTENCY_TTL_SECONDS` are ignored and pruned per user.
+    """
+
+    __tablename__ = "choice_submissions"
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    key = Column(Text, primary_key=True)
+    elective_ids = Column(ARRAY(UUID(as_uuid=True)), nullable=False)
+    version = Column(Integer, nullable=False)
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+
 class CourseModel(Base):
     __tablename__ = "courses"
 
@@ -155,3 +270,51 @@ elective_courses = Table(
         primary_key=True,
     ),
 )
+
+
+class AllocationRunModel(Base):
+    """
+    One stored run, even one that seated nobody; its seats are in
+    `allocations` and go with it.
+    """
+
+    __tablename__ = "allocation_runs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    seats = Column(Integer, nullable=False)
+    # the lottery seed and {elective id: seats} it ran with; the live
+    # allocation follows the newest run that has them
+    seed = Column(BigInteger)
+    capacities = Column(JSONB)
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+    __table_args__ = (Index("ix_allocation_runs_created_at", "created_at"),)
+
+
+class AllocationModel(Base):
+    __tablename__ = "allocations"
+
+    run_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("allocation_runs.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    elective_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("electives.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    priority = Column(SmallInteger, nullable=False)
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
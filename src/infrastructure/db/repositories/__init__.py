@@ -1,11 +1,25 @@
-from .choice_repo import SqlAlchemyChoiceRepo
-from .elective_repo import SqlAlchemyElectiveRepo
-from .user_repo import SqlAlchemyUserRepo
-from .course_repo import SqlAlchemyCourseRepo
+from .choice_repo import SqlAlchemyChoiceRepo, SqlAlchemyAsyncChoiceRepo
+from .ranking_repo import (
+    SqlAlchemyRankingChoiceRepo,
+    SqlAlchemyAsyncRankingChoiceRepo,
+)
+from .submission_repo import SqlAlchemyAsyncChoiceSubmissionRepo
+from .elective_repo import SqlAlchemyElectiveRepo, SqlAlchemyAsyncElectiveRepo
+from .user_repo import SqlAlchemyUserRepo, SqlAlchemyAsyncUserRepo
+from .course_repo import SqlAlchemyCourseRepo, SqlAlchemyAsyncCourseRepo
+from .allocation_repo import SqlAlchemyAllocationRepo
 
 __all__ = [
     "SqlAlchemyUserRepo",
     "SqlAlchemyElectiveRepo",
     "SqlAlchemyChoiceRepo",
+    "SqlAlchemyRankingChoiceRepo",
     "SqlAlchemyCourseRepo",
+    "SqlAlchemyAllocationRepo",
+    "SqlAlchemyAsyncUserRepo",
+    "SqlAlchemyAsyncElectiveRepo",
+    "SqlAlchemyAsyncChoiceRepo",
+    "SqlAlchemyAsyncRankingChoiceRepo",
+    "SqlAlchemyAsyncChoiceSubmissionRepo",
+    "SqlAlchemyAsyncCourseRepo",
 ]
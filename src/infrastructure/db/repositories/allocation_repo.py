@@ -0,0 +1,114 @@
+from typing import Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, insert, select, tuple_
+from sqlalchemy.orm import Session
+
+from src.domain.entities import Allocation, AllocationRun
+from src.domain.repositories import AbstractAllocationRepository
+from src.infrastructure.db.models import AllocationModel, AllocationRunModel
+from src.infrastructure.db.repositories.rows import entity_builder
+
+_NAMES = ("run_id", "user_id", "elective_id", "priority")
+_RUN_NAMES = ("id", "seats", "created_at", "seed", "capacities")
+
+
+class SqlAlchemyAllocationRepo(AbstractAllocationRepository):
+    _columns = tuple(getattr(AllocationModel, name) for name in _NAMES)
+    _to_entity = staticmethod(entity_builder(Allocation, _NAMES))
+    _run_columns = tuple(getattr(AllocationRunModel, name) for name in _RUN_NAMES)
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def add_run(self, run: AllocationRun, allocations: List[Allocation]) -> None:
+        self.session.execute(
+            insert(AllocationRunModel).values(
+                id=run.id,
+                seats=run.seats,
+                created_at=run.created_at,
+                seed=run.seed,
+                capacities=(
+                    None
+                    if run.capacities is None
+                    else {str(k): v for k, v in run.capacities.items()}
+                ),
+            )
+        )
+        if not allocations:
+            return
+        # executemany through insertmanyvalues: a handful of multi-row
+        # INSERTs for the whole run instead of one ORM flush per seat
+        self.session.execute(
+            insert(AllocationModel),
+            [
+                {
+                    "run_id": run.id,
+                    "user_id": a.user_id,
+                    "elective_id": a.elective_id,
+                    "priority": a.priority,
+                    "created_at": run.created_at,
+                }
+                for a in allocations
+            ],
+        )
+
+    def list_runs(self) -> List[AllocationRun]:
+        stmt = select(*self._run_columns).order_by(AllocationRunModel.created_at.desc())
+        return [self._to_run(r) for r in self.session.execute(stmt)]
+
+    def get_run(self, run_id: UUID) -> Optional[AllocationRun]:
+        row = self.session.execute(
+            select(*self._run_columns).where(AllocationRunModel.id == run_id)
+        ).first()
+        return self._to_run(row) if row else None
+
+    def latest_run(self) -> Optional[AllocationRun]:
+        row = self.session.execute(
+            select(*self._run_columns)
+            .where(AllocationRunModel.capacities.is_not(None))
+            .order_by(AllocationRunModel.created_at.desc())
+            .limit(1)
+        ).first()
+        return self._to_run(row) if row else None
+
+    @staticmethod
+    def _to_run(row) -> AllocationRun:
+        # validated, unlike the seats: JSONB hands the capacities back
+        # keyed by strings; runs are few
+        return AllocationRun.model_validate(row._mapping)
+
+    def page(
+        self,
+        run_id: UUID,
+        *,
+        after: Optional[Tuple[UUID, UUID]] = None,
+        limit: int = 1000,
+    ) -> List[Allocation]:
+        stmt = select(*self._columns).where(AllocationModel.run_id == run_id)
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(AllocationModel.user_id, AllocationModel.elective_id)
+                > tuple_(*after)
+            )
+        stmt = stmt.order_by(AllocationModel.user_id, AllocationModel.elective_id)
+        return [self._to_entity(r) for r in self.session.execute(stmt.limit(limit))]
+
+    def stream(self, run_id: UUID, *, batch_size: int = 1000) -> Iterator[Allocation]:
+        stmt = (
+            select(*self._columns)
+            .where(AllocationModel.run_id == run_id)
+            .order_by(AllocationModel.user_id, AllocationModel.elective_id)
+            .execution_options(yield_per=batch_size)
+        )
+        for row in self.session.execute(stmt):
+            yield self._to_entity(row)
+
+    def delete_run(self, run_id: UUID) -> bool:
+        # the seats go with it (ON DELETE CASCADE)
+        result = self.session.execute(
+            delete(AllocationRunModel)
+            .where(AllocationRunModel.id == run_id)
+            .returning(AllocationRunModel.id)
+        )
+        return result.first() is not None
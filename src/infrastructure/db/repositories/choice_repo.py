@@ -1,11 +1,96 @@
-from typing import List, Optional, cast
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 from datetime import datetime, timezone
+from sqlalchemy import (
+    delete,
+    exists,
+    false,
+    insert,
+    select,
+    true,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.domain.repositories import AbstractChoiceRepository
+from src.domain.repositories import (
+    AbstractAsyncChoiceRepository,
+    AbstractChoiceRepository,
+)
 from src.domain.entities.choice import Choice
-from src.infrastructure.db.models import ChoiceModel
+from src.infrastructure.db.models import (
+    ChoiceModel,
+    ChoiceVersionModel,
+    ElectiveModel,
+    UserModel,
+)
+from src.infrastructure.db.repositories.keyset import keyset_page
+from src.infrastructure.db.repositories.locks import try_lock
+from src.infrastructure.db.repositories.rows import entity_builder
+
+_NAMES = ("id", "user_id", "elective_id", "priority", "created_at", "updated_at")
+_COLUMNS = tuple(getattr(ChoiceModel.__table__.c, name) for name in _NAMES)
+# rows of `_COLUMNS`, plus anything selected after them
+_to_entity = entity_builder(Choice, _NAMES)
+
+
+def _remove_and_compact(user_id: UUID, priority: int):
+    """
+    One statement: the DELETE and the shifting UPDATE are data-modifying
+    CTEs, and the rows in front of the gap come from the same snapshot.
+    `uq_user_priority` is deferrable, so it is only checked once the whole
+    shift is done.  Every row carries a `removed` flag; the deleted one is
+    returned too so "nothing at that priority" can be told apart from
+    "deleted the last choice".
+    """
+    c = ChoiceModel.__table__.c
+    gone = (
+        delete(ChoiceModel)
+        .where(ChoiceModel.user_id == user_id, ChoiceModel.priority == priority)
+        .returning(*_COLUMNS)
+        .cte("gone")
+    )
+    found = exists(select(gone.c.id))
+    shifted = (
+        update(ChoiceModel)
+        .where(ChoiceModel.user_id == user_id, ChoiceModel.priority > priority, found)
+        .values(
+            priority=ChoiceModel.priority - 1,
+            updated_at=datetime.now(timezone.utc),
+        )
+        .returning(*_COLUMNS)
+        .cte("shifted")
+    )
+    kept = select(*_COLUMNS, false().label("removed")).where(
+        c.user_id == user_id, c.priority < priority, found
+    )
+    return union_all(
+        select(*shifted.c, false().label("removed")),
+        kept,
+        select(*gone.c, true().label("removed")),
+    )
+
+
+def _bump_version(user_id: UUID):
+    return (
+        pg_insert(ChoiceVersionModel)
+        .values(user_id=user_id, version=1)
+        .on_conflict_do_update(
+            index_elements=[ChoiceVersionModel.user_id],
+            set_={"version": ChoiceVersionModel.version + 1},
+        )
+    )
+
+
+def _compacted(rows) -> Optional[List[Choice]]:
+    rows = list(rows)
+    if not any(r.removed for r in rows):
+        return None
+    return sorted(
+        (_to_entity(r) for r in rows if not r.removed), key=lambda ch: ch.priority
+    )
 
 
 class SqlAlchemyChoiceRepo(AbstractChoiceRepository):
@@ -28,69 +113,149 @@ class SqlAlchemyChoiceRepo(AbstractChoiceRepository):
         m.priority = choice.priority  # type: ignore
         m.updated_at = datetime.now(timezone.utc)  # type: ignore
 
+    def _fetch(self, stmt) -> List[Choice]:
+        return [_to_entity(r) for r in self.session.execute(stmt)]
+
     def get(self, choice_id: UUID) -> Optional[Choice]:
-        m = self.session.query(ChoiceModel).filter_by(id=choice_id).one_or_none()
-        if m is None:
-            return None
-        return Choice(
-            id=cast(UUID, m.id),
-            user_id=cast(UUID, m.user_id),
-            elective_id=cast(UUID, m.elective_id),
-            priority=cast(int, m.priority),
-            created_at=cast(datetime, m.created_at),
-            updated_at=cast(datetime, m.updated_at),
-        )
+        found = self._fetch(select(*_COLUMNS).where(ChoiceModel.id == choice_id))
+        return found[0] if found else None
 
     def list(self) -> List[Choice]:
-        models = self.session.query(ChoiceModel).all()
-        return [
-            Choice(
-                id=cast(UUID, m.id),
-                user_id=cast(UUID, m.user_id),
-                elective_id=cast(UUID, m.elective_id),
-                priority=cast(int, m.priority),
-                created_at=cast(datetime, m.created_at),
-                updated_at=cast(datetime, m.updated_at),
-            )
-            for m in models
-        ]
+        return self._fetch(select(*_COLUMNS))
 
     def list_by_user(self, user_id: UUID) -> List[Choice]:
-        models = (
-            self.session.query(ChoiceModel)
-            .filter_by(user_id=user_id)
+        return self._fetch(
+            select(*_COLUMNS)
+            .where(ChoiceModel.user_id == user_id)
             .order_by(ChoiceModel.priority)
-            .all()
-        )
-        return [
-            Choice(
-                id=cast(UUID, m.id),
-                user_id=cast(UUID, m.user_id),
-                elective_id=cast(UUID, m.elective_id),
-                priority=cast(int, m.priority),
-                created_at=cast(datetime, m.created_at),
-                updated_at=cast(datetime, m.updated_at),
-            )
-            for m in models
-        ]
+        )
 
     def list_by_elective(self, elective_id: UUID) -> List[Choice]:
-        models = (
-            self.session.query(ChoiceModel).filter_by(elective_id=elective_id).all()
-        )
-        return [
-            Choice(
-                id=cast(UUID, m.id),
-                user_id=cast(UUID, m.user_id),
-                elective_id=cast(UUID, m.elective_id),
-                priority=cast(int, m.priority),
-                created_at=cast(datetime, m.created_at),
-                updated_at=cast(datetime, m.updated_at),
-            )
-            for m in models
-        ]
+        return self._fetch(
+            select(*_COLUMNS).where(ChoiceModel.elective_id == elective_id)
+        )
+
+    def replace_for_user(self, user_id: UUID, choices: List[Choice]) -> None:
+        self.session.execute(delete(ChoiceModel).where(ChoiceModel.user_id == user_id))
+        if choices:
+            self.session.execute(insert(ChoiceModel), [c.model_dump() for c in choices])
+        self.session.execute(_bump_version(user_id))
+
+    def remove_and_compact(
+        self, user_id: UUID, priority: int
+    ) -> Optional[List[Choice]]:
+        remaining = _compacted(
+            self.session.execute(_remove_and_compact(user_id, priority))
+        )
+        if remaining is not None:
+            self.session.execute(_bump_version(user_id))
+        return remaining
 
     def delete(self, choice_id: UUID) -> None:
         self.session.query(ChoiceModel).filter_by(id=choice_id).delete(
             synchronize_session=False
         )
+
+
+class SqlAlchemyAsyncChoiceRepo(AbstractAsyncChoiceRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def _fetch(self, stmt) -> List[Choice]:
+        return [_to_entity(r) for r in await self.session.execute(stmt)]
+
+    async def add(self, choice: Choice) -> None:
+        self.session.add(ChoiceModel(**choice.model_dump()))
+
+    async def update(self, choice: Choice) -> None:
+        await self.session.execute(
+            update(ChoiceModel)
+            .where(ChoiceModel.id == choice.id)
+            .values(priority=choice.priority, updated_at=datetime.now(timezone.utc))
+        )
+
+    async def get(self, choice_id: UUID) -> Optional[Choice]:
+        found = await self._fetch(select(*_COLUMNS).where(ChoiceModel.id == choice_id))
+        return found[0] if found else None
+
+    async def list(self) -> List[Choice]:
+        return await self._fetch(select(*_COLUMNS))
+
+    async def page(
+        self,
+        fields: Sequence[str],
+        *,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        stmt = keyset_page(
+            ChoiceModel, fields, ("created_at", "id"), after=after, limit=limit
+        )
+        return [dict(row._mapping) for row in await self.session.execute(stmt)]
+
+    async def export(self, *, batch_size: int = 1000) -> AsyncIterator[Dict[str, Any]]:
+        # no ORDER BY: rows leave the server-side cursor as the scan finds
+        # them, so the first batch arrives before the whole table is read
+        stmt = (
+            select(
+                ChoiceModel.user_id,
+                UserModel.email,
+                ChoiceModel.elective_id,
+                ElectiveModel.code.label("elective_code"),
+                ChoiceModel.priority,
+                ChoiceModel.created_at,
+            )
+            .join(UserModel, UserModel.id == ChoiceModel.user_id)
+            .join(ElectiveModel, ElectiveModel.id == ChoiceModel.elective_id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for row in await self.session.stream(stmt):
+            yield dict(row._mapping)
+
+    async def list_by_user(self, user_id: UUID) -> List[Choice]:
+        return await self._fetch(
+            select(*_COLUMNS)
+            .where(ChoiceModel.user_id == user_id)
+            .order_by(ChoiceModel.priority)
+        )
+
+    async def list_by_elective(self, elective_id: UUID) -> List[Choice]:
+        return await self._fetch(
+            select(*_COLUMNS).where(ChoiceModel.elective_id == elective_id)
+        )
+
+    async def replace_for_user(self, user_id: UUID, choices: List[Choice]) -> None:
+        await self.session.execute(
+            delete(ChoiceModel).where(ChoiceModel.user_id == user_id)
+        )
+        if choices:
+            await self.session.execute(
+                insert(ChoiceModel), [c.model_dump() for c in choices]
+            )
+        await self.session.execute(_bump_version(user_id))
+
+    async def remove_and_compact(
+        self, user_id: UUID, priority: int
+    ) -> Optional[List[Choice]]:
+        remaining = _compacted(
+            await self.session.execute(_remove_and_compact(user_id, priority))
+        )
+        if remaining is not None:
+            await self.session.execute(_bump_version(user_id))
+        return remaining
+
+    async def delete(self, choice_id: UUID) -> None:
+        await self.session.execute(
+            delete(ChoiceModel).where(ChoiceModel.id == choice_id)
+        )
+
+    async def version(self, user_id: UUID) -> int:
+        found = await self.session.scalar(
+            select(ChoiceVersionModel.version).where(
+                ChoiceVersionModel.user_id == user_id
+            )
+        )
+        return found or 0
+
+    async def try_lock(self, user_id: UUID) -> bool:
+        return await self.session.scalar(try_lock("choices", user_id))
@@ -1,11 +1,21 @@
 from datetime import datetime, timezone
 from typing import List, Optional, cast
 from uuid import UUID
+from sqlalchemy import any_, delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from src.domain.entities.course import Course
-from src.domain.repositories.abstract_course_repository import AbstractCourseRepository
+from src.domain.repositories.abstract_course_repository import (
+    AbstractAsyncCourseRepository,
+    AbstractCourseRepository,
+)
 from src.infrastructure.db.models import CourseModel
+from src.infrastructure.db.repositories.rows import entity_builder
+
+_NAMES = ("id", "name", "tech_quota", "hum_quota", "created_at", "updated_at")
+_COLUMNS = tuple(getattr(CourseModel.__table__.c, name) for name in _NAMES)
+_to_entity = entity_builder(Course, _NAMES)
 
 
 class SqlAlchemyCourseRepo(AbstractCourseRepository):
@@ -15,16 +25,30 @@ class SqlAlchemyCourseRepo(AbstractCourseRepository):
     def add(self, course: Course) -> None:
         self.session.add(CourseModel(**course.model_dump()))
 
+    def _one_by(self, **criteria) -> Optional[Course]:
+        row = self.session.execute(
+            select(*_COLUMNS).filter_by(**criteria)
+        ).one_or_none()
+        return _to_entity(row) if row else None
+
     def get(self, course_id: UUID) -> Optional[Course]:
-        m = self.session.get(CourseModel, course_id)
-        return Course(**m.__dict__) if m else None
+        return self._one_by(id=course_id)
 
     def get_by_name(self, name: str) -> Optional[Course]:
-        m = self.session.query(CourseModel).filter_by(name=name).one_or_none()
-        return Course(**m.__dict__) if m else None
+        return self._one_by(name=name)
 
     def list(self) -> List[Course]:
-        return [Course(**m.__dict__) for m in self.session.query(CourseModel).all()]
+        return [_to_entity(r) for r in self.session.execute(select(*_COLUMNS))]
+
+    def missing_ids(self, course_ids: List[UUID]) -> List[UUID]:
+        if not course_ids:
+            return []
+        found = set(
+            self.session.scalars(
+                select(CourseModel.id).where(CourseModel.id == any_(course_ids))
+            )
+        )
+        return [cid for cid in course_ids if cid not in found]
 
     def update(self, course: Course) -> None:
         self.session.merge(course.model_dump())
@@ -33,3 +57,41 @@ class SqlAlchemyCourseRepo(AbstractCourseRepository):
         self.session.query(CourseModel).filter_by(id=course_id).delete(
             synchronize_session=False
         )
+
+
+class SqlAlchemyAsyncCourseRepo(AbstractAsyncCourseRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add(self, course: Course) -> None:
+        self.session.add(CourseModel(**course.model_dump()))
+
+    async def _one_by(self, **criteria) -> Optional[Course]:
+        result = await self.session.execute(select(*_COLUMNS).filter_by(**criteria))
+        row = result.one_or_none()
+        return _to_entity(row) if row else None
+
+    async def get(self, course_id: UUID) -> Optional[Course]:
+        return await self._one_by(id=course_id)
+
+    async def get_by_name(self, name: str) -> Optional[Course]:
+        return await self._one_by(name=name)
+
+    async def list(self) -> List[Course]:
+        return [_to_entity(r) for r in await self.session.execute(select(*_COLUMNS))]
+
+    async def missing_ids(self, course_ids: List[UUID]) -> List[UUID]:
+        if not course_ids:
+            return []
+        found = set(
+            await self.session.scalars(
+                select(CourseModel.id).where(CourseModel.id == any_(course_ids))
+            )
+        )
+        return [cid for cid in course_ids if cid not in found]
+
+    async def update(self, course: Course) -> None:
+        await self.session.merge(CourseModel(**course.model_dump()))
+
+    async def delete(self, course_id: UUID) -> None:
+        await self.session.execute(delete(CourseModel).filter_by(id=course_id))
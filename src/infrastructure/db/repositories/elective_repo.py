@@ -1,13 +1,142 @@
 from datetime import datetime, timezone
-from typing import List, Optional, cast
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, cast
 from uuid import UUID
 
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Executable,
+    Select,
+    any_,
+    delete,
+    exists,
+    func,
+    literal,
+    literal_column,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from src.domain.entities import Elective
 from src.domain.exceptions import ElectiveNotFoundError
-from src.domain.repositories import AbstractElectiveRepository
-from src.infrastructure.db.models import CourseModel, ElectiveModel
+from src.domain.repositories import (
+    AbstractAsyncElectiveRepository,
+    AbstractElectiveRepository,
+)
+from src.infrastructure.db.models import ElectiveModel, UserModel, elective_courses
+from src.infrastructure.db.repositories.keyset import keyset_page
+from src.infrastructure.db.repositories.rows import entity_builder
+
+
+def _with_course_ids(stmt: Select) -> Select:
+    """
+    Add the elective's course ids to `stmt` as one array column.
+    """
+    course_ids = func.array_remove(
+        func.array_agg(elective_courses.c.course_id),
+        None,
+        type_=ARRAY(PG_UUID(as_uuid=True)),
+    )
+    return (
+        stmt.add_columns(course_ids.label("course_ids"))
+        .outerjoin(elective_courses, elective_courses.c.elective_id == ElectiveModel.id)
+        .group_by(ElectiveModel.id)
+    )
+
+
+_CATALOG_NAMES = (
+    "id",
+    "code",
+    "title",
+    "description",
+    "instructor",
+    "category",
+    "created_at",
+    "updated_at",
+    "course_ids",
+)
+
+
+def _catalog_query() -> Select:
+    """
+    Electives with their course ids folded into one array column, so a
+    read is a single round-trip instead of one lazy load per elective.
+    """
+    return _with_course_ids(
+        select(*(getattr(ElectiveModel, name) for name in _CATALOG_NAMES[:-1]))
+    )
+
+
+# rows of `_catalog_query()`
+_to_entity = entity_builder(Elective, _CATALOG_NAMES)
+
+
+_UPSERT_COLUMNS = (
+    "id",
+    "code",
+    "title",
+    "description",
+    "instructor",
+    "category",
+    "created_at",
+    "updated_at",
+)
+
+
+def _unnest(columns: Sequence[Tuple[Column, List[Any]]]) -> Select:
+    """
+    `SELECT * FROM unnest(:a, :b, ...)`: one array parameter per column,
+    so a bulk write is a single, cacheable statement whatever the row
+    count, rather than a VALUES list compiled afresh for every batch.
+    """
+    arrays = [literal(values, ARRAY(column.type)) for column, values in columns]
+    rows = func.unnest(*arrays).table_valued(*(c.key for c, _ in columns))
+    return select(rows.render_derived())
+
+
+def _link_courses(course_ids: Mapping[UUID, List[UUID]]) -> List[Executable]:
+    """
+    Statements that make the `elective_courses` rows of the given electives
+    exactly `course_ids`, whatever they held before: one DELETE of the
+    links no longer wanted and one INSERT of the missing ones.  Links that
+    stay are left alone, and the cost does not grow with the course count.
+    """
+    links = [(eid, cid) for eid, cids in course_ids.items() for cid in cids]
+    elective_ids, linked = (list(c) for c in zip(*links)) if links else ([], [])
+    wanted = _unnest(
+        [
+            (elective_courses.c.elective_id, elective_ids),
+            (elective_courses.c.course_id, linked),
+        ]
+    )
+    w = wanted.subquery("wanted")
+    statements: List[Executable] = [
+        delete(elective_courses).where(
+            elective_courses.c.elective_id == any_(list(course_ids)),
+            ~exists().where(
+                w.c.elective_id == elective_courses.c.elective_id,
+                w.c.course_id == elective_courses.c.course_id,
+            ),
+        )
+    ]
+    if links:
+        statements.append(
+            pg_insert(elective_courses)
+            .from_select(["elective_id", "course_id"], wanted)
+            .on_conflict_do_nothing()
+        )
+    return statements
+
+
+def _touch(elective_id: UUID) -> Executable:
+    return (
+        update(ElectiveModel)
+        .where(ElectiveModel.id == elective_id)
+        .values(updated_at=datetime.now(timezone.utc))
+    )
 
 
 class SqlAlchemyElectiveRepo(AbstractElectiveRepository):
@@ -18,19 +147,8 @@ class SqlAlchemyElectiveRepo(AbstractElectiveRepository):
     def __init__(self, session: Session) -> None:
         self.session = session
 
-    @staticmethod
-    def _row_to_entity(row: ElectiveModel) -> Elective:
-        return Elective(
-            id=cast(UUID, row.id),
-            code=cast(str, row.code),
-            title=cast(str, row.title),
-            description=cast(Optional[str], row.description),
-            instructor=cast(str, row.instructor),
-            category=cast(str, row.category),
-            course_ids=[cast(UUID, c.id) for c in row.courses],
-            created_at=cast(datetime, row.created_at),
-            updated_at=cast(datetime, row.updated_at),
-        )
+    def _fetch(self, stmt: Select) -> List[Elective]:
+        return [_to_entity(row) for row in self.session.execute(stmt)]
 
     def add(self, elective: Elective) -> None:
         """
@@ -50,15 +168,25 @@ class SqlAlchemyElectiveRepo(AbstractElectiveRepository):
         )
 
     def get(self, elective_id: UUID) -> Optional[Elective]:
-        row = self.session.get(ElectiveModel, elective_id)
-        return self._row_to_entity(row) if row else None
+        found = self._fetch(_catalog_query().where(ElectiveModel.id == elective_id))
+        return found[0] if found else None
 
     def get_by_code(self, code: str) -> Optional[Elective]:
-        row = self.session.query(ElectiveModel).filter_by(code=code).one_or_none()
-        return self._row_to_entity(row) if row else None
+        found = self._fetch(_catalog_query().where(ElectiveModel.code == code))
+        return found[0] if found else None
 
     def list(self) -> List[Elective]:
-        return [self._row_to_entity(r) for r in self.session.query(ElectiveModel).all()]
+        return self._fetch(_catalog_query().order_by(ElectiveModel.code))
+
+    def missing_ids(self, elective_ids: List[UUID]) -> List[UUID]:
+        if not elective_ids:
+            return []
+        found = set(
+            self.session.scalars(
+                select(ElectiveModel.id).where(ElectiveModel.id == any_(elective_ids))
+            )
+        )
+        return [eid for eid in elective_ids if eid not in found]
 
     def update(self, elective: Elective) -> None:
         """
@@ -84,18 +212,159 @@ class SqlAlchemyElectiveRepo(AbstractElectiveRepository):
         """
         Replace all linked courses for the given elective.
 
-        Flush first so the newly-inserted elective row (if any) is visible
-        to SELECT; otherwise `session.get()` would return `None`.
+        Flush first so a newly added elective row exists for the UPDATE and
+        the foreign keys.
         """
         self.session.flush()
 
-        row: Optional[ElectiveModel] = self.session.get(ElectiveModel, elective_id)
+        touched = self.session.execute(_touch(elective_id))
+        if not touched.rowcount:  # type: ignore[attr-defined]
+            raise ElectiveNotFoundError(f"Elective '{elective_id}' not found")
+        for stmt in _link_courses({elective_id: course_ids}):
+            self.session.execute(stmt)
+
+
+class SqlAlchemyAsyncElectiveRepo(AbstractAsyncElectiveRepository):
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def _fetch(self, stmt: Select) -> List[Elective]:
+        return [_to_entity(row) for row in await self.session.execute(stmt)]
+
+    async def add(self, elective: Elective) -> None:
+        self.session.add(
+            ElectiveModel(  # type: ignore[call-arg]
+                **elective.model_dump(exclude={"course_ids"})
+            )
+        )
+
+    async def get(self, elective_id: UUID) -> Optional[Elective]:
+        found = await self._fetch(
+            _catalog_query().where(ElectiveModel.id == elective_id)
+        )
+        return found[0] if found else None
+
+    async def get_by_code(self, code: str) -> Optional[Elective]:
+        found = await self._fetch(_catalog_query().where(ElectiveModel.code == code))
+        return found[0] if found else None
+
+    async def list(self) -> List[Elective]:
+        return await self._fetch(_catalog_query().order_by(ElectiveModel.code))
+
+    async def page(
+        self, fields: Sequence[str], *, after: Optional[str] = None, limit: int
+    ) -> List[Dict[str, Any]]:
+        stmt = keyset_page(
+            ElectiveModel,
+            [f for f in fields if f != "course_ids"],
+            ("code",),
+            after=None if after is None else (after,),
+            limit=limit,
+        )
+        if "course_ids" in fields:
+            stmt = _with_course_ids(stmt)
+        return [dict(row._mapping) for row in await self.session.execute(stmt)]
+
+    async def missing_ids(self, elective_ids: List[UUID]) -> List[UUID]:
+        if not elective_ids:
+            return []
+        found = set(
+            await self.session.scalars(
+                select(ElectiveModel.id).where(ElectiveModel.id == any_(elective_ids))
+            )
+        )
+        return [eid for eid in elective_ids if eid not in found]
+
+    async def not_offered_to(
+        self, user_id: UUID, elective_ids: List[UUID]
+    ) -> List[UUID]:
+        if not elective_ids:
+            return []
+        offered = set(
+            await self.session.scalars(
+                select(elective_courses.c.elective_id)
+                .join(UserModel, UserModel.course_id == elective_courses.c.course_id)
+                .where(
+                    UserModel.id == user_id,
+                    elective_courses.c.elective_id == any_(elective_ids),
+                )
+            )
+        )
+        return [eid for eid in elective_ids if eid not in offered]
+
+    async def update(self, elective: Elective) -> None:
+        row = await self.session.get(ElectiveModel, elective.id)
         if row is None:
+            raise ElectiveNotFoundError(f"Elective '{elective.id}' not found")
+
+        row.code = elective.code  # type: ignore[assignment]
+        row.title = elective.title  # type: ignore[assignment]
+        row.description = elective.description  # type: ignore[assignment]
+        row.instructor = elective.instructor  # type: ignore[assignment]
+        row.category = elective.category  # type: ignore[assignment]
+        row.updated_at = elective.updated_at  # type: ignore[assignment]
+
+    async def delete(self, elective_id: UUID) -> bool:
+        result = await self.session.execute(
+            delete(ElectiveModel).where(ElectiveModel.id == elective_id)
+        )
+        return bool(result.rowcount)  # type: ignore[attr-defined]
+
+    async def delete_all(self) -> int:
+        result = await self.session.execute(delete(ElectiveModel))
+        return cast(int, result.rowcount)  # type: ignore[attr-defined]
+
+    async def set_courses(self, elective_id: UUID, course_ids: List[UUID]) -> None:
+        """
+        Replace all linked courses for the given elective.
+
+        Works on the association table directly: with an AsyncSession the
+        `ElectiveModel.courses` collection cannot be lazy-loaded.
+        """
+        await self.session.flush()
+
+        touched = await self.session.execute(_touch(elective_id))
+        if not touched.rowcount:  # type: ignore[attr-defined]
             raise ElectiveNotFoundError(f"Elective '{elective_id}' not found")
+        for stmt in _link_courses({elective_id: course_ids}):
+            await self.session.execute(stmt)
 
-        row.courses = [
-            self.session.get(CourseModel, cid)  # type: ignore[arg-type]
-            for cid in course_ids
-            if cid is not None
+    async def upsert_many(
+        self, electives: List[Elective]
+    ) -> List[Tuple[Elective, bool]]:
+        if not electives:
+            return []
+        stmt = pg_insert(ElectiveModel).from_select(
+            list(_UPSERT_COLUMNS),
+            _unnest(
+                [
+                    (
+                        ElectiveModel.__table__.c[name],
+                        [getattr(e, name) for e in electives],
+                    )
+                    for name in _UPSERT_COLUMNS
+                ]
+            ),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ElectiveModel.code],
+            set_={
+                name: stmt.excluded[name]
+                for name in ("title", "description", "instructor", "category")
+            }
+            | {"updated_at": stmt.excluded.updated_at},
+        ).returning(
+            *(getattr(ElectiveModel, name) for name in _UPSERT_COLUMNS),
+            # a row written by this statement's INSERT has no xmax yet
+            literal_column("xmax = 0", Boolean).label("inserted"),
+        )
+        return [
+            (Elective(**row._mapping), row.inserted)
+            for row in await self.session.execute(stmt)
         ]
-        row.updated_at = datetime.now(timezone.utc)  # type: ignore[assignment]
+
+    async def replace_courses(self, course_ids: Mapping[UUID, List[UUID]]) -> None:
+        if not course_ids:
+            return
+        for stmt in _link_courses(course_ids):
+            await self.session.execute(stmt)
@@ -0,0 +1,27 @@
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import Select, select, tuple_
+
+
+def keyset_page(
+    model: Any,
+    fields: Sequence[str],
+    keys: Sequence[str],
+    *,
+    after: Optional[Sequence[Any]],
+    limit: int,
+) -> Select:
+    """
+    `fields` and `keys` of the `limit` rows of `model` whose `keys` come
+    right after `after`.  The row-value comparison lets Postgres start
+    from there on an index over `keys` rather than skipping an OFFSET.
+    """
+    key_columns = [getattr(model, k) for k in keys]
+    stmt = (
+        select(*(getattr(model, f) for f in dict.fromkeys([*keys, *fields])))
+        .order_by(*key_columns)
+        .limit(limit)
+    )
+    if after is not None:
+        stmt = stmt.where(tuple_(*key_columns) > tuple_(*after))
+    return stmt
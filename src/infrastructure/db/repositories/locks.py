@@ -0,0 +1,19 @@
+"""
+Transaction-scoped advisory locks, for writers that should give up at
+once instead of queueing behind each other's row locks.
+"""
+
+from uuid import UUID
+
+from sqlalchemy import Select, func, literal, select
+
+
+def try_lock(scope: str, key: UUID) -> Select:
+    """
+    Selects whether `pg_try_advisory_xact_lock` got the lock on `key`
+    within `scope`; it is held until the transaction ends.  The lock id
+    is a 64-bit hash of both, so two keys may collide and then merely
+    lock each other out.
+    """
+    lock_id = func.hashtextextended(literal(f"{scope}:{key}"), 0)
+    return select(func.pg_try_advisory_xact_lock(lock_id))
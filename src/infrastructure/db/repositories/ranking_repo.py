@@ -0,0 +1,325 @@
+"""
+The choice repositories over `user_rankings`: every student's choices in
+one row, as an array of elective ids in priority order.  Replacing or
+compacting a ranking is a single-row write, and no constraint has to be
+checked per choice.  The `Choice`s the interface deals in are unpacked
+from the arrays; their ids come from `choice_id`.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import (
+    Select,
+    Subquery,
+    Text,
+    cast,
+    column,
+    func,
+    literal,
+    select,
+    true,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.domain.entities.choice import Choice, choice_id
+from src.domain.repositories import (
+    AbstractAsyncChoiceRepository,
+    AbstractChoiceRepository,
+)
+from src.infrastructure.db.models import ElectiveModel, UserModel, UserRankingModel
+from src.infrastructure.db.repositories.keyset import keyset_page
+from src.infrastructure.db.repositories.locks import try_lock
+from src.infrastructure.db.repositories.rows import entity_builder
+
+_R = UserRankingModel.__table__.c
+_UUIDS = ARRAY(PG_UUID(as_uuid=True))
+
+_NAMES = ("id", "user_id", "elective_id", "priority", "created_at", "updated_at")
+_to_entity = entity_builder(Choice, _NAMES)
+
+# a ranking row, as `_unpack` takes it
+_RANKING = select(_R.user_id, _R.elective_ids, _R.replaced_at, _R.updated_at)
+
+
+def _unpack(rows: Iterable[Any]) -> List[Choice]:
+    return [
+        _to_entity((choice_id(user_id, e), user_id, e, p, replaced_at, updated_at))
+        for user_id, elective_ids, replaced_at, updated_at in rows
+        for p, e in enumerate(elective_ids, start=1)
+    ]
+
+
+def _choice_id(user_id, elective_id):
+    """
+    `choice_id` in SQL: a version 3 UUID, the md5 of the user id's bytes
+    followed by the elective id's text, with the version and variant bits
+    set.
+    """
+    digest = func.decode(
+        func.md5(
+            func.uuid_send(user_id).op("||")(
+                func.convert_to(cast(elective_id, Text), "UTF8")
+            )
+        ),
+        "hex",
+    )
+    versioned = func.set_byte(
+        func.set_byte(digest, 6, func.get_byte(digest, 6).op("&")(15).op("|")(48)),
+        8,
+        func.get_byte(digest, 8).op("&")(63).op("|")(128),
+    )
+    return cast(func.encode(versioned, "hex"), PG_UUID(as_uuid=True))
+
+
+def exploded_rankings() -> Subquery:
+    """
+    The rankings as `choices` rows, one per array element.  Nothing here
+    is indexed; only the admin page, the lookups by choice id and
+    switching `CHOICE_STORAGE` use it.
+    """
+    e = (
+        func.unnest(_R.elective_ids)
+        .table_valued(
+            column("elective_id", PG_UUID(as_uuid=True)), with_ordinality="priority"
+        )
+        .render_derived(name="e")
+    )
+    return (
+        select(
+            _choice_id(_R.user_id, e.c.elective_id).label("id"),
+            _R.user_id,
+            e.c.elective_id,
+            e.c.priority,
+            _R.replaced_at.label("created_at"),
+            _R.updated_at,
+        )
+        .select_from(UserRankingModel.__table__.join(e, true()))
+        .subquery("choices")
+    )
+
+
+def _ranking_by_elective(elective_id: UUID) -> Select:
+    # served by the GIN index on elective_ids
+    return _RANKING.where(_R.elective_ids.contains([elective_id]))
+
+
+def _picked(rows: Iterable[Any], elective_id: UUID) -> List[Choice]:
+    """The choices of `elective_id` in the rows of `_ranking_by_elective`."""
+    return [
+        _to_entity(
+            (
+                choice_id(user_id, elective_id),
+                user_id,
+                elective_id,
+                elective_ids.index(elective_id) + 1,
+                replaced_at,
+                updated_at,
+            )
+        )
+        for user_id, elective_ids, replaced_at, updated_at in rows
+    ]
+
+
+def _upsert(user_id: UUID, elective_ids: List[UUID], existing: Any = None):
+    """
+    Write `user_id`'s ranking and bump its version.  A new ranking holds
+    `elective_ids`; an existing one becomes `existing`, an SQL expression
+    over its current array, or is replaced by `elective_ids` as a whole.
+    """
+    now = datetime.now(timezone.utc)
+    stmt = pg_insert(UserRankingModel).values(
+        user_id=user_id,
+        elective_ids=literal(elective_ids, _UUIDS),
+        version=1,
+        replaced_at=now,
+        updated_at=now,
+    )
+    changes: Dict[str, Any] = {
+        "version": UserRankingModel.version + 1,
+        "updated_at": now,
+    }
+    if existing is None:
+        changes |= {"elective_ids": stmt.excluded.elective_ids, "replaced_at": now}
+    else:
+        changes["elective_ids"] = existing
+    return stmt.on_conflict_do_update(
+        index_elements=[UserRankingModel.user_id], set_=changes
+    )
+
+
+def _place(choice: Choice):
+    """Put `choice.elective_id` at `choice.priority`, wherever it was."""
+    ids = func.array_remove(_R.elective_ids, choice.elective_id, type_=_UUIDS)
+    placed = (
+        ids[1 : choice.priority - 1]
+        .op("||")(literal([choice.elective_id], _UUIDS))
+        .op("||")(ids[choice.priority : func.cardinality(ids)])
+    )
+    return _upsert(choice.user_id, [choice.elective_id], placed)
+
+
+def _remove_and_compact(user_id: UUID, priority: int):
+    ids = _R.elective_ids
+    return (
+        update(UserRankingModel)
+        .where(_R.user_id == user_id, func.cardinality(ids) >= priority)
+        .values(
+            elective_ids=ids[1 : priority - 1].op("||")(
+                ids[priority + 1 : func.cardinality(ids)]
+            ),
+            version=UserRankingModel.version + 1,
+            updated_at=datetime.now(timezone.utc),
+        )
+        .returning(_R.user_id, _R.elective_ids, _R.replaced_at, _R.updated_at)
+    )
+
+
+def _delete(choice_id_: UUID):
+    x = exploded_rankings()
+    found = select(x.c.user_id, x.c.elective_id).where(x.c.id == choice_id_).subquery()
+    return (
+        update(UserRankingModel)
+        .where(_R.user_id == found.c.user_id)
+        .values(
+            elective_ids=func.array_remove(_R.elective_ids, found.c.elective_id),
+            version=UserRankingModel.version + 1,
+            updated_at=datetime.now(timezone.utc),
+        )
+    )
+
+
+def _by_id(choice_id_: UUID) -> Select:
+    x = exploded_rankings()
+    return select(*(x.c[name] for name in _NAMES)).where(x.c.id == choice_id_)
+
+
+def _export() -> Select:
+    x = exploded_rankings()
+    return (
+        select(
+            x.c.user_id,
+            UserModel.email,
+            x.c.elective_id,
+            ElectiveModel.code.label("elective_code"),
+            x.c.priority,
+            x.c.created_at,
+        )
+        .join(UserModel, UserModel.id == x.c.user_id)
+        .join(ElectiveModel, ElectiveModel.id == x.c.elective_id)
+    )
+
+
+class SqlAlchemyRankingChoiceRepo(AbstractChoiceRepository):
+    def __init__(self, session: Session):
+        self.session = session
+
+    def add(self, choice: Choice) -> None:
+        self.session.execute(_place(choice))
+
+    def update(self, choice: Choice) -> None:
+        self.session.execute(_place(choice))
+
+    def get(self, choice_id: UUID) -> Optional[Choice]:
+        row = self.session.execute(_by_id(choice_id)).one_or_none()
+        return _to_entity(row) if row else None
+
+    def list(self) -> List[Choice]:
+        return _unpack(self.session.execute(_RANKING))
+
+    def list_by_user(self, user_id: UUID) -> List[Choice]:
+        return _unpack(self.session.execute(_RANKING.where(_R.user_id == user_id)))
+
+    def list_by_elective(self, elective_id: UUID) -> List[Choice]:
+        rows = self.session.execute(_ranking_by_elective(elective_id))
+        return _picked(rows, elective_id)
+
+    def replace_for_user(self, user_id: UUID, choices: List[Choice]) -> None:
+        ranked = sorted(choices, key=lambda c: c.priority)
+        self.session.execute(_upsert(user_id, [c.elective_id for c in ranked]))
+
+    def remove_and_compact(
+        self, user_id: UUID, priority: int
+    ) -> Optional[List[Choice]]:
+        rows = self.session.execute(_remove_and_compact(user_id, priority)).all()
+        return _unpack(rows) if rows else None
+
+    def delete(self, choice_id: UUID) -> None:
+        self.session.execute(_delete(choice_id))
+
+
+class SqlAlchemyAsyncRankingChoiceRepo(AbstractAsyncChoiceRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add(self, choice: Choice) -> None:
+        await self.session.execute(_place(choice))
+
+    async def update(self, choice: Choice) -> None:
+        await self.session.execute(_place(choice))
+
+    async def get(self, choice_id: UUID) -> Optional[Choice]:
+        row = (await self.session.execute(_by_id(choice_id))).one_or_none()
+        return _to_entity(row) if row else None
+
+    async def list(self) -> List[Choice]:
+        return _unpack(await self.session.execute(_RANKING))
+
+    async def page(
+        self,
+        fields: Sequence[str],
+        *,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        # ids are computed, so every page sorts all choices: admin use only
+        stmt = keyset_page(
+            exploded_rankings().c,
+            fields,
+            ("created_at", "id"),
+            after=after,
+            limit=limit,
+        )
+        return [dict(row._mapping) for row in await self.session.execute(stmt)]
+
+    async def export(self, *, batch_size: int = 1000) -> AsyncIterator[Dict[str, Any]]:
+        stmt = _export().execution_options(yield_per=batch_size)
+        async for row in await self.session.stream(stmt):
+            yield dict(row._mapping)
+
+    async def list_by_user(self, user_id: UUID) -> List[Choice]:
+        return _unpack(
+            await self.session.execute(_RANKING.where(_R.user_id == user_id))
+        )
+
+    async def list_by_elective(self, elective_id: UUID) -> List[Choice]:
+        rows = await self.session.execute(_ranking_by_elective(elective_id))
+        return _picked(rows, elective_id)
+
+    async def replace_for_user(self, user_id: UUID, choices: List[Choice]) -> None:
+        ranked = sorted(choices, key=lambda c: c.priority)
+        await self.session.execute(_upsert(user_id, [c.elective_id for c in ranked]))
+
+    async def remove_and_compact(
+        self, user_id: UUID, priority: int
+    ) -> Optional[List[Choice]]:
+        result = await self.session.execute(_remove_and_compact(user_id, priority))
+        rows = result.all()
+        return _unpack(rows) if rows else None
+
+    async def delete(self, choice_id: UUID) -> None:
+        await self.session.execute(_delete(choice_id))
+
+    async def version(self, user_id: UUID) -> int:
+        found = await self.session.scalar(
+            select(_R.version).where(_R.user_id == user_id)
+        )
+        return found or 0
+
+    async def try_lock(self, user_id: UUID) -> bool:
+        # the same lock as the `choices` rows take, whichever storage is on
+        return await self.session.scalar(try_lock("choices", user_id))
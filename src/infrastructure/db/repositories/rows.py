@@ -0,0 +1,53 @@
+"""
+Entities built straight from the rows of our own tables, without running
+pydantic validation over values Postgres has already typed and checked.
+"""
+
+from operator import itemgetter
+from typing import Any, Callable, Sequence, Type, TypeVar
+
+from pydantic import BaseModel
+
+M = TypeVar("M", bound=BaseModel)
+
+_new = object.__new__
+_set = object.__setattr__
+
+
+def entity_builder(entity: Type[M], names: Sequence[str]) -> Callable[[Any], M]:
+    """
+    A function turning a row whose values are the fields `names`, in that
+    order, into an `entity`.  It does what `model_construct` does, but
+    works out the field set once instead of walking the fields for every
+    row: on both the locked pydantic (2.11) and 2.14, `model_construct`
+    is slower than validating, and this is faster than either
+    (`python -m benchmarks.builders`).  It fills in pydantic's instance
+    attributes by hand, so `tests/infrastructure/test_rows.py` checks the
+    result against a validated entity; rerun both after upgrading pydantic.
+
+    Only for rows the repositories select themselves: nothing is coerced
+    or checked, so `names` must list every field of `entity`, though not
+    necessarily in order.
+    """
+    names = tuple(names)
+    missing = set(entity.model_fields) - set(names)
+    extra = set(names) - set(entity.model_fields)
+    if missing or extra:
+        raise ValueError(
+            f"{entity.__name__} rows need exactly its fields;"
+            f" missing {sorted(missing)}, unknown {sorted(extra)}"
+        )
+    fields = tuple(entity.model_fields)
+    fields_set = set(fields)
+    # `__dict__` in field order, as validation leaves it: dumps follow it
+    values = None if names == fields else itemgetter(*(names.index(f) for f in fields))
+
+    def build(row: Any) -> M:
+        obj = _new(entity)
+        _set(obj, "__dict__", dict(zip(fields, values(row) if values else row)))
+        _set(obj, "__pydantic_fields_set__", fields_set.copy())
+        _set(obj, "__pydantic_extra__", None)
+        _set(obj, "__pydantic_private__", None)
+        return obj
+
+    return build
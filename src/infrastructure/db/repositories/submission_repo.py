@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.entities.choice import ChoiceSubmission
+from src.domain.repositories import AbstractAsyncChoiceSubmissionRepository
+from src.infrastructure.db.models import ChoiceSubmissionModel
+from src.infrastructure.db.repositories.rows import entity_builder
+
+_NAMES = ("user_id", "key", "elective_ids", "version", "created_at")
+_COLUMNS = tuple(getattr(ChoiceSubmissionModel.__table__.c, name) for name in _NAMES)
+_to_entity = entity_builder(ChoiceSubmission, _NAMES)
+
+
+class SqlAlchemyAsyncChoiceSubmissionRepo(AbstractAsyncChoiceSubmissionRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get(self, user_id: UUID, key: str) -> Optional[ChoiceSubmission]:
+        row = (
+            await self.session.execute(
+                select(*_COLUMNS).where(
+                    ChoiceSubmissionModel.user_id == user_id,
+                    ChoiceSubmissionModel.key == key,
+                )
+            )
+        ).one_or_none()
+        return _to_entity(row) if row else None
+
+    async def put(self, submission: ChoiceSubmission) -> None:
+        stmt = pg_insert(ChoiceSubmissionModel).values(**submission.model_dump())
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[
+                    ChoiceSubmissionModel.user_id,
+                    ChoiceSubmissionModel.key,
+                ],
+                set_={
+                    "elective_ids": stmt.excluded.elective_ids,
+                    "version": stmt.excluded.version,
+                    "created_at": stmt.excluded.created_at,
+                },
+            )
+        )
+
+    async def prune(self, user_id: UUID, before: datetime) -> None:
+        await self.session.execute(
+            delete(ChoiceSubmissionModel).where(
+                ChoiceSubmissionModel.user_id == user_id,
+                ChoiceSubmissionModel.created_at < before,
+            )
+        )
@@ -1,11 +1,32 @@
-from typing import Optional, List, cast
+from typing import Any, Dict, Optional, List, Sequence, Tuple
 from uuid import UUID
 from datetime import datetime, timezone
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.domain.repositories.abstract_user_repository import AbstractUserRepository
+from src.domain.repositories.abstract_user_repository import (
+    AbstractAsyncUserRepository,
+    AbstractUserRepository,
+)
 from src.domain.entities.user import User
 from src.infrastructure.db.models import UserModel
+from src.infrastructure.db.repositories.keyset import keyset_page
+from src.infrastructure.db.repositories.rows import entity_builder
+
+_NAMES = (
+    "id",
+    "sso_id",
+    "name",
+    "email",
+    "role",
+    "course_id",
+    "first_choice_at",
+    "created_at",
+    "updated_at",
+)
+_COLUMNS = tuple(getattr(UserModel.__table__.c, name) for name in _NAMES)
+_to_entity = entity_builder(User, _NAMES)
 
 
 class SqlAlchemyUserRepo(AbstractUserRepository):
@@ -19,70 +40,84 @@ class SqlAlchemyUserRepo(AbstractUserRepository):
             name=user.name,
             email=user.email,
             role=user.role,
+            course_id=user.course_id,
+            first_choice_at=user.first_choice_at,
             created_at=user.created_at,
             updated_at=user.updated_at,
         )
         self.session.add(model)
 
+    def _one_by(self, **criteria) -> Optional[User]:
+        row = self.session.execute(
+            select(*_COLUMNS).filter_by(**criteria)
+        ).one_or_none()
+        return _to_entity(row) if row else None
+
     def get(self, user_id: UUID) -> Optional[User]:
-        m = self.session.query(UserModel).filter_by(id=user_id).one_or_none()
-        if not m:
-            return None
-        return User(
-            id=cast(UUID, m.id),
-            sso_id=cast(str, m.sso_id),
-            name=cast(str, m.name),
-            email=cast(str, m.email),
-            role=cast(str, m.role),
-            created_at=cast(datetime, m.created_at),
-            updated_at=cast(datetime, m.updated_at),
-        )
+        return self._one_by(id=user_id)
 
     def get_by_sso_id(self, sso_id: str) -> Optional[User]:
-        m = self.session.query(UserModel).filter_by(sso_id=sso_id).one_or_none()
-        if not m:
-            return None
-        return User(
-            id=cast(UUID, m.id),
-            sso_id=cast(str, m.sso_id),
-            name=cast(str, m.name),
-            email=cast(str, m.email),
-            role=cast(str, m.role),
-            created_at=cast(datetime, m.created_at),
-            updated_at=cast(datetime, m.updated_at),
-        )
+        return self._one_by(sso_id=sso_id)
 
     def get_by_email(self, email: str) -> Optional[User]:
-        m = self.session.query(UserModel).filter_by(email=email).one_or_none()
-        if not m:
-            return None
-        return User(
-            id=cast(UUID, m.id),
-            sso_id=cast(str, m.sso_id),
-            name=cast(str, m.name),
-            email=cast(str, m.email),
-            role=cast(str, m.role),
-            created_at=cast(datetime, m.created_at),
-            updated_at=cast(datetime, m.updated_at),
-        )
+        return self._one_by(email=email)
 
     def list(self) -> List[User]:
-        models = self.session.query(UserModel).all()
-        return [
-            User(
-                id=cast(UUID, m.id),
-                sso_id=cast(str, m.sso_id),
-                name=cast(str, m.name),
-                email=cast(str, m.email),
-                role=cast(str, m.role),
-                created_at=cast(datetime, m.created_at),
-                updated_at=cast(datetime, m.updated_at),
-            )
-            for m in models
-        ]
+        return [_to_entity(r) for r in self.session.execute(select(*_COLUMNS))]
 
     def update(self, user: User) -> None:
         m = self.session.query(UserModel).filter_by(id=user.id).one()
-        for attr in ("name", "email", "role"):
+        for attr in ("name", "email", "role", "course_id"):
             setattr(m, attr, getattr(user, attr))
         m.updated_at = datetime.now(timezone.utc)  # type: ignore
+
+
+class SqlAlchemyAsyncUserRepo(AbstractAsyncUserRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def _one_by(self, **criteria) -> Optional[User]:
+        result = await self.session.execute(select(*_COLUMNS).filter_by(**criteria))
+        row = result.one_or_none()
+        return _to_entity(row) if row else None
+
+    async def add(self, user: User) -> None:
+        self.session.add(UserModel(**user.model_dump()))
+
+    async def get(self, user_id: UUID) -> Optional[User]:
+        return await self._one_by(id=user_id)
+
+    async def get_by_sso_id(self, sso_id: str) -> Optional[User]:
+        return await self._one_by(sso_id=sso_id)
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return await self._one_by(email=email)
+
+    async def list(self) -> List[User]:
+        return [_to_entity(r) for r in await self.session.execute(select(*_COLUMNS))]
+
+    async def page(
+        self,
+        fields: Sequence[str],
+        *,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        stmt = keyset_page(
+            UserModel, fields, ("created_at", "id"), after=after, limit=limit
+        )
+        return [dict(row._mapping) for row in await self.session.execute(stmt)]
+
+    async def update(self, user: User) -> None:
+        m = await self.session.get_one(UserModel, user.id)
+        for attr in ("name", "email", "role", "course_id"):
+            setattr(m, attr, getattr(user, attr))
+        m.updated_at = datetime.now(timezone.utc)  # type: ignore
+
+    async def mark_first_choice(self, user_id: UUID, at: datetime) -> bool:
+        result = await self.session.execute(
+            update(UserModel)
+            .where(UserModel.id == user_id, UserModel.first_choice_at.is_(None))
+            .values(first_choice_at=at)
+        )
+        return result.rowcount > 0
@@ -1,8 +1,10 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 
 from src.config import settings
+from src.infrastructure.db.instrumentation import instrument
 
 engine = create_engine(
     settings.DATABASE_URL,
@@ -10,6 +12,8 @@ engine = create_engine(
     pool_pre_ping=True,
 )
 
+instrument(engine, "sync")
+
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
@@ -32,3 +36,24 @@ def get_db_session():
         yield db
     finally:
         db.close()
+
+
+# Same database through psycopg 3's native asyncio driver, for the API.
+async_engine = create_async_engine(
+    make_url(settings.DATABASE_URL).set(drivername="postgresql+psycopg"),
+    echo=settings.SQL_ECHO,
+    pool_pre_ping=True,
+)
+
+instrument(async_engine.sync_engine, "async")
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+def create_async_session() -> AsyncSession:
+    """Factory for a new AsyncSession (used by the async UoW)."""
+    return AsyncSessionLocal()
@@ -1,14 +1,34 @@
 from typing import Optional, Type, Any
-from src.domain.unit_of_work import AbstractUnitOfWork
-from src.infrastructure.db.session import create_session
+
+from sqlalchemy import func, select
+
+from src.config import settings
+from src.domain.unit_of_work import AbstractAsyncUnitOfWork, AbstractUnitOfWork
+from src.infrastructure.db.invalidation import CHANNEL, invalidation_bus
+from src.infrastructure.db.session import create_async_session, create_session
 
 from src.infrastructure.db.repositories import (
     SqlAlchemyUserRepo,
     SqlAlchemyElectiveRepo,
     SqlAlchemyChoiceRepo,
+    SqlAlchemyRankingChoiceRepo,
     SqlAlchemyCourseRepo,
+    SqlAlchemyAllocationRepo,
+    SqlAlchemyAsyncUserRepo,
+    SqlAlchemyAsyncElectiveRepo,
+    SqlAlchemyAsyncChoiceRepo,
+    SqlAlchemyAsyncRankingChoiceRepo,
+    SqlAlchemyAsyncChoiceSubmissionRepo,
+    SqlAlchemyAsyncCourseRepo,
 )
 
+# settings.CHOICE_STORAGE -> its sync and async choice repositories
+_CHOICE_REPOS = {
+    "rows": (SqlAlchemyChoiceRepo, SqlAlchemyAsyncChoiceRepo),
+    "rankings": (SqlAlchemyRankingChoiceRepo, SqlAlchemyAsyncRankingChoiceRepo),
+}
+_ChoiceRepo, _AsyncChoiceRepo = _CHOICE_REPOS[settings.CHOICE_STORAGE]
+
 
 class UnitOfWork(AbstractUnitOfWork):
     """
@@ -20,8 +40,9 @@ class UnitOfWork(AbstractUnitOfWork):
         self.session = create_session()
         self.users = SqlAlchemyUserRepo(self.session)
         self.electives = SqlAlchemyElectiveRepo(self.session)
-        self.choices = SqlAlchemyChoiceRepo(self.session)
+        self.choices = _ChoiceRepo(self.session)
         self.courses = SqlAlchemyCourseRepo(self.session)
+        self.allocations = SqlAlchemyAllocationRepo(self.session)
         return self
 
     def _commit(self) -> None:
@@ -38,3 +59,48 @@ class UnitOfWork(AbstractUnitOfWork):
     ) -> None:
         super().__exit__(exc_type, exc_val, exc_tb)
         self.session.close()
+
+
+class AsyncUnitOfWork(AbstractAsyncUnitOfWork):
+    """
+    `UnitOfWork` on an AsyncSession: DB round-trips are awaited instead of
+    blocking the event loop.  The session lives from the outermost enter
+    to the outermost exit.
+
+    Published invalidations go out as NOTIFY in the same transaction, so
+    other workers hear of them exactly when the change commits; this
+    worker dispatches its own right after the commit.
+    """
+
+    async def _begin(self) -> None:
+        self.session = create_async_session()
+        self.users = SqlAlchemyAsyncUserRepo(self.session)
+        self.electives = SqlAlchemyAsyncElectiveRepo(self.session)
+        self.choices = _AsyncChoiceRepo(self.session)
+        self.courses = SqlAlchemyAsyncCourseRepo(self.session)
+        self.submissions = SqlAlchemyAsyncChoiceSubmissionRepo(self.session)
+
+    async def _end(self) -> None:
+        await self.session.close()
+
+    async def _flush(self) -> None:
+        await self.session.flush()
+
+    def publish(self, topic: str, key: str = "") -> None:
+        super().publish(topic, key)
+        self.on_commit(lambda: invalidation_bus.dispatch(topic, key or None))
+
+    async def _commit(self) -> None:
+        if self._published:
+            await self.session.execute(
+                select(
+                    *(
+                        func.pg_notify(CHANNEL, invalidation_bus.payload(topic, key))
+                        for topic, key in dict.fromkeys(self._published)
+                    )
+                )
+            )
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
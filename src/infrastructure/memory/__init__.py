@@ -0,0 +1,4 @@
+from .store import MemoryStore
+from .uow import InMemoryAsyncUnitOfWork, InMemoryUnitOfWork
+
+__all__ = ["MemoryStore", "InMemoryUnitOfWork", "InMemoryAsyncUnitOfWork"]
@@ -0,0 +1,656 @@
+"""
+Repository implementations over a `MemoryStore`.
+
+They behave like the SQLAlchemy ones, down to the orderings and to what
+is cascaded, but a missing row or a clashing unique value raises
+KeyError/ValueError where Postgres would raise an IntegrityError.  Rows go
+in and come out as copies, so an entity changed by a caller does not
+change the store behind its back.
+"""
+
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from uuid import UUID
+
+from src.domain.entities import (
+    Allocation,
+    AllocationRun,
+    Choice,
+    ChoiceSubmission,
+    Course,
+    Elective,
+    User,
+)
+from src.domain.exceptions import ElectiveNotFoundError
+from src.domain.repositories import (
+    AbstractAllocationRepository,
+    AbstractAsyncChoiceRepository,
+    AbstractAsyncChoiceSubmissionRepository,
+    AbstractAsyncCourseRepository,
+    AbstractAsyncElectiveRepository,
+    AbstractAsyncUserRepository,
+    AbstractChoiceRepository,
+    AbstractCourseRepository,
+    AbstractElectiveRepository,
+    AbstractUserRepository,
+)
+from src.infrastructure.memory.store import MemoryStore, Table
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _insert(table: Table, key: Hashable, row: Any) -> None:
+    if table.get(key) is not None:
+        raise ValueError(f"duplicate key {key}")
+    table.put(key, row)
+
+
+def _existing(table: Table, key: Hashable) -> Any:
+    row = table.get(key)
+    if row is None:
+        raise KeyError(key)
+    return row
+
+
+def _elective(e: Elective) -> Elective:
+    return e.model_copy(update={"course_ids": list(e.course_ids)})
+
+
+def _page(
+    rows: Iterable[Any],
+    fields: Sequence[str],
+    keys: Sequence[str],
+    *,
+    after: Optional[Sequence[Any]],
+    limit: int,
+) -> List[Dict[str, Any]]:
+    """`keyset_page` over plain rows."""
+    key = lambda row: tuple(getattr(row, k) for k in keys)  # noqa: E731
+    if after is not None:
+        rows = (r for r in rows if key(r) > tuple(after))
+    columns = list(dict.fromkeys([*keys, *fields]))
+    return [{c: getattr(r, c) for c in columns} for r in sorted(rows, key=key)[:limit]]
+
+
+class InMemoryUserRepo(AbstractUserRepository):
+    def __init__(self, store: MemoryStore) -> None:
+        self.table = store.users
+
+    def add(self, user: User) -> None:
+        _insert(self.table, user.id, user.model_copy())
+
+    def get(self, user_id: UUID) -> Optional[User]:
+        user = self.table.get(user_id)
+        return user.model_copy() if user else None
+
+    def get_by_sso_id(self, sso_id: str) -> Optional[User]:
+        user = self.table.get_by("sso_id", sso_id)
+        return user.model_copy() if user else None
+
+    def get_by_email(self, email: str) -> Optional[User]:
+        user = self.table.get_by("email", email)
+        return user.model_copy() if user else None
+
+    def list(self) -> List[User]:
+        return [u.model_copy() for u in self.table.rows.values()]
+
+    def page(
+        self,
+        fields: Sequence[str],
+        *,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        return _page(
+            self.table.rows.values(),
+            fields,
+            ("created_at", "id"),
+            after=after,
+            limit=limit,
+        )
+
+    def update(self, user: User) -> None:
+        current = _existing(self.table, user.id)
+        self.table.put(
+            user.id,
+            current.model_copy(
+                update={
+                    "name": user.name,
+                    "email": user.email,
+                    "role": user.role,
+                    "course_id": user.course_id,
+                    "updated_at": _now(),
+                }
+            ),
+        )
+
+    def mark_first_choice(self, user_id: UUID, at: datetime) -> bool:
+        current = _existing(self.table, user_id)
+        if current.first_choice_at is not None:
+            return False
+        self.table.put(user_id, current.model_copy(update={"first_choice_at": at}))
+        return True
+
+
+class InMemoryElectiveRepo(AbstractElectiveRepository):
+    def __init__(self, store: MemoryStore) -> None:
+        self.store = store
+        self.table = store.electives
+
+    def add(self, elective: Elective) -> None:
+        # courses are linked by `set_courses`, as with the SQL repositories
+        _insert(self.table, elective.id, elective.model_copy(update={"course_ids": []}))
+
+    def get(self, elective_id: UUID) -> Optional[Elective]:
+        e = self.table.get(elective_id)
+        return _elective(e) if e else None
+
+    def get_by_code(self, code: str) -> Optional[Elective]:
+        e = self.table.get_by("code", code)
+        return _elective(e) if e else None
+
+    def list(self) -> List[Elective]:
+        return [
+            _elective(e) for e in sorted(self.table.rows.values(), key=lambda e: e.code)
+        ]
+
+    def page(
+        self, fields: Sequence[str], *, after: Optional[str] = None, limit: int
+    ) -> List[Dict[str, Any]]:
+        rows = _page(
+            self.table.rows.values(),
+            fields,
+            ("code",),
+            after=None if after is None else (after,),
+            limit=limit,
+        )
+        for row in rows:
+            if "course_ids" in row:
+                row["course_ids"] = list(row["course_ids"])
+        return rows
+
+    def missing_ids(self, elective_ids: List[UUID]) -> List[UUID]:
+        return [eid for eid in elective_ids if self.table.get(eid) is None]
+
+    def not_offered_to(self, user_id: UUID, elective_ids: List[UUID]) -> List[UUID]:
+        user = self.store.users.get(user_id)
+        course_id = user.course_id if user else None
+        return [
+            eid
+            for eid in elective_ids
+            if course_id is None
+            or (e := self.table.get(eid)) is None
+            or course_id not in e.course_ids
+        ]
+
+    def update(self, elective: Elective) -> None:
+        current = self.table.get(elective.id)
+        if current is None:
+            raise ElectiveNotFoundError(f"Elective '{elective.id}' not found")
+        self.table.put(
+            elective.id,
+            current.model_copy(
+                update={
+                    name: getattr(elective, name)
+                    for name in (
+                        "code",
+                        "title",
+                        "description",
+                        "instructor",
+                        "category",
+                        "updated_at",
+                    )
+                }
+            ),
+        )
+
+    def delete(self, elective_id: UUID) -> bool:
+        if self.table.remove(elective_id) is None:
+            return False
+        for choice_id in list(self.store.choices.keys_by("elective_id", elective_id)):
+            self.store.choices.remove(choice_id)
+        return True
+
+    def delete_all(self) -> int:
+        ids = list(self.table.rows)
+        for elective_id in ids:
+            self.delete(elective_id)
+        return len(ids)
+
+    def set_courses(self, elective_id: UUID, course_ids: List[UUID]) -> None:
+        current = self.table.get(elective_id)
+        if current is None:
+            raise ElectiveNotFoundError(f"Elective '{elective_id}' not found")
+        self.table.put(
+            elective_id,
+            current.model_copy(
+                update={
+                    "course_ids": list(dict.fromkeys(course_ids)),
+                    "updated_at": _now(),
+                }
+            ),
+        )
+
+    def upsert_many(self, electives: List[Elective]) -> List[Tuple[Elective, bool]]:
+        stored = []
+        for e in electives:
+            current = self.table.get_by("code", e.code)
+            if current is None:
+                row = e.model_copy(update={"course_ids": []})
+            else:
+                row = current.model_copy(
+                    update={
+                        name: getattr(e, name)
+                        for name in (
+                            "title",
+                            "description",
+                            "instructor",
+                            "category",
+                            "updated_at",
+                        )
+                    }
+                )
+            self.table.put(row.id, row)
+            stored.append((row.model_copy(update={"course_ids": []}), current is None))
+        return stored
+
+    def replace_courses(self, course_ids: Mapping[UUID, List[UUID]]) -> None:
+        for elective_id, ids in course_ids.items():
+            current = _existing(self.table, elective_id)
+            self.table.put(
+                elective_id,
+                current.model_copy(update={"course_ids": list(dict.fromkeys(ids))}),
+            )
+
+
+class InMemoryChoiceRepo(AbstractChoiceRepository):
+    def __init__(self, store: MemoryStore) -> None:
+        self.store = store
+        self.table = store.choices
+
+    def _by(self, column: str, value: UUID) -> List[Choice]:
+        return [self.table.rows[k] for k in self.table.keys_by(column, value)]
+
+    def add(self, choice: Choice) -> None:
+        _insert(self.table, choice.id, choice.model_copy())
+
+    def update(self, choice: Choice) -> None:
+        current = _existing(self.table, choice.id)
+        self.table.put(
+            choice.id,
+            current.model_copy(
+                update={"priority": choice.priority, "updated_at": _now()}
+            ),
+        )
+
+    def get(self, choice_id: UUID) -> Optional[Choice]:
+        choice = self.table.get(choice_id)
+        return choice.model_copy() if choice else None
+
+    def list(self) -> List[Choice]:
+        return [c.model_copy() for c in self.table.rows.values()]
+
+    def page(
+        self,
+        fields: Sequence[str],
+        *,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        return _page(
+            self.table.rows.values(),
+            fields,
+            ("created_at", "id"),
+            after=after,
+            limit=limit,
+        )
+
+    def export(self) -> Iterator[Dict[str, Any]]:
+        users, electives = self.store.users, self.store.electives
+        for c in list(self.table.rows.values()):
+            yield {
+                "user_id": c.user_id,
+                "email": users.rows[c.user_id].email,
+                "elective_id": c.elective_id,
+                "elective_code": electives.rows[c.elective_id].code,
+                "priority": c.priority,
+                "created_at": c.created_at,
+            }
+
+    def list_by_user(self, user_id: UUID) -> List[Choice]:
+        own = sorted(self._by("user_id", user_id), key=lambda c: c.priority)
+        return [c.model_copy() for c in own]
+
+    def list_by_elective(self, elective_id: UUID) -> List[Choice]:
+        return [c.model_copy() for c in self._by("elective_id", elective_id)]
+
+    def replace_for_user(self, user_id: UUID, choices: List[Choice]) -> None:
+        for choice_id in list(self.table.keys_by("user_id", user_id)):
+            self.table.remove(choice_id)
+        for choice in choices:
+            _insert(self.table, choice.id, choice.model_copy())
+        self._bump_version(user_id)
+
+    def _bump_version(self, user_id: UUID) -> None:
+        versions = self.store.choice_versions
+        versions.put(user_id, (versions.get(user_id) or 0) + 1)
+
+    def version(self, user_id: UUID) -> int:
+        return self.store.choice_versions.get(user_id) or 0
+
+    def remove_and_compact(
+        self, user_id: UUID, priority: int
+    ) -> Optional[List[Choice]]:
+        own = self._by("user_id", user_id)
+        gone = next((c for c in own if c.priority == priority), None)
+        if gone is None:
+            return None
+        self.table.remove(gone.id)
+        now = _now()
+        for c in own:
+            if c.priority > priority:
+                self.table.put(
+                    c.id,
+                    c.model_copy(
+                        update={"priority": c.priority - 1, "updated_at": now}
+                    ),
+                )
+        self._bump_version(user_id)
+        return self.list_by_user(user_id)
+
+    def delete(self, choice_id: UUID) -> None:
+        self.table.remove(choice_id)
+
+
+class InMemoryCourseRepo(AbstractCourseRepository):
+    def __init__(self, store: MemoryStore) -> None:
+        self.store = store
+        self.table = store.courses
+
+    def add(self, course: Course) -> None:
+        _insert(self.table, course.id, course.model_copy())
+
+    def get(self, course_id: UUID) -> Optional[Course]:
+        course = self.table.get(course_id)
+        return course.model_copy() if course else None
+
+    def get_by_name(self, name: str) -> Optional[Course]:
+        course = self.table.get_by("name", name)
+        return course.model_copy() if course else None
+
+    def list(self) -> List[Course]:
+        return [c.model_copy() for c in self.table.rows.values()]
+
+    def missing_ids(self, course_ids: List[UUID]) -> List[UUID]:
+        return [cid for cid in course_ids if self.table.get(cid) is None]
+
+    def update(self, course: Course) -> None:
+        self.table.put(course.id, course.model_copy())
+
+    def delete(self, course_id: UUID) -> None:
+        if self.table.remove(course_id) is None:
+            return
+        users = self.store.users
+        for u in list(users.rows.values()):
+            if u.course_id == course_id:
+                users.put(u.id, u.model_copy(update={"course_id": None}))
+        electives = self.store.electives
+        for e in list(electives.rows.values()):
+            if course_id in e.course_ids:
+                electives.put(
+                    e.id,
+                    e.model_copy(
+                        update={
+                            "course_ids": [c for c in e.course_ids if c != course_id]
+                        }
+                    ),
+                )
+
+
+class InMemoryAllocationRepo(AbstractAllocationRepository):
+    def __init__(self, store: MemoryStore) -> None:
+        self.runs = store.runs
+        self.seats = store.seats
+
+    def add_run(self, run: AllocationRun, allocations: List[Allocation]) -> None:
+        _insert(self.runs, run.id, run.model_copy(update={"seats": len(allocations)}))
+        self.seats.put(
+            run.id,
+            sorted(
+                (a.model_copy(update={"run_id": run.id}) for a in allocations),
+                key=lambda a: (a.user_id, a.elective_id),
+            ),
+        )
+
+    def list_runs(self) -> List[AllocationRun]:
+        runs = sorted(self.runs.rows.values(), key=lambda r: r.created_at, reverse=True)
+        return [r.model_copy() for r in runs]
+
+    def get_run(self, run_id: UUID) -> Optional[AllocationRun]:
+        run = self.runs.get(run_id)
+        return run.model_copy() if run else None
+
+    def latest_run(self) -> Optional[AllocationRun]:
+        runs = [r for r in self.list_runs() if r.capacities is not None]
+        return runs[0] if runs else None
+
+    def page(
+        self,
+        run_id: UUID,
+        *,
+        after: Optional[Tuple[UUID, UUID]] = None,
+        limit: int = 1000,
+    ) -> List[Allocation]:
+        seats = self.seats.get(run_id) or []
+        if after is not None:
+            seats = [a for a in seats if (a.user_id, a.elective_id) > after]
+        return [a.model_copy() for a in seats[:limit]]
+
+    def stream(self, run_id: UUID, *, batch_size: int = 1000) -> Iterator[Allocation]:
+        for a in list(self.seats.get(run_id) or []):
+            yield a.model_copy()
+
+    def delete_run(self, run_id: UUID) -> bool:
+        self.seats.remove(run_id)
+        return self.runs.remove(run_id) is not None
+
+
+# ─────────────────────── async flavours ───────────────────────
+# Nothing here ever waits; they only put the sync repositories behind
+# coroutines so the async services can run on the same store.
+
+
+class InMemoryAsyncUserRepo(AbstractAsyncUserRepository):
+    def __init__(self, store: MemoryStore) -> None:
+        self.sync = InMemoryUserRepo(store)
+
+    async def add(self, user: User) -> None:
+        self.sync.add(user)
+
+    async def get(self, user_id: UUID) -> Optional[User]:
+        return self.sync.get(user_id)
+
+    async def get_by_sso_id(self, sso_id: str) -> Optional[User]:
+        return self.sync.get_by_sso_id(sso_id)
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return self.sync.get_by_email(email)
+
+    async def list(self) -> List[User]:
+        return self.sync.list()
+
+    async def page(
+        self,
+        fields: Sequence[str],
+        *,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        return self.sync.page(fields, after=after, limit=limit)
+
+    async def update(self, user: User) -> None:
+        self.sync.update(user)
+
+    async def mark_first_choice(self, user_id: UUID, at: datetime) -> bool:
+        return self.sync.mark_first_choice(user_id, at)
+
+
+class InMemoryAsyncElectiveRepo(AbstractAsyncElectiveRepository):
+    def __init__(self, store: MemoryStore) -> None:
+        self.sync = InMemoryElectiveRepo(store)
+
+    async def add(self, elective: Elective) -> None:
+        self.sync.add(elective)
+
+    async def get(self, elective_id: UUID) -> Optional[Elective]:
+        return self.sync.get(elective_id)
+
+    async def get_by_code(self, code: str) -> Optional[Elective]:
+        return self.sync.get_by_code(code)
+
+    async def list(self) -> List[Elective]:
+        return self.sync.list()
+
+    async def page(
+        self, fields: Sequence[str], *, after: Optional[str] = None, limit: int
+    ) -> List[Dict[str, Any]]:
+        return self.sync.page(fields, after=after, limit=limit)
+
+    async def missing_ids(self, elective_ids: List[UUID]) -> List[UUID]:
+        return self.sync.missing_ids(elective_ids)
+
+    async def not_offered_to(
+        self, user_id: UUID, elective_ids: List[UUID]
+    ) -> List[UUID]:
+        return self.sync.not_offered_to(user_id, elective_ids)
+
+    async def update(self, elective: Elective) -> None:
+        self.sync.update(elective)
+
+    async def delete(self, elective_id: UUID) -> bool:
+        return self.sync.delete(elective_id)
+
+    async def delete_all(self) -> int:
+        return self.sync.delete_all()
+
+    async def set_courses(self, elective_id: UUID, course_ids: List[UUID]) -> None:
+        self.sync.set_courses(elective_id, course_ids)
+
+    async def upsert_many(
+        self, electives: List[Elective]
+    ) -> List[Tuple[Elective, bool]]:
+        return self.sync.upsert_many(electives)
+
+    async def replace_courses(self, course_ids: Mapping[UUID, List[UUID]]) -> None:
+        self.sync.replace_courses(course_ids)
+
+
+class InMemoryAsyncChoiceRepo(AbstractAsyncChoiceRepository):
+    def __init__(self, store: MemoryStore) -> None:
+        self.sync = InMemoryChoiceRepo(store)
+
+    async def add(self, choice: Choice) -> None:
+        self.sync.add(choice)
+
+    async def update(self, choice: Choice) -> None:
+        self.sync.update(choice)
+
+    async def get(self, choice_id: UUID) -> Optional[Choice]:
+        return self.sync.get(choice_id)
+
+    async def list(self) -> List[Choice]:
+        return self.sync.list()
+
+    async def page(
+        self,
+        fields: Sequence[str],
+        *,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        return self.sync.page(fields, after=after, limit=limit)
+
+    async def export(self, *, batch_size: int = 1000) -> AsyncIterator[Dict[str, Any]]:
+        for row in self.sync.export():
+            yield row
+
+    async def list_by_user(self, user_id: UUID) -> List[Choice]:
+        return self.sync.list_by_user(user_id)
+
+    async def list_by_elective(self, elective_id: UUID) -> List[Choice]:
+        return self.sync.list_by_elective(elective_id)
+
+    async def replace_for_user(self, user_id: UUID, choices: List[Choice]) -> None:
+        self.sync.replace_for_user(user_id, choices)
+
+    async def remove_and_compact(
+        self, user_id: UUID, priority: int
+    ) -> Optional[List[Choice]]:
+        return self.sync.remove_and_compact(user_id, priority)
+
+    async def delete(self, choice_id: UUID) -> None:
+        self.sync.delete(choice_id)
+
+    async def version(self, user_id: UUID) -> int:
+        return self.sync.version(user_id)
+
+    async def try_lock(self, user_id: UUID) -> bool:
+        # one thread, one transaction at a time: nothing to wait for
+        return True
+
+
+class InMemoryAsyncChoiceSubmissionRepo(AbstractAsyncChoiceSubmissionRepository):
+    def __init__(self, store: MemoryStore) -> None:
+        self.table = store.submissions
+
+    async def get(self, user_id: UUID, key: str) -> Optional[ChoiceSubmission]:
+        submission = self.table.get((user_id, key))
+        return submission.model_copy() if submission else None
+
+    async def put(self, submission: ChoiceSubmission) -> None:
+        self.table.put((submission.user_id, submission.key), submission.model_copy())
+
+    async def prune(self, user_id: UUID, before: datetime) -> None:
+        for key in list(self.table.keys_by("user_id", user_id)):
+            if self.table.rows[key].created_at < before:
+                self.table.remove(key)
+
+
+class InMemoryAsyncCourseRepo(AbstractAsyncCourseRepository):
+    def __init__(self, store: MemoryStore) -> None:
+        self.sync = InMemoryCourseRepo(store)
+
+    async def add(self, course: Course) -> None:
+        self.sync.add(course)
+
+    async def get(self, course_id: UUID) -> Optional[Course]:
+        return self.sync.get(course_id)
+
+    async def get_by_name(self, name: str) -> Optional[Course]:
+        return self.sync.get_by_name(name)
+
+    async def list(self) -> List[Course]:
+        return self.sync.list()
+
+    async def missing_ids(self, course_ids: List[UUID]) -> List[UUID]:
+        return self.sync.missing_ids(course_ids)
+
+    async def update(self, course: Course) -> None:
+        self.sync.update(course)
+
+    async def delete(self, course_id: UUID) -> None:
+        self.sync.delete(course_id)
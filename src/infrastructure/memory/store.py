@@ -0,0 +1,128 @@
+"""
+Dict-backed tables with secondary indexes and an undo journal, the storage
+behind the in-memory unit of work.
+"""
+
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set
+
+
+class Table:
+    """
+    Rows by primary key, plus a dict per unique column (value -> key) and
+    per indexed column (value -> set of keys).  Every write goes through
+    `put`/`remove`, which keep the indexes in step and journal the old row.
+    """
+
+    def __init__(
+        self,
+        store: "MemoryStore",
+        *,
+        unique: Iterable[str] = (),
+        indexed: Iterable[str] = (),
+    ) -> None:
+        self._store = store
+        self.rows: Dict[Hashable, Any] = {}
+        self.unique: Dict[str, Dict[Hashable, Hashable]] = {c: {} for c in unique}
+        self.indexed: Dict[str, Dict[Hashable, Set[Hashable]]] = {
+            c: defaultdict(set) for c in indexed
+        }
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        return self.rows.get(key)
+
+    def get_by(self, column: str, value: Hashable) -> Optional[Any]:
+        key = self.unique[column].get(value)
+        return None if key is None else self.rows[key]
+
+    def keys_by(self, column: str, value: Hashable) -> Set[Hashable]:
+        return self.indexed[column].get(value, set())
+
+    def put(self, key: Hashable, row: Any) -> None:
+        """
+        Insert or replace the row at `key`.  Raises ValueError, and changes
+        nothing, if a unique column would clash with another row.
+        """
+        old = self.rows.get(key)
+        for column, index in self.unique.items():
+            owner = index.get(getattr(row, column))
+            if owner is not None and owner != key:
+                raise ValueError(f"duplicate {column} {getattr(row, column)!r}")
+        if old is not None:
+            self._unindex(key, old)
+        self.rows[key] = row
+        self._index(key, row)
+        self._store.journal(lambda: self._restore(key, old))
+
+    def remove(self, key: Hashable) -> Optional[Any]:
+        old = self.rows.pop(key, None)
+        if old is not None:
+            self._unindex(key, old)
+            self._store.journal(lambda: self._restore(key, old))
+        return old
+
+    def _restore(self, key: Hashable, row: Optional[Any]) -> None:
+        current = self.rows.pop(key, None)
+        if current is not None:
+            self._unindex(key, current)
+        if row is not None:
+            self.rows[key] = row
+            self._index(key, row)
+
+    def _index(self, key: Hashable, row: Any) -> None:
+        for column, index in self.unique.items():
+            index[getattr(row, column)] = key
+        for column, index in self.indexed.items():
+            index[getattr(row, column)].add(key)
+
+    def _unindex(self, key: Hashable, row: Any) -> None:
+        for column, index in self.unique.items():
+            index.pop(getattr(row, column), None)
+        for column, index in self.indexed.items():
+            keys = index[getattr(row, column)]
+            keys.discard(key)
+            if not keys:
+                del index[getattr(row, column)]
+
+
+class MemoryStore:
+    """
+    The whole database as a few `Table`s.
+
+    `begin` marks the journal and `rollback` undoes every write made since
+    the matching mark, newest first, so a transaction costs nothing until
+    it writes and rolling back costs only what it wrote.  Marks nest like
+    savepoints.  One store may back several units of work, but there is no
+    isolation between them and no locking: use it from one thread.
+    """
+
+    def __init__(self) -> None:
+        self._undo: List[Callable[[], None]] = []
+        self._marks: List[int] = []
+        self.users = Table(self, unique=("sso_id", "email"))
+        self.electives = Table(self, unique=("code",))
+        self.courses = Table(self, unique=("name",))
+        self.choices = Table(self, indexed=("user_id", "elective_id"))
+        # each user's choice version, and their idempotent submissions
+        self.choice_versions = Table(self)
+        self.submissions = Table(self, indexed=("user_id",))
+        # allocation runs by id, and each run's seats as one list
+        self.runs = Table(self)
+        self.seats = Table(self)
+
+    def journal(self, undo: Callable[[], None]) -> None:
+        if self._marks:
+            self._undo.append(undo)
+
+    def begin(self) -> None:
+        self._marks.append(len(self._undo))
+
+    def commit(self) -> None:
+        self._marks.pop()
+        if not self._marks:
+            self._undo.clear()
+
+    def rollback(self) -> None:
+        mark = self._marks.pop()
+        while len(self._undo) > mark:
+            self._undo.pop()()
@@ -0,0 +1,69 @@
+from typing import Optional
+
+from src.domain.unit_of_work import AbstractAsyncUnitOfWork, AbstractUnitOfWork
+from src.infrastructure.memory.repositories import (
+    InMemoryAllocationRepo,
+    InMemoryAsyncChoiceRepo,
+    InMemoryAsyncChoiceSubmissionRepo,
+    InMemoryAsyncCourseRepo,
+    InMemoryAsyncElectiveRepo,
+    InMemoryAsyncUserRepo,
+    InMemoryChoiceRepo,
+    InMemoryCourseRepo,
+    InMemoryElectiveRepo,
+    InMemoryUserRepo,
+)
+from src.infrastructure.memory.store import MemoryStore
+
+
+class InMemoryUnitOfWork(AbstractUnitOfWork):
+    """
+    `UnitOfWork` on a `MemoryStore` (a fresh one unless given), for tests
+    and service-level benchmarks without a database.
+
+    Entering marks the store, exit commits or rolls every write since the
+    mark back, exactly as `AbstractUnitOfWork.__exit__` decides.  Unlike
+    a DB session, a nested block is a savepoint of the outer one.
+    """
+
+    def __init__(self, store: Optional[MemoryStore] = None) -> None:
+        self.store = store or MemoryStore()
+        self.users = InMemoryUserRepo(self.store)
+        self.electives = InMemoryElectiveRepo(self.store)
+        self.choices = InMemoryChoiceRepo(self.store)
+        self.courses = InMemoryCourseRepo(self.store)
+        self.allocations = InMemoryAllocationRepo(self.store)
+
+    def __enter__(self) -> "InMemoryUnitOfWork":
+        self.store.begin()
+        return self
+
+    def _commit(self) -> None:
+        self.store.commit()
+
+    def rollback(self) -> None:
+        self.store.rollback()
+
+
+class InMemoryAsyncUnitOfWork(AbstractAsyncUnitOfWork):
+    """
+    `AsyncUnitOfWork` on a `MemoryStore`.  Published invalidations are
+    dropped: there are no other workers to tell.
+    """
+
+    def __init__(self, store: Optional[MemoryStore] = None) -> None:
+        self.store = store or MemoryStore()
+        self.users = InMemoryAsyncUserRepo(self.store)
+        self.electives = InMemoryAsyncElectiveRepo(self.store)
+        self.choices = InMemoryAsyncChoiceRepo(self.store)
+        self.courses = InMemoryAsyncCourseRepo(self.store)
+        self.submissions = InMemoryAsyncChoiceSubmissionRepo(self.store)
+
+    async def _begin(self) -> None:
+        self.store.begin()
+
+    async def _commit(self) -> None:
+        self.store.commit()
+
+    async def rollback(self) -> None:
+        self.store.rollback()
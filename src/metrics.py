@@ -0,0 +1,168 @@
+"""
+In-process metrics rendered in the Prometheus text format.
+
+Only what `/metrics` needs: labelled counters and histograms kept in
+dicts under one lock, plus gauges read at scrape time.  Each worker
+process serves its own numbers.
+"""
+
+import bisect
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+Labels = Tuple[str, ...]
+
+# request latency, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# SQL statements issued by one request
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+_lock = threading.Lock()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.doc = doc
+        self.labels = tuple(labels)
+        REGISTRY.append(self)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        head = f"# HELP {self.name} {self.doc}\n# TYPE {self.name} {self.kind}\n"
+        return head + "".join(line + "\n" for line in self.samples())
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, doc: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, doc, labels)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with _lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> Iterable[str]:
+        with _lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_format_labels(self.labels, labels)} {_number(value)}"
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        doc: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(buckets)
+        # per label set: a count per bucket (+Inf last), then the sum
+        self._values: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with _lock:
+            counts, total = self._values.setdefault(
+                labels, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            counts[i] += 1
+            total[0] += value
+
+    def samples(self) -> Iterable[str]:
+        with _lock:
+            values = [(k, list(c), t[0]) for k, (c, t) in self._values.items()]
+        names = self.labels + ("le",)
+        for labels, counts, total in values:
+            running = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                running += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                yield f"{self.name}_bucket{_format_labels(names, labels + (le,))} {running}"
+            lbl = _format_labels(self.labels, labels)
+            yield f"{self.name}_sum{lbl} {_number(total)}"
+            yield f"{self.name}_count{lbl} {running}"
+
+
+class Gauge(Metric):
+    """A value read when scraped, one sample per label set."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        doc: str,
+        read: Callable[[], Dict[Labels, float]],
+        labels: Sequence[str] = (),
+    ) -> None:
+        super().__init__(name, doc, labels)
+        self._read = read
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in self._read().items():
+            yield f"{self.name}{_format_labels(self.labels, labels)} {_number(value)}"
+
+
+REGISTRY: List[Metric] = []
+
+
+def render() -> str:
+    return "".join(metric.render() for metric in REGISTRY)
+
+
+# ─────────────────────── per-request DB usage ───────────────────────
+@dataclass
+class RequestStats:
+    """SQL issued on behalf of one request, filled in by engine events."""
+
+    # the ASGI scope; routing adds the matched route to it in place
+    scope: Dict[str, Any] = field(default_factory=dict)
+    statements: int = 0
+    db_seconds: float = 0.0
+
+    @property
+    def method(self) -> str:
+        return self.scope.get("method", "")
+
+    @property
+    def route(self) -> str:
+        """The route template, e.g. `/electives/{elective_id}`."""
+        if (route := self.scope.get("route")) is not None:
+            return route.path
+        if "endpoint" in self.scope:  # plain Starlette route: /metrics, /docs
+            return self.scope["path"]
+        # unmatched paths share one label so scanners cannot blow it up
+        return "unmatched"
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar(
+    "current_request", default=None
+)
@@ -2,5 +2,12 @@ from .elective_service import ElectiveService
 from .choice_service import ChoiceService
 from .user_service import UserService
 from .course_service import CourseService
+from .allocation_service import AllocationService
 
-__all__ = ["ElectiveService", "UserService", "ChoiceService", "CourseService"]
+__all__ = [
+    "ElectiveService",
+    "UserService",
+    "ChoiceService",
+    "CourseService",
+    "AllocationService",
+]
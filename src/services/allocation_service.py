@@ -0,0 +1,544 @@
+import logging
+import secrets
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import (
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+from uuid import UUID, uuid4
+
+import numpy as np
+
+from src.domain.entities import (
+    Allocation,
+    AllocationRun,
+    Choice,
+    Course,
+    Elective,
+    RankSummary,
+    User,
+)
+from src.domain.exceptions import (
+    AllocationInputError,
+    AllocationPendingError,
+    AllocationRunNotFoundError,
+    ElectiveNotFoundError,
+)
+from src.domain.unit_of_work import AbstractUnitOfWork
+from src.services.allocation_simulation import TieBreak, simulate
+from src.services.allocation_solver import CATEGORIES, AllocationProblem, Allocator
+
+# invalidation topic, keyed by user id; published by every choice write
+TOPIC = "choices"
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class _Catalog:
+    """
+    Elective and course lookups needed to turn a student's choices into
+    solver rows.
+    """
+
+    def __init__(self, electives: List[Elective], courses: List[Course]) -> None:
+        self.elective_ids = [e.id for e in electives]
+        self.elective_index = {e.id: i for i, e in enumerate(electives)}
+        self.offered = [set(e.course_ids) for e in electives]
+        self.category = [CATEGORIES.index(e.category) for e in electives]
+        self.courses = {c.id: c for c in courses}
+
+    def student_rows(
+        self, course_id: Optional[UUID], own: List[Choice]
+    ) -> Optional[Tuple[Tuple[int, int], List[Tuple[int, int, int]]]]:
+        """
+        `(quota, [(elective, priority, category)])` for a student of course
+        `course_id`, or None if they chose something but have no course or
+        chose an elective their course does not offer.
+        """
+        if not own:
+            return (0, 0), []
+        course = self.courses.get(course_id) if course_id else None
+        if course is None:
+            return None
+        rows = []
+        for c in own:
+            e = self.elective_index[c.elective_id]
+            if course_id not in self.offered[e]:
+                return None
+            rows.append((e, c.priority, self.category[e]))
+        return (course.tech_quota, course.hum_quota), rows
+
+    def capacity(self, capacities: Mapping[UUID, int]) -> np.ndarray:
+        """Seats per elective index; every elective must have a count."""
+        for elective_id, seats in capacities.items():
+            if elective_id not in self.elective_index:
+                raise ElectiveNotFoundError(f"elective '{elective_id}' not found")
+            if seats < 0:
+                raise AllocationInputError(
+                    f"elective '{elective_id}' has {seats} seats"
+                )
+        missing = [eid for eid in self.elective_ids if eid not in capacities]
+        if missing:
+            raise AllocationInputError(
+                f"{len(missing)} electives have no seat count, e.g. '{missing[0]}'"
+            )
+        return np.array([capacities[eid] for eid in self.elective_ids], dtype=np.int32)
+
+
+def build_problem(
+    choices: List[Choice],
+    electives: List[Elective],
+    courses: List[Course],
+    users: List[User],
+    *,
+    capacities: Mapping[UUID, int],
+) -> AllocationProblem:
+    """
+    Pack choices into the column arrays the solver works on.
+
+    Each student gets the quotas of their own course.  Raises
+    AllocationInputError if a student with choices has no course, or chose
+    an elective it does not offer, or if an elective has no seat count in
+    `capacities`; ElectiveNotFoundError if `capacities` names an unknown one.
+    """
+    catalog = _Catalog(electives, courses)
+    course_of = {u.id: u.course_id for u in users}
+
+    picked: Dict[UUID, List[Choice]] = defaultdict(list)
+    for choice in choices:
+        if choice.elective_id in catalog.elective_index:
+            picked[choice.user_id].append(choice)
+
+    student_ids: List[UUID] = []
+    quota: List[Tuple[int, int]] = []
+    rows: List[Tuple[int, int, int, int]] = []
+    unplaced: List[UUID] = []
+    for user_id, own in picked.items():
+        packed = catalog.student_rows(course_of.get(user_id), own)
+        if packed is None:
+            unplaced.append(user_id)
+            continue
+        s = len(student_ids)
+        student_ids.append(user_id)
+        quota.append(packed[0])
+        rows.extend((s, e, p, k) for e, p, k in packed[1])
+    if unplaced:
+        raise AllocationInputError(
+            f"{len(unplaced)} students have no course or chose electives their"
+            f" course does not offer, e.g. user '{unplaced[0]}'"
+        )
+
+    table = np.array(rows, dtype=np.int32).reshape(-1, 4)
+    return AllocationProblem(
+        student_ids=student_ids,
+        elective_ids=catalog.elective_ids,
+        student=table[:, 0].copy(),
+        elective=table[:, 1].copy(),
+        priority=table[:, 2].astype(np.int8),
+        category=table[:, 3].astype(np.int8),
+        quota=np.array(quota, dtype=np.int16).reshape(-1, 2),
+        capacity=catalog.capacity(capacities),
+        kind=np.array(catalog.category, dtype=np.int8),
+    )
+
+
+def _tie_break_key(
+    policy: TieBreak, problem: AllocationProblem, users: List[User]
+) -> np.ndarray:
+    """
+    Per-student sort key for `policy`; smaller keys are served first.
+    SUBMISSION goes by the first ranking each student sent, which later
+    edits do not move; students without one come last.
+    """
+    key = np.zeros(problem.n_students, dtype=np.float64)
+    if policy is TieBreak.LOTTERY:
+        return key
+
+    if policy is TieBreak.SENIORITY:
+        when = {u.id: u.created_at.timestamp() for u in users}
+    else:
+        when = {
+            u.id: u.first_choice_at.timestamp()
+            for u in users
+            if u.first_choice_at is not None
+        }
+    for s, user_id in enumerate(problem.student_ids):
+        key[s] = when.get(user_id, np.inf)
+    return key
+
+
+class _LiveAllocation:
+    """
+    The allocation students see during the selection window, kept up to
+    date one write at a time.
+    """
+
+    def __init__(self, catalog: _Catalog, allocator: Allocator) -> None:
+        self.catalog = catalog
+        self.allocator = allocator
+        self.student_ids = list(allocator.problem.student_ids)
+        self.student_index = {uid: s for s, uid in enumerate(self.student_ids)}
+
+    def update(
+        self, students: Mapping[UUID, Tuple[Optional[UUID], List[Choice]]]
+    ) -> bool:
+        """
+        Apply new courses and choices for a few users; False if the
+        catalog is stale or a student can no longer be placed.
+        """
+        updates = {}
+        for user_id, (course_id, own) in students.items():
+            if any(c.elective_id not in self.catalog.elective_index for c in own):
+                return False
+            packed = self.catalog.student_rows(course_id, own)
+            if packed is None:
+                return False
+            s = self.student_index.get(user_id)
+            if s is None:
+                s = self.allocator.add_student()
+                self.student_ids.append(user_id)
+                self.student_index[user_id] = s
+            updates[s] = packed
+        self.allocator.replace_students(updates)
+        return True
+
+    def seats_of(self, user_id: UUID) -> List[Allocation]:
+        s = self.student_index.get(user_id)
+        if s is None:
+            return []
+        tech, hum = self.allocator.prefs[s]
+        return sorted(
+            (
+                Allocation(
+                    user_id=user_id,
+                    elective_id=self.catalog.elective_ids[e],
+                    priority=tech[e] if e in tech else hum[e],
+                )
+                for e in self.allocator.assigned[s]
+            ),
+            key=lambda a: a.priority,
+        )
+
+
+class AllocationService:
+    """
+    Allocation runs, plus the live allocation of this worker: the result
+    of the last `allocate`, repaired student by student as choices change.
+    Once dropped, it is rebuilt in the background with the seat counts and
+    seed of the newest stored run; reads meanwhile answer from the dropped
+    one.
+
+    Every change to the live allocation runs on one background thread, in
+    the order it was asked for.  A rebuild therefore cannot lose a write
+    that commits while it loads: that write's refresh is queued behind it.
+    """
+
+    # shared by every instance, i.e. by every request of this worker
+    _live: Optional[_LiveAllocation] = None
+    # the last dropped allocation, served while its replacement is built
+    _snapshot: Optional[_LiveAllocation] = None
+    _rebuilding = False
+    # the last rebuild found no stored run to follow
+    _never_run = False
+    _live_lock = threading.Lock()
+    _live_thread = ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="live-allocation"
+    )
+
+    def load_problem(
+        self,
+        uow: AbstractUnitOfWork,
+        *,
+        capacities: Mapping[UUID, int],
+    ) -> AllocationProblem:
+        with uow:
+            return build_problem(
+                uow.choices.list(),
+                uow.electives.list(),
+                uow.courses.list(),
+                uow.users.list(),
+                capacities=capacities,
+            )
+
+    def allocate(
+        self,
+        uow: AbstractUnitOfWork,
+        *,
+        capacities: Mapping[UUID, int],
+        seed: Optional[int] = None,
+    ) -> List[Allocation]:
+        """
+        Assign students to electives, minimising the total priority used.
+
+        `capacities` holds the seats of every elective.  When seats run
+        out, students are served in a random lottery order drawn from
+        `seed`.  The result also becomes the live allocation that later
+        choice changes are applied to.  Raises as `build_problem` does.
+        """
+        return self._serially(
+            lambda: self._allocate(uow, capacities=capacities, seed=seed)
+        )
+
+    def _allocate(
+        self,
+        uow: AbstractUnitOfWork,
+        *,
+        capacities: Mapping[UUID, int],
+        seed: Optional[int] = None,
+    ) -> List[Allocation]:
+        with uow:
+            electives = uow.electives.list()
+            courses = uow.courses.list()
+            choices = uow.choices.list()
+            users = uow.users.list()
+        problem = build_problem(
+            choices, electives, courses, users, capacities=capacities
+        )
+        allocator = Allocator(problem)
+        allocator.solve(np.random.default_rng(seed).permutation(problem.n_students))
+
+        with self._live_lock:
+            AllocationService._live = _LiveAllocation(
+                _Catalog(electives, courses), allocator
+            )
+            AllocationService._snapshot = None
+            AllocationService._never_run = False
+        return [
+            Allocation(
+                user_id=problem.student_ids[s],
+                elective_id=problem.elective_ids[e],
+                priority=p,
+            )
+            for s, e, p in allocator.assignments()
+        ]
+
+    def _serially(self, job: Callable[[], T]) -> T:
+        """Run `job` on the live allocation's thread and wait for it."""
+        return self._live_thread.submit(job).result()
+
+    # ─────────────────────── stored runs ───────────────────────
+    def run(
+        self,
+        uow: AbstractUnitOfWork,
+        *,
+        capacities: Mapping[UUID, int],
+        seed: Optional[int] = None,
+    ) -> AllocationRun:
+        """
+        Allocate and store the result as a new run, with the seat counts
+        and seed (drawn now if not given) it ran with.
+        """
+        if seed is None:
+            seed = secrets.randbits(63)
+        seats = self.allocate(uow, capacities=capacities, seed=seed)
+        run = AllocationRun(
+            id=uuid4(),
+            seats=len(seats),
+            created_at=datetime.now(timezone.utc),
+            seed=seed,
+            capacities=dict(capacities),
+        )
+        with uow:
+            uow.allocations.add_run(run, seats)
+        return run
+
+    def list_runs(self, uow: AbstractUnitOfWork) -> List[AllocationRun]:
+        with uow:
+            return uow.allocations.list_runs()
+
+    def get_run(self, run_id: UUID, uow: AbstractUnitOfWork) -> AllocationRun:
+        with uow:
+            run = uow.allocations.get_run(run_id)
+        if run is None:
+            raise AllocationRunNotFoundError(f"allocation run '{run_id}' not found")
+        return run
+
+    def get_page(
+        self,
+        run_id: UUID,
+        uow: AbstractUnitOfWork,
+        *,
+        after: Optional[Tuple[UUID, UUID]] = None,
+        limit: int = 1000,
+    ) -> List[Allocation]:
+        with uow:
+            page = uow.allocations.page(run_id, after=after, limit=limit)
+            # an empty page is the only one that may belong to no run
+            if not page and uow.allocations.get_run(run_id) is None:
+                raise AllocationRunNotFoundError(f"allocation run '{run_id}' not found")
+            return page
+
+    def stream_run(self, run_id: UUID, uow: AbstractUnitOfWork) -> Iterator[Allocation]:
+        """
+        Yield a run seat by seat; the transaction stays open until the
+        generator is exhausted or closed.  Nothing is checked until the
+        first seat is asked for, so callers that answer 404 for unknown
+        runs check with `get_run` first.
+        """
+        with uow:
+            yield from uow.allocations.stream(run_id)
+
+    def delete_run(self, run_id: UUID, uow: AbstractUnitOfWork) -> None:
+        with uow:
+            if not uow.allocations.delete_run(run_id):
+                raise AllocationRunNotFoundError(f"allocation run '{run_id}' not found")
+
+    def simulate(
+        self,
+        uow: AbstractUnitOfWork,
+        *,
+        capacities: Mapping[UUID, int],
+        policy: TieBreak = TieBreak.LOTTERY,
+        runs: int = 1000,
+        seed: int = 0,
+        workers: Optional[int] = None,
+    ) -> List[RankSummary]:
+        """
+        Run `runs` seeded allocations under one tie-break policy and
+        summarise how many seats each priority got.
+        """
+        with uow:
+            users = uow.users.list()
+            problem = build_problem(
+                uow.choices.list(),
+                uow.electives.list(),
+                uow.courses.list(),
+                users,
+                capacities=capacities,
+            )
+
+        key = _tie_break_key(policy, problem, users)
+        counts = simulate(problem, key, runs=runs, seed=seed, workers=workers)
+        return [
+            RankSummary(
+                priority=priority,
+                mean=float(column.mean()),
+                std=float(column.std()),
+                min=int(column.min()),
+                p5=float(np.percentile(column, 5)),
+                p50=float(np.percentile(column, 50)),
+                p95=float(np.percentile(column, 95)),
+                max=int(column.max()),
+            )
+            for priority, column in enumerate(counts.T)
+        ]
+
+    # ─────────────────────── live view ───────────────────────
+    def current_assignment(
+        self, user_id: UUID, uow: AbstractUnitOfWork
+    ) -> List[Allocation]:
+        """
+        The seats `user_id` would get if the allocation ran right now.
+
+        Never waits for a solve: without a live allocation, a rebuild is
+        queued and the answer comes from the last dropped one.  Raises
+        AllocationPendingError if there is none yet either.
+        """
+        with self._live_lock:
+            live = self._live or self._snapshot
+            if self._live is None and not self._rebuilding:
+                AllocationService._rebuilding = True
+                self._live_thread.submit(self._rebuild, uow)
+            if live is not None:
+                return live.seats_of(user_id)
+            if self._never_run:
+                return []
+        raise AllocationPendingError("The allocation is being computed")
+
+    def _rebuild(self, uow: AbstractUnitOfWork) -> None:
+        try:
+            # an `allocate` queued ahead of us may have built it already
+            if self._live is not None:
+                return
+            with uow:
+                latest = uow.allocations.latest_run()
+            # nothing to follow until an admin has run the allocation
+            if latest is None or latest.capacities is None:
+                AllocationService._never_run = True
+                return
+            self._allocate(uow, capacities=latest.capacities, seed=latest.seed)
+        except Exception:
+            logger.exception("live allocation rebuild failed")
+        finally:
+            with self._live_lock:
+                AllocationService._rebuilding = False
+
+    def choices_changed(self, key: Optional[str], uow: AbstractUnitOfWork) -> None:
+        """
+        `TOPIC` handler: reload the choices of user `key` into the live
+        allocation, or drop the allocation if `key` is None.  Returns at
+        once; the work is queued on the live allocation's thread.
+        """
+        if key is None:
+            self.drop_live()
+            return
+        user_id = UUID(key)
+
+        def reload() -> None:
+            if self._live is None:
+                return
+            with uow:
+                user = uow.users.get(user_id)
+                own = uow.choices.list_by_user(user_id)
+            self.refresh_students({user_id: (user.course_id if user else None, own)})
+
+        self._live_thread.submit(reload)
+
+    def drop_live(self) -> None:
+        """
+        Forget the live allocation, e.g. after the catalog changed; the
+        next read rebuilds it.  Queued like every other change.
+        """
+
+        def drop() -> None:
+            with self._live_lock:
+                self._retire()
+
+        self._live_thread.submit(drop)
+
+    def refresh_students(
+        self, students: Mapping[UUID, Tuple[Optional[UUID], List[Choice]]]
+    ) -> None:
+        """
+        Re-allocate just these users after their course or choices
+        changed; `students` holds each one's course and full new list of
+        choices.  Runs on the live allocation's thread; see
+        `choices_changed`.
+
+        Does nothing until a live allocation exists.  If a choice points at
+        an elective the live allocation has not seen or the student's
+        course does not offer, or the update fails halfway, the allocation
+        is dropped so the next read rebuilds it.  It is kept to answer
+        reads meanwhile, unless the update failed halfway through.
+        """
+        if self._live is None:
+            return
+        with self._live_lock:
+            live = self._live
+            if live is None:
+                return
+            try:
+                current = live.update(students)
+            except Exception:
+                logger.exception("live allocation update failed, dropping it")
+                AllocationService._live = None
+                return
+            if not current:
+                self._retire()
+
+    def _retire(self) -> None:
+        """Drop the live allocation, keeping it as the snapshot; locked."""
+        if self._live is not None:
+            AllocationService._snapshot = self._live
+            AllocationService._live = None
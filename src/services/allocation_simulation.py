@@ -0,0 +1,128 @@
+"""
+Monte Carlo runs of the allocation solver across a process pool.
+
+The parent packs the problem arrays into one shared-memory block; every
+worker maps it once in its initializer and builds zero-copy NumPy views on
+top, so a task is just a seed and the reply is a short histogram.
+
+Every run is a full solve in its own tie-break order, so nothing carries
+over between runs: at 10 000 students × 200 electives one run takes about
+3 s of one core (a thousand runs are ~50 CPU-minutes).
+
+Workers come from a forkserver, never from a fork of the caller: the API
+calls this from a threadpool thread, and forking a process with live
+threads can leave a worker holding a lock nobody will release.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.services.allocation_solver import AllocationProblem, Allocator
+
+
+class TieBreak(str, Enum):
+    """Who is served first when an elective runs out of seats."""
+
+    LOTTERY = "lottery"
+    SENIORITY = "seniority"  # oldest accounts first
+    SUBMISSION = "submission"  # earliest submitted choices first
+
+
+_FIELDS = (
+    "student",
+    "elective",
+    "priority",
+    "category",
+    "quota",
+    "capacity",
+    "kind",
+)
+_Layout = List[Tuple[str, str, Tuple[int, ...], int]]
+
+# the server imports NumPy and the solver once; workers fork from it
+_CONTEXT = multiprocessing.get_context("forkserver")
+_CONTEXT.set_forkserver_preload([__name__])
+
+# worker-side state, filled by `_attach`
+_shm: Optional[SharedMemory] = None
+_problem: Optional[AllocationProblem] = None
+_key: Optional[np.ndarray] = None
+_max_priority = 0
+
+
+def _attach(name: str, layout: _Layout, max_priority: int) -> None:
+    global _shm, _problem, _key, _max_priority
+    _shm = SharedMemory(name=name)
+    arrays = {
+        field: np.ndarray(shape, dtype=np.dtype(dtype), buffer=_shm.buf, offset=offset)
+        for field, dtype, shape, offset in layout
+    }
+    _key = arrays.pop("key")
+    _problem = AllocationProblem(student_ids=[], elective_ids=[], **arrays)
+    _max_priority = max_priority
+
+
+def _run_once(seed: int) -> np.ndarray:
+    assert _problem is not None and _key is not None
+    rng = np.random.default_rng(seed)
+    # primary key first, lottery among equal keys
+    order = np.lexsort((rng.random(_problem.n_students), _key))
+    allocator = Allocator(_problem)
+    allocator.solve(order)
+    return allocator.histogram(_max_priority)
+
+
+def simulate(
+    problem: AllocationProblem,
+    key: np.ndarray,
+    *,
+    runs: int,
+    seed: int = 0,
+    workers: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Solve `problem` once per seed in `seed .. seed + runs - 1`.
+
+    `key` orders students before the lottery (smaller first); pass zeros for
+    a pure lottery.  Returns a `runs × (max_priority + 1)` matrix of
+    `Allocator.histogram` rows.
+    """
+    max_priority = int(problem.priority.max()) if len(problem.priority) else 0
+    arrays: Dict[str, np.ndarray] = {f: getattr(problem, f) for f in _FIELDS}
+    arrays["key"] = np.asarray(key, dtype=np.float64)
+
+    shm = SharedMemory(create=True, size=max(1, sum(a.nbytes for a in arrays.values())))
+    try:
+        layout: _Layout = []
+        offset = 0
+        for field, array in arrays.items():
+            view = np.ndarray(array.shape, array.dtype, buffer=shm.buf, offset=offset)
+            view[...] = array
+            del view
+            layout.append((field, array.dtype.str, array.shape, offset))
+            offset += array.nbytes
+
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=_CONTEXT,
+            initializer=_attach,
+            initargs=(shm.name, layout, max_priority),
+        ) as pool:
+            rows = list(
+                pool.map(
+                    _run_once,
+                    range(seed, seed + runs),
+                    chunksize=max(1, runs // (4 * workers)),
+                )
+            )
+    finally:
+        shm.close()
+        shm.unlink()
+    return np.array(rows, dtype=np.int64).reshape(runs, max_priority + 1)
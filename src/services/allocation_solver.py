@@ -0,0 +1,443 @@
+"""
+Seat allocation solver.
+
+Every student ranks up to five electives.  A student may take as many Tech
+and Hum electives as the quotas of their course allow, and an elective may be
+capped in seats.  The allocation is a min-cost flow
+
+    source → (student, category) → elective → sink,   cost = priority
+
+solved with successive shortest paths.
+
+Students are inserted one at a time in tie-break order.  A seat that was
+already given to an earlier student is never taken away, but earlier students
+may be moved to another elective they ranked whenever that lowers the total
+priority.  Each student touches only a handful of electives, so the residual
+graph is kept contracted to the elective level: the edge a → b costs the
+cheapest "move some student from a to b" delta.  A shortest path is then a
+vectorised Bellman-Ford over an E×E matrix instead of a search over the whole
+student graph.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+import numpy as np
+
+TECH, HUM = 0, 1
+CATEGORIES = ("Tech", "Hum")
+UNLIMITED = np.iinfo(np.int32).max
+
+
+@dataclass
+class AllocationProblem:
+    """
+    Compact, array-based description of an allocation run.
+
+    Choice rows are stored column-wise; every row references a student and an
+    elective by index into `student_ids` / `elective_ids`.  The ids are only
+    needed to map results back, the solver itself never reads them.
+    """
+
+    student_ids: List[UUID]
+    elective_ids: List[UUID]
+    student: np.ndarray  # int32, per choice row
+    elective: np.ndarray  # int32, per choice row
+    priority: np.ndarray  # int8, per choice row
+    category: np.ndarray  # int8, per choice row (TECH | HUM)
+    quota: np.ndarray  # int16, shape (n_students, 2)
+    capacity: np.ndarray  # int32, per elective
+    kind: np.ndarray  # int8, per elective (TECH | HUM)
+
+    @property
+    def n_students(self) -> int:
+        return len(self.quota)
+
+    @property
+    def n_electives(self) -> int:
+        return len(self.capacity)
+
+
+class Allocator:
+    """
+    Mutable allocation state for one `AllocationProblem`.
+    """
+
+    def __init__(self, problem: AllocationProblem) -> None:
+        self.problem = problem
+        n_students, n_electives = problem.n_students, problem.n_electives
+
+        self.capacity = problem.capacity.astype(np.int64)
+        self.load = np.zeros(n_electives, dtype=np.int64)
+        self.quota: List[List[int]] = problem.quota.tolist()
+        # prefs[s][category] = {elective: priority}
+        self.prefs: List[Tuple[Dict[int, int], Dict[int, int]]] = [
+            ({}, {}) for _ in range(n_students)
+        ]
+        for s, e, p, k in zip(
+            problem.student.tolist(),
+            problem.elective.tolist(),
+            problem.priority.tolist(),
+            problem.category.tolist(),
+        ):
+            self.prefs[s][k][e] = p
+        self.assigned: List[Set[int]] = [set() for _ in range(n_students)]
+        self.rank: List[int] = list(range(n_students))
+        # students short of seats, per category
+        self.waiting: Tuple[Set[int], Set[int]] = (set(), set())
+
+        # electives split by category; moves never cross categories, so each
+        # category gets its own contracted graph in local indices.  Taken from
+        # the catalog rather than the choice rows: an elective nobody has
+        # picked yet may be picked by a later `replace_students`.
+        kind = problem.kind
+        self._members = [np.flatnonzero(kind == k) for k in (TECH, HUM)]
+        self._local = np.zeros(n_electives, dtype=np.int64)
+        for members in self._members:
+            self._local[members] = np.arange(len(members))
+        self._kind: List[int] = kind.tolist()
+
+        # moves[(a, b)][delta] = students on `a` who ranked `b` and would
+        # change their priority by `delta` when moved there
+        self._moves: Dict[Tuple[int, int], Dict[int, Set[int]]] = {}
+        self._cost = [np.full((len(m), len(m)), np.inf) for m in self._members]
+        self._indexed = False
+        # electives with no residual path to a free seat; only grows while
+        # seats are being handed out
+        self._dead = np.zeros(n_electives, dtype=bool)
+        # cleared once seats are released; from then on a free top pick may
+        # still be beaten by a chain of moves
+        self._optimal = True
+
+    # ─────────────────────── solving ───────────────────────
+    def solve(self, order: Optional[np.ndarray] = None) -> None:
+        """
+        Allocate every student, earlier students in `order` first.
+        """
+        n_students = self.problem.n_students
+        if order is None:
+            order = np.arange(n_students)
+        order = np.asarray(order, dtype=np.int64)
+        self.rank = np.argsort(order, kind="stable").tolist()
+
+        prefix = self._greedy_prefix(order)
+        for s in order[:prefix].tolist():
+            for k in (TECH, HUM):
+                prefs = self.prefs[s][k]
+                for e in sorted(prefs, key=prefs.__getitem__)[: self.quota[s][k]]:
+                    self.assigned[s].add(e)
+                    self.load[e] += 1
+
+        for s in order[prefix:].tolist():
+            self._insert(s)
+
+    def _greedy_prefix(self, order: np.ndarray) -> int:
+        """
+        Length of the longest prefix of `order` whose students can all take
+        their top picks without overflowing any elective.
+
+        Those students are exactly where successive shortest paths would put
+        them, so they are assigned in bulk instead of one augmentation each.
+        """
+        p = self.problem
+        position = np.empty(p.n_students, dtype=np.int64)
+        position[order] = np.arange(p.n_students)
+
+        # top-`quota` rows of every (student, category) group
+        idx = np.lexsort((p.priority, p.category, p.student))
+        group = p.student[idx].astype(np.int64) * 2 + p.category[idx]
+        starts = np.flatnonzero(np.r_[True, np.diff(group) != 0])
+        sizes = np.diff(np.r_[starts, len(idx)])
+        within = np.arange(len(idx)) - np.repeat(starts, sizes)
+        wanted = idx[within < p.quota[p.student[idx], p.category[idx]]]
+
+        # seat number of every wanted row inside its elective, in tie-break order
+        electives = p.elective[wanted]
+        positions = position[p.student[wanted]]
+        by_seat = np.lexsort((positions, electives))
+        seated = electives[by_seat]
+        seat = np.arange(len(seated)) - np.searchsorted(seated, seated)
+        overflow = seat >= self.capacity[seated]
+        if not overflow.any():
+            return p.n_students
+        return int(positions[by_seat][overflow].min())
+
+    def _insert(self, s: int) -> None:
+        for k in (TECH, HUM):
+            for _ in range(self._missing(s, k)):
+                if not self._place(s, k):
+                    self.waiting[k].add(s)
+                    break
+
+    def _missing(self, s: int, k: int) -> int:
+        prefs = self.prefs[s][k]
+        held = sum(1 for e in self.assigned[s] if e in prefs)
+        return min(self.quota[s][k], len(prefs)) - held
+
+    def _place(self, s: int, k: int) -> bool:
+        """
+        Route one more seat of category `k` to student `s`.
+        """
+        mine = self.assigned[s]
+        sources = {e: p for e, p in self.prefs[s][k].items() if e not in mine}
+        if not sources or self._dead[list(sources)].all():
+            return False
+
+        # No negative cycles in the residual graph means a free top pick can
+        # never be beaten by a detour, so the common case skips the search.
+        best = min(sources, key=sources.__getitem__)
+        if self._optimal and self.load[best] < self.capacity[best]:
+            self._assign(s, best)
+            return True
+
+        self._ensure_index()
+        members = self._members[k]
+        dist, pred = self._shortest_from(k, sources)
+        reach = np.where(self.load[members] < self.capacity[members], dist, np.inf)
+        target = int(reach.argmin())
+        if not np.isfinite(reach[target]):
+            self._dead[members[np.isfinite(dist)]] = True
+            return False
+
+        path = [target]
+        while pred[path[-1]] >= 0:
+            path.append(int(pred[path[-1]]))
+        path = members[path[::-1]].tolist()
+        for a, b in reversed(list(zip(path, path[1:]))):
+            self._move_cheapest(a, b)
+        self._assign(s, path[0])
+        return True
+
+    def _shortest_from(
+        self, k: int, sources: Dict[int, int]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bellman-Ford over category `k`, in local indices.
+
+        Only electives whose distance improved in the previous round are
+        relaxed again, which keeps most rounds far smaller than E×E.
+        """
+        cost = self._cost[k]
+        n = len(cost)
+        dist = np.full(n, np.inf)
+        pred = np.full(n, -1, dtype=np.int64)
+        for e, p in sources.items():
+            dist[self._local[e]] = p
+
+        frontier = np.isfinite(dist).nonzero()[0]
+        for _ in range(n):
+            via = dist[frontier, None] + cost[frontier]
+            better = (via.min(axis=0) < dist).nonzero()[0]
+            if not better.size:
+                break
+            best = via[:, better].argmin(axis=0)
+            dist[better] = via[best, better]
+            pred[better] = frontier[best]
+            frontier = better
+        return dist, pred
+
+    def _shortest_to(self, k: int, target: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Reverse Bellman-Ford: cost of every move chain ending in `target`.
+        """
+        cost = self._cost[k]
+        n = len(cost)
+        t = self._local[target]
+        dist = np.full(n, np.inf)
+        succ = np.full(n, -1, dtype=np.int64)
+        dist[t] = 0
+
+        frontier = np.array([t])
+        for _ in range(n):
+            via = cost[:, frontier] + dist[frontier]
+            better = (via.min(axis=1) < dist).nonzero()[0]
+            if not better.size:
+                break
+            best = via[better].argmin(axis=1)
+            dist[better] = via[better, best]
+            succ[better] = frontier[best]
+            frontier = better
+        return dist, succ
+
+    # ─────────────────────── incremental updates ───────────────────────
+    def add_student(self) -> int:
+        """
+        Register a student that was not part of the original problem.
+        They are served after everyone else.
+        """
+        self.prefs.append(({}, {}))
+        self.quota.append([0, 0])
+        self.assigned.append(set())
+        self.rank.append(len(self.rank))
+        return len(self.assigned) - 1
+
+    def replace_students(
+        self,
+        updates: Mapping[int, Tuple[Sequence[int], Iterable[Tuple[int, int, int]]]],
+    ) -> None:
+        """
+        Swap in new choices for a few students without re-solving.
+
+        `updates` maps a student to `(quota, [(elective, priority, category)])`.
+        Their seats are released first and only the paths through the freed
+        electives are repaired; then the students are re-inserted like any
+        late arrival.  The result is exact for the repaired region but may
+        drift from a full `solve` over many updates.
+        """
+        self._ensure_index()
+        freed: Set[int] = set()
+        for s in updates:
+            freed |= self._withdraw(s)
+        self._repair(freed)
+
+        for s in sorted(updates, key=self.rank.__getitem__):
+            quota, rows = updates[s]
+            self.quota[s] = list(quota)
+            self.prefs[s] = ({}, {})
+            for e, p, k in rows:
+                self.prefs[s][k][e] = p
+            self._insert(s)
+
+    def _withdraw(self, s: int) -> Set[int]:
+        freed = set(self.assigned[s])
+        self._link(s, add=False)
+        for e in freed:
+            self.load[e] -= 1
+        self.assigned[s] = set()
+        self.prefs[s] = ({}, {})
+        for waiting in self.waiting:
+            waiting.discard(s)
+        # seats came back, so nothing can be assumed unreachable any more
+        self._dead[:] = False
+        self._optimal = False
+        return freed
+
+    def _repair(self, freed: Set[int]) -> None:
+        """
+        Fill seats that just became free.
+
+        A waiting student who can reach the seat gets it first (earliest in
+        tie-break order wins).  Otherwise the cheapest chain of moves into
+        the seat is applied if it lowers the total priority, which frees a
+        seat further up the chain that is repaired in turn.
+        """
+        queue = sorted(freed)
+        while queue:
+            e = queue.pop()
+            if self.load[e] >= self.capacity[e]:
+                continue
+            k = self._kind[e]
+            members = self._members[k]
+            dist, succ = self._shortest_to(k, e)
+
+            if self._serve_waiting(k, dist):
+                queue.append(e)
+                continue
+
+            gain = np.where(self.load[members] > 0, dist, np.inf)
+            gain[self._local[e]] = np.inf
+            x = int(gain.argmin())
+            if not gain[x] < 0:
+                continue
+            path = [x]
+            while succ[path[-1]] >= 0:
+                path.append(int(succ[path[-1]]))
+            path = members[path].tolist()
+            for a, b in reversed(list(zip(path, path[1:]))):
+                self._move_cheapest(a, b)
+            queue += [e, path[0]]
+
+    def _serve_waiting(self, k: int, dist: np.ndarray) -> bool:
+        reachable = set(self._members[k][np.isfinite(dist)].tolist())
+        waiting = self.waiting[k]
+        for s in sorted(waiting, key=self.rank.__getitem__):
+            mine = self.assigned[s]
+            if not any(e in reachable for e in self.prefs[s][k] if e not in mine):
+                continue
+            if not self._place(s, k):
+                continue
+            if self._missing(s, k) <= 0:
+                waiting.discard(s)
+            return True
+        return False
+
+    # ─────────────────────── state changes ───────────────────────
+    def _assign(self, s: int, e: int) -> None:
+        self._link(s, add=False)
+        self.assigned[s].add(e)
+        self.load[e] += 1
+        self._link(s, add=True)
+
+    def _unassign(self, s: int, e: int) -> None:
+        self._link(s, add=False)
+        self.assigned[s].discard(e)
+        self.load[e] -= 1
+        self._link(s, add=True)
+
+    def _move_cheapest(self, a: int, b: int) -> None:
+        bucket = self._moves[(a, b)]
+        s = next(iter(bucket[min(bucket)]))
+        self._unassign(s, a)
+        self._assign(s, b)
+
+    def _ensure_index(self) -> None:
+        if self._indexed:
+            return
+        self._indexed = True
+        for s in range(len(self.assigned)):
+            self._link(s, add=True)
+
+    def _link(self, s: int, *, add: bool) -> None:
+        """
+        Add or remove every "move s from a to b" edge of student `s`.
+        """
+        if not self._indexed:
+            return
+        mine = self.assigned[s]
+        if not mine:
+            return
+        for prefs in self.prefs[s]:
+            for a in mine:
+                if a not in prefs:
+                    continue
+                for b, pb in prefs.items():
+                    if b in mine:
+                        continue
+                    delta = pb - prefs[a]
+                    bucket = self._moves.setdefault((a, b), {})
+                    if add:
+                        bucket.setdefault(delta, set()).add(s)
+                    else:
+                        members = bucket[delta]
+                        members.discard(s)
+                        if not members:
+                            del bucket[delta]
+                    self._cost[self._kind[a]][self._local[a], self._local[b]] = (
+                        min(bucket) if bucket else np.inf
+                    )
+
+    # ─────────────────────── results ───────────────────────
+    def assignments(self) -> List[Tuple[int, int, int]]:
+        """
+        `(student, elective, priority)` for every assigned seat.
+        """
+        out: List[Tuple[int, int, int]] = []
+        for s, mine in enumerate(self.assigned):
+            tech, hum = self.prefs[s]
+            for e in mine:
+                out.append((s, e, tech[e] if e in tech else hum[e]))
+        return out
+
+    def histogram(self, max_priority: int) -> np.ndarray:
+        """
+        Seats handed out per priority; slot 0 counts the seats students were
+        entitled to by their quotas but did not get.
+        """
+        counts = np.bincount(
+            [p for _, _, p in self.assignments()], minlength=max_priority + 1
+        )
+        counts[0] = sum(
+            self._missing(s, k) for k in (TECH, HUM) for s in self.waiting[k]
+        )
+        return counts
@@ -0,0 +1,69 @@
+"""
+Per-process cache of the serialized elective and course catalogs.
+
+Every catalog write, in this worker or another, bumps one shared version
+number once it has committed; cached bodies from an older version are
+never served.
+"""
+
+import gzip
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+# invalidation topic; published by every catalog write
+TOPIC = "catalog"
+
+# below this, gzip saves less than the header costs
+_GZIP_MIN_BYTES = 1024
+
+
+@dataclass(frozen=True)
+class CachedCatalog:
+    version: int
+    etag: str  # strong, quoted; content-based so workers agree on it
+    body: bytes
+    gzipped: Optional[bytes] = None
+
+
+class CatalogCache:
+    def __init__(self) -> None:
+        self._version = 0
+        self._entries: Dict[str, CachedCatalog] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def bump(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+    def get(self, name: str) -> Optional[CachedCatalog]:
+        entry = self._entries.get(name)
+        if entry is None or entry.version != self._version:
+            return None
+        return entry
+
+    def put(self, name: str, version: int, body: bytes) -> CachedCatalog:
+        """
+        Store `body`, serialized from data read at `version`.  If the
+        catalog changed meanwhile it is returned but not kept.
+        """
+        digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+        entry = CachedCatalog(
+            version=version,
+            etag=f'"{name}-{digest}"',
+            body=body,
+            gzipped=gzip.compress(body) if len(body) >= _GZIP_MIN_BYTES else None,
+        )
+        with self._lock:
+            if version == self._version:
+                self._entries[name] = entry
+        return entry
+
+
+catalog_cache = CatalogCache()
@@ -1,82 +1,242 @@
-from typing import List, Dict
-from uuid import uuid4, UUID
-from datetime import datetime, timezone
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, List, Dict, Optional, Sequence, Tuple
+from uuid import UUID
+from datetime import datetime, timedelta, timezone
 
-from src.domain.entities.choice import Choice
+from src.config import settings
+from src.domain.entities.choice import Choice, ChoiceSubmission, choice_id
 from src.domain.exceptions import (
+    ChoiceConflictError,
+    ChoiceWriteInProgressError,
+    CourseNotAssignedError,
     DuplicateChoiceError,
     ChoiceNotFoundError,
     ElectiveNotFoundError,
+    ElectiveNotOfferedError,
+    IdempotencyKeyReuseError,
+    TooManyChoicesError,
 )
-from src.domain.unit_of_work import AbstractUnitOfWork
+from src.domain.unit_of_work import AbstractAsyncUnitOfWork
+from src.services.allocation_service import TOPIC as CHOICES_TOPIC
+from src.services.projection import select_fields
+from src.services.user_cache import TOPIC as USER_TOPIC
+
+# how often a keyed retry asks for the write lock again
+_LOCK_POLL_SECONDS = 0.05
+
+
+@dataclass(frozen=True)
+class Ranking:
+    """
+    A student's choices by priority and their version.  `replayed` marks
+    a ranking answered from an earlier submission with the same
+    idempotency key, which may since have been overwritten.
+    """
+
+    choices: List[Choice]
+    version: int
+    replayed: bool = False
 
 
 class ChoiceService:
-    def list_user_choices(self, user_id: UUID, uow: AbstractUnitOfWork) -> List[Choice]:
+    async def list_user_choices(
+        self, user_id: UUID, uow: AbstractAsyncUnitOfWork
+    ) -> List[Choice]:
         """Fetch all choices for a user, ordered by ascending priority."""
-        with uow:
-            return sorted(uow.choices.list_by_user(user_id), key=lambda c: c.priority)
+        async with uow:
+            return sorted(
+                await uow.choices.list_by_user(user_id), key=lambda c: c.priority
+            )
 
-    def replace_user_choices(
-        self, user_id: UUID, elective_ids: List[UUID], uow: AbstractUnitOfWork
-    ) -> List[Choice]:
+    async def get_ranking(self, user_id: UUID, uow: AbstractAsyncUnitOfWork) -> Ranking:
+        """The user's choices, as `list_user_choices`, with their version."""
+        async with uow:
+            choices = await self.list_user_choices(user_id, uow)
+            return Ranking(choices, await uow.choices.version(user_id))
+
+    async def _claim(
+        self,
+        user_id: UUID,
+        expected_version: Optional[int],
+        uow: AbstractAsyncUnitOfWork,
+    ) -> int:
+        """
+        Take the user's write lock and return the version being replaced.
+        Fails at once, rather than queueing behind the other transaction,
+        if the lock is taken or the version is not `expected_version`.
+        """
+        if not await uow.choices.try_lock(user_id):
+            raise ChoiceConflictError("Choices are being changed by another request")
+        version = await uow.choices.version(user_id)
+        if expected_version is not None and expected_version != version:
+            raise ChoiceConflictError(
+                f"Choices are at version {version}, not {expected_version}"
+            )
+        return version
+
+    async def _wait_for_lock(self, user_id: UUID, uow: AbstractAsyncUnitOfWork) -> None:
+        """
+        Take the user's write lock for a request with an idempotency key,
+        polling for up to `IDEMPOTENCY_WAIT_SECONDS`: the holder may be the
+        first attempt of this very request, which a retry should replay.
+        """
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+        while not await uow.choices.try_lock(user_id):
+            if time.monotonic() >= deadline:
+                raise ChoiceWriteInProgressError(
+                    "Choices are still being written; retry with the same key"
+                )
+            await asyncio.sleep(_LOCK_POLL_SECONDS)
+
+    async def list_choices(
+        self,
+        uow: AbstractAsyncUnitOfWork,
+        *,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        limit: int = 100,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        One page of everyone's choices ordered by `(created_at, id)`; see
+        `UserService.list_users`.
+        """
+        columns = select_fields(Choice, fields)
+        async with uow:
+            return await uow.choices.page(columns, after=after, limit=limit)
+
+    async def export_choices(
+        self, uow: AbstractAsyncUnitOfWork
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Every choice with student email and elective code.  The transaction
+        stays open until the generator is exhausted or closed.
+        """
+        async with uow:
+            async for row in uow.choices.export():
+                yield row
+
+    async def replace_user_choices(
+        self,
+        user_id: UUID,
+        elective_ids: List[UUID],
+        uow: AbstractAsyncUnitOfWork,
+        *,
+        expected_version: Optional[int] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Ranking:
         """
         Delete all this user’s existing choices, then insert exactly `elective_ids`
         in the given order.  First item → priority=1, second → 2, etc.
 
+        With `idempotency_key`, the ranking and its version are remembered
+        for `IDEMPOTENCY_TTL_SECONDS`, and the same request under the same
+        key is answered from there without writing anything.  A retry that
+        arrives while the choices are being written waits for that write.
+
         Raises:
           - DuplicateChoiceError if the list contains the same elective twice.
+          - TooManyChoicesError if it is longer than `MAX_CHOICES`.
           - electiveNotFoundError if any ID isn’t in the electives table.
+          - CourseNotAssignedError if the user has no course yet.
+          - ElectiveNotOfferedError if an elective is not offered to it.
+          - ChoiceConflictError if another request is writing this user's
+            choices, or they are no longer at `expected_version`.
+          - ChoiceWriteInProgressError instead, with `idempotency_key`, if
+            that write is still going after `IDEMPOTENCY_WAIT_SECONDS`.
+          - IdempotencyKeyReuseError if `idempotency_key` was used for a
+            different list.
         """
-        with uow:
+        async with uow:
+            now = datetime.now(timezone.utc)
+            expired = now - timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+            if idempotency_key is not None:
+                # once the lock is ours, the attempt we may repeat has ended
+                await self._wait_for_lock(user_id, uow)
+                done = await uow.submissions.get(user_id, idempotency_key)
+                if done is not None and done.created_at >= expired:
+                    if done.elective_ids != elective_ids:
+                        raise IdempotencyKeyReuseError(
+                            "Idempotency key already used for other choices"
+                        )
+                    return Ranking(
+                        _ranked(user_id, done.elective_ids, done.created_at),
+                        done.version,
+                        replayed=True,
+                    )
+
             if len(elective_ids) != len(set(elective_ids)):
                 raise DuplicateChoiceError("No duplicates allowed")
+            if len(elective_ids) > settings.MAX_CHOICES:
+                raise TooManyChoicesError(
+                    f"At most {settings.MAX_CHOICES} choices allowed"
+                )
 
-            for elective_id in elective_ids:
-                if uow.electives.get(elective_id) is None:
-                    raise ElectiveNotFoundError(f"elective '{elective_id}' not found")
-
-            for existing in uow.choices.list_by_user(user_id):
-                uow.choices.delete(existing.id)
-
-            now = datetime.now(timezone.utc)
-            created: List[Choice] = []
-            for idx, elective_id in enumerate(elective_ids, start=1):
-                choice = Choice(
-                    id=uuid4(),
-                    user_id=user_id,
-                    elective_id=elective_id,
-                    priority=idx,
-                    created_at=now,
-                    updated_at=now,
+            unoffered = await uow.electives.not_offered_to(user_id, elective_ids)
+            if unoffered:
+                # the rare failing case pays for telling the reasons apart
+                missing = await uow.electives.missing_ids(unoffered)
+                if missing:
+                    raise ElectiveNotFoundError(f"elective '{missing[0]}' not found")
+                user = await uow.users.get(user_id)
+                if user is None or user.course_id is None:
+                    raise CourseNotAssignedError("No course assigned yet")
+                raise ElectiveNotOfferedError(
+                    f"elective '{unoffered[0]}' is not offered to your course"
                 )
-                uow.choices.add(choice)
-                created.append(choice)
 
-            return created
+            version = await self._claim(user_id, expected_version, uow) + 1
+            created = _ranked(user_id, elective_ids, now)
+            await uow.choices.replace_for_user(user_id, created)
+            uow.publish(CHOICES_TOPIC, str(user_id))
+            # the SUBMISSION tie-break goes by the first non-empty ranking
+            if elective_ids and await uow.users.mark_first_choice(user_id, now):
+                uow.publish(USER_TOPIC, str(user_id))
+            if idempotency_key is not None:
+                await uow.submissions.prune(user_id, expired)
+                await uow.submissions.put(
+                    ChoiceSubmission(
+                        user_id=user_id,
+                        key=idempotency_key,
+                        elective_ids=elective_ids,
+                        version=version,
+                        created_at=now,
+                    )
+                )
+            return Ranking(created, version)
 
-    def remove_choice(
-        self, user_id: UUID, priority: int, uow: AbstractUnitOfWork
-    ) -> List[Choice]:
+    async def remove_choice(
+        self,
+        user_id: UUID,
+        priority: int,
+        uow: AbstractAsyncUnitOfWork,
+        *,
+        expected_version: Optional[int] = None,
+    ) -> Ranking:
         """
         Delete the choice at `priority`.
         Shifts existing choices with priority > this up by one.
+        Raises ChoiceConflictError as `replace_user_choices` does.
         """
-        with uow:
-            choices = sorted(
-                uow.choices.list_by_user(user_id), key=lambda c: c.priority
-            )
-
-            to_del = next((c for c in choices if c.priority == priority), None)
-            if to_del is None:
+        async with uow:
+            version = await self._claim(user_id, expected_version, uow) + 1
+            remaining = await uow.choices.remove_and_compact(user_id, priority)
+            if remaining is None:
                 raise ChoiceNotFoundError(f"No choice at priority {priority}")
-            uow.choices.delete(to_del.id)
+            uow.publish(CHOICES_TOPIC, str(user_id))
+            return Ranking(remaining, version)
 
-            now = datetime.now(timezone.utc)
-            for choice in choices:
-                if choice.priority > priority:
-                    choice.priority -= 1
-                    choice.updated_at = now
-                    uow.choices.update(choice)
 
-            return sorted(uow.choices.list_by_user(user_id), key=lambda c: c.priority)
+def _ranked(user_id: UUID, elective_ids: List[UUID], at: datetime) -> List[Choice]:
+    return [
+        Choice(
+            id=choice_id(user_id, elective_id),
+            user_id=user_id,
+            elective_id=elective_id,
+            priority=idx,
+            created_at=at,
+            updated_at=at,
+        )
+        for idx, elective_id in enumerate(elective_ids, start=1)
+    ]
@@ -4,32 +4,33 @@ from uuid import UUID, uuid4
 
 from src.domain.entities.course import Course
 from src.domain.exceptions import DuplicateCourseNameError, CourseNotFoundError
-from src.domain.unit_of_work import AbstractUnitOfWork
+from src.domain.unit_of_work import AbstractAsyncUnitOfWork
+from src.services.catalog_cache import TOPIC
 
 
 class CourseService:
     # ─────────────────────── queries ───────────────────────
-    def list_courses(self, uow: AbstractUnitOfWork) -> List[Course]:
-        with uow:
-            return uow.courses.list()
+    async def list_courses(self, uow: AbstractAsyncUnitOfWork) -> List[Course]:
+        async with uow:
+            return await uow.courses.list()
 
-    def get_course(self, course_id: UUID, uow: AbstractUnitOfWork) -> Course:
-        with uow:
-            if course := uow.courses.get(course_id):
+    async def get_course(self, course_id: UUID, uow: AbstractAsyncUnitOfWork) -> Course:
+        async with uow:
+            if course := await uow.courses.get(course_id):
                 return course
             raise CourseNotFoundError(f"Course '{course_id}' not found")
 
     # ─────────────────────── commands ──────────────────────
-    def create_course(
+    async def create_course(
         self,
         *,
         name: str,
         tech_quota: int,
         hum_quota: int,
-        uow: AbstractUnitOfWork,
+        uow: AbstractAsyncUnitOfWork,
     ) -> Course:
-        with uow:
-            if uow.courses.get_by_name(name):
+        async with uow:
+            if await uow.courses.get_by_name(name):
                 raise DuplicateCourseNameError(f"Course name '{name}' already exists")
 
             now = datetime.now(timezone.utc)
@@ -41,5 +42,6 @@ class CourseService:
                 created_at=now,
                 updated_at=now,
             )
-            uow.courses.add(course)
+            await uow.courses.add(course)
+            uow.publish(TOPIC)
             return course
@@ -1,5 +1,14 @@
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import (
+    Any,
+    AsyncIterable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 from uuid import UUID, uuid4
 
 from src.domain.entities import Elective
@@ -8,30 +17,48 @@ from src.domain.exceptions import (
     UnknownCourseIDsError,
     ElectiveNotFoundError,
 )
-from src.domain.unit_of_work import AbstractUnitOfWork
+from src.domain.unit_of_work import AbstractAsyncUnitOfWork
+from src.services.catalog_cache import TOPIC
+from src.services.projection import select_fields
 
 
 class ElectiveService:
     # ─────────────────────── queries ───────────────────────
-    def list_electives(self, uow: AbstractUnitOfWork) -> List[Elective]:
-        with uow:
-            return uow.electives.list()
+    async def list_electives(self, uow: AbstractAsyncUnitOfWork) -> List[Elective]:
+        async with uow:
+            return await uow.electives.list()
 
-    def get_elective(
-        self, elective_id: UUID, uow: AbstractUnitOfWork
+    async def page_electives(
+        self,
+        uow: AbstractAsyncUnitOfWork,
+        *,
+        after: Optional[str] = None,
+        limit: int = 100,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        One page of the catalog ordered by code, starting after the code
+        `after`.  Rows hold `fields` (every field by default) plus `code`.
+        """
+        columns = select_fields(Elective, fields)
+        async with uow:
+            return await uow.electives.page(columns, after=after, limit=limit)
+
+    async def get_elective(
+        self, elective_id: UUID, uow: AbstractAsyncUnitOfWork
     ) -> Optional[Elective]:
-        with uow:
-            return uow.electives.get(elective_id)
+        async with uow:
+            return await uow.electives.get(elective_id)
 
     # ─────────────────────── commands ──────────────────────
-    def _validate_course_ids(
-        self, course_ids: List[UUID], uow: AbstractUnitOfWork
+    async def _validate_course_ids(
+        self, course_ids: List[UUID], uow: AbstractAsyncUnitOfWork
     ) -> None:
-        missing = [cid for cid in course_ids if uow.courses.get(cid) is None]
+        missing = await uow.courses.missing_ids(course_ids)
         if missing:
             raise UnknownCourseIDsError(missing)
 
-    def create_elective(
+    async def create_elective(
         self,
         *,
         code: str,
@@ -40,15 +67,15 @@ class ElectiveService:
         instructor: str,
         category: str,
         course_ids: List[UUID],
-        uow: AbstractUnitOfWork,
+        uow: AbstractAsyncUnitOfWork,
     ) -> Elective:
-        with uow:
-            if uow.electives.get_by_code(code):
+        async with uow:
+            if await uow.electives.get_by_code(code):
                 raise DuplicateElectiveCodeError(
                     f"Elective code '{code}' already exists"
                 )
 
-            self._validate_course_ids(course_ids, uow)
+            await self._validate_course_ids(course_ids, uow)
 
             now = datetime.now(timezone.utc)
             elective = Elective(
@@ -62,11 +89,12 @@ class ElectiveService:
                 created_at=now,
                 updated_at=now,
             )
-            uow.electives.add(elective)
-            uow.electives.set_courses(elective.id, course_ids)
+            await uow.electives.add(elective)
+            await uow.electives.set_courses(elective.id, course_ids)
+            uow.publish(TOPIC)
             return elective
 
-    def update_elective(
+    async def update_elective(
         self,
         elective_id: UUID,
         *,
@@ -76,19 +104,21 @@ class ElectiveService:
         instructor: str,
         category: str,
         course_ids: List[UUID],
-        uow: AbstractUnitOfWork,
+        uow: AbstractAsyncUnitOfWork,
     ) -> Elective | None:
-        with uow:
-            elective = uow.electives.get(elective_id)
+        async with uow:
+            elective = await uow.electives.get(elective_id)
             if not elective:
                 return None
 
-            if (other := uow.electives.get_by_code(code)) and other.id != elective_id:
+            if (
+                other := await uow.electives.get_by_code(code)
+            ) and other.id != elective_id:
                 raise DuplicateElectiveCodeError(
                     f"Elective code '{code}' already exists"
                 )
 
-            self._validate_course_ids(course_ids, uow)
+            await self._validate_course_ids(course_ids, uow)
 
             elective.code = code
             elective.title = title
@@ -98,22 +128,84 @@ class ElectiveService:
             elective.course_ids = course_ids
             elective.updated_at = datetime.now(timezone.utc)
 
-            uow.electives.update(elective)
-            uow.electives.set_courses(elective.id, course_ids)
+            await uow.electives.update(elective)
+            await uow.electives.set_courses(elective.id, course_ids)
+            uow.publish(TOPIC)
             return elective
 
+    async def delete_elective(
+        self, elective_id: UUID, uow: AbstractAsyncUnitOfWork
+    ) -> bool:
+        async with uow:
+            deleted = await uow.electives.delete(elective_id)
+            if deleted:
+                uow.publish(TOPIC)
+            return deleted
+
+    async def delete_all_electives(self, uow: AbstractAsyncUnitOfWork) -> int:
+        async with uow:
+            deleted = await uow.electives.delete_all()
+            if deleted:
+                uow.publish(TOPIC)
+            return deleted
+
     # ──────────────────── bulk import helper ────────────────────
-    def import_electives(
-        self, data: List[Dict[str, Any]], uow: AbstractUnitOfWork
-    ) -> Tuple[List[Elective], List[Tuple[Dict[str, Any], Elective]]]:
-        imported: List[Elective] = []
-        skipped: List[Tuple[Dict[str, Any], Elective]] = []
-
-        for payload in data:
-            try:
-                imported.append(self.create_elective(**payload, uow=uow))
-            except DuplicateElectiveCodeError:
-                if existing := uow.electives.get_by_code(payload["code"]):
-                    skipped.append((payload, existing))
-
-        return imported, skipped
+    async def import_electives(
+        self,
+        rows: AsyncIterable[Dict[str, Any]],
+        uow: AbstractAsyncUnitOfWork,
+        *,
+        batch_size: int = 500,
+    ) -> Tuple[List[Elective], List[Elective], List[Tuple[Dict[str, Any], Elective]]]:
+        """
+        Create or, matching on code, overwrite electives from `rows` (the
+        fields of `create_elective`), `batch_size` at a time, all in one
+        transaction.  `rows` is consumed lazily, so it can be a reader over
+        an upload that was never loaded whole.
+
+        Returns `(inserted, updated, skipped)`; a row is skipped when an
+        earlier row had the same code, and is paired with what that row
+        stored.  Any unknown course id aborts the whole import.
+        """
+        inserted: List[Elective] = []
+        updated: List[Elective] = []
+        repeated: List[Dict[str, Any]] = []
+        stored: Dict[str, Elective] = {}
+
+        async with uow:
+            known = {c.id for c in await uow.courses.list()}
+            seen: Set[str] = set()
+            batch: List[Elective] = []
+
+            async def flush() -> None:
+                wanted = {e.code: e.course_ids for e in batch}
+                links = {}
+                for elective, is_new in await uow.electives.upsert_many(batch):
+                    elective.course_ids = wanted[elective.code]
+                    links[elective.id] = elective.course_ids
+                    stored[elective.code] = elective
+                    (inserted if is_new else updated).append(elective)
+                await uow.electives.replace_courses(links)
+                batch.clear()
+
+            async for payload in rows:
+                if payload["code"] in seen:
+                    repeated.append(payload)
+                    continue
+                seen.add(payload["code"])
+                missing = [cid for cid in payload["course_ids"] if cid not in known]
+                if missing:
+                    raise UnknownCourseIDsError(missing)
+
+                now = datetime.now(timezone.utc)
+                batch.append(
+                    Elective(id=uuid4(), created_at=now, updated_at=now, **payload)
+                )
+                if len(batch) == batch_size:
+                    await flush()
+            if batch:
+                await flush()
+            if seen:
+                uow.publish(TOPIC)
+
+        return inserted, updated, [(p, stored[p["code"]]) for p in repeated]
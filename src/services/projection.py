@@ -0,0 +1,22 @@
+from typing import List, Optional, Sequence, Type
+
+from pydantic import BaseModel
+
+from src.domain.exceptions import ValidationError
+
+
+def select_fields(
+    entity: Type[BaseModel], fields: Optional[Sequence[str]]
+) -> List[str]:
+    """
+    `fields` checked against `entity`'s attributes; all of them if None.
+    """
+    known = list(entity.model_fields)
+    if fields is None:
+        return known
+    unknown = [f for f in fields if f not in known]
+    if unknown:
+        raise ValidationError(
+            f"unknown field(s) {', '.join(unknown)}; expected some of {', '.join(known)}"
+        )
+    return list(dict.fromkeys(fields))
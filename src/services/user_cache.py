@@ -0,0 +1,113 @@
+"""
+Per-process cache of users for the auth path.
+
+Entries expire after a TTL and the least recently used ones are evicted
+past `maxsize`.  `invalidate` also remembers when a user last changed, so
+tokens issued before that moment stop being trusted on their claims alone.
+The marks live in memory only: a token issued before this process started
+(or before its invalidation listener last reconnected) may predate a change
+it never heard of, so such tokens are not trusted either.
+
+A load races the invalidations that arrive while it runs: take
+`generation()` before loading and pass it to `put`, which drops the user
+if anything was invalidated in between.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+from src.config import settings
+from src.domain.entities import User
+
+# invalidation topic; the key is the user id
+TOPIC = "user"
+
+
+class UserCache:
+    def __init__(self, maxsize: int, ttl: float, remember_changes_for: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.remember_changes_for = remember_changes_for
+        self._users: "OrderedDict[UUID, Tuple[float, User]]" = OrderedDict()
+        self._changed: Dict[UUID, float] = {}
+        # tokens issued before this were issued before the marks we hold
+        self._trusted_since = time.time()
+        # bumped by every invalidation; see `put`
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, user_id: UUID) -> Optional[User]:
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None:
+                return None
+            expires, user = entry
+            if expires < time.monotonic():
+                del self._users[user_id]
+                return None
+            self._users.move_to_end(user_id)
+            return user
+
+    def generation(self) -> int:
+        """The token to take before loading a user for `put`."""
+        with self._lock:
+            return self._generation
+
+    def put(self, user: User, generation: int) -> None:
+        """
+        Cache `user`, loaded after `generation()` returned `generation`,
+        unless some user was invalidated since: the load may predate that.
+        """
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._users[user.id] = (time.monotonic() + self.ttl, user)
+            self._users.move_to_end(user.id)
+            while len(self._users) > self.maxsize:
+                self._users.popitem(last=False)
+
+    def invalidate(self, user_id: UUID) -> None:
+        """
+        Forget `user_id` and distrust every token issued before now.
+        """
+        now = time.time()
+        with self._lock:
+            self._generation += 1
+            self._users.pop(user_id, None)
+            self._changed[user_id] = now
+            # a token cannot outlive its expiry, so older marks are moot
+            horizon = now - self.remember_changes_for
+            for uid in [u for u, t in self._changed.items() if t < horizon]:
+                del self._changed[uid]
+
+    def changed_since(self, user_id: UUID, issued_at: float) -> bool:
+        """
+        Whether `user_id` may have changed after a token issued at
+        `issued_at` (seconds since the epoch, as in the JWT `iat` claim).
+        Tokens from before `_trusted_since` always count as changed.
+        """
+        with self._lock:
+            if issued_at <= self._trusted_since:
+                return True
+            changed = self._changed.get(user_id)
+            return changed is not None and changed > issued_at
+
+    def clear(self) -> None:
+        """
+        Drop every cached user and distrust every token issued before now,
+        for when changes may have been missed (e.g. the listener reconnected).
+        """
+        with self._lock:
+            self._generation += 1
+            self._users.clear()
+            self._trusted_since = time.time()
+
+
+user_cache = UserCache(
+    maxsize=settings.USER_CACHE_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+    remember_changes_for=60 * settings.ACCESS_TOKEN_EXPIRE_MINUTES,
+)
@@ -1,72 +1,152 @@
 from uuid import UUID, uuid4
 from datetime import datetime, timedelta, timezone
-from typing import List
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 import jwt
 
 from src.domain.entities import User
-from src.domain.exceptions import UserNotFoundError
-from src.domain.unit_of_work import AbstractUnitOfWork
+from src.domain.exceptions import (
+    CourseNotFoundError,
+    ElectiveNotOfferedError,
+    UserNotFoundError,
+)
+from src.domain.unit_of_work import AbstractAsyncUnitOfWork
 from src.config import settings
+from src.services.allocation_service import TOPIC as CHOICES_TOPIC
+from src.services.projection import select_fields
+from src.services.user_cache import TOPIC, user_cache
 
 
 class UserService:
-    def promote(self, username: str, uow: AbstractUnitOfWork) -> User:
-        with uow:
-            user = uow.users.get_by_sso_id(username)
+    async def promote(self, username: str, uow: AbstractAsyncUnitOfWork) -> User:
+        async with uow:
+            user = await uow.users.get_by_sso_id(username)
             if not user:
                 raise UserNotFoundError(f"User '{username}' not found")
             user.role = "Admin"
             user.updated_at = datetime.now(timezone.utc)
-            uow.users.update(user)
-            return user
+            await uow.users.update(user)
+            uow.publish(TOPIC, str(user.id))
+        return user
+
+    async def set_course(
+        self,
+        user_id: UUID,
+        course_id: Optional[UUID],
+        uow: AbstractAsyncUnitOfWork,
+    ) -> User:
+        """
+        Put the user on course `course_id`, or on none.  Raises
+        ElectiveNotOfferedError if they already chose an elective that
+        course does not offer; they have to drop it first.
+        """
+        async with uow:
+            user = await uow.users.get(user_id)
+            if not user:
+                raise UserNotFoundError(f"User '{user_id}' not found")
+            if course_id is not None and not await uow.courses.get(course_id):
+                raise CourseNotFoundError(f"Course '{course_id}' not found")
+            user.course_id = course_id
+            user.updated_at = datetime.now(timezone.utc)
+            # nested, so the check below sees the new course
+            async with uow:
+                await uow.users.update(user)
+            chosen = [c.elective_id for c in await uow.choices.list_by_user(user_id)]
+            unoffered = await uow.electives.not_offered_to(user_id, chosen)
+            if unoffered:
+                raise ElectiveNotOfferedError(
+                    f"the user chose elective '{unoffered[0]}',"
+                    " which that course does not offer"
+                )
+            uow.publish(TOPIC, str(user.id))
+            # their quotas in the live allocation
+            uow.publish(CHOICES_TOPIC, str(user.id))
+        return user
 
-    def list_users(self, uow: AbstractUnitOfWork) -> List[User]:
-        with uow:
-            return uow.users.list()
+    async def list_users(
+        self,
+        uow: AbstractAsyncUnitOfWork,
+        *,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        limit: int = 100,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        One page of users ordered by `(created_at, id)`, starting after the
+        key `after`.  Rows hold `fields` (every field by default) plus the
+        key columns needed to ask for the next page.
+        """
+        columns = select_fields(User, fields)
+        async with uow:
+            return await uow.users.page(columns, after=after, limit=limit)
 
-    def register_sso(
+    async def register_sso(
         self,
         *,
         sso_id: str,
         name: str,
         email: str,
         role: str,
-        uow: AbstractUnitOfWork,
+        uow: AbstractAsyncUnitOfWork,
     ) -> User:
-        with uow:
-            user = uow.users.get_by_sso_id(sso_id)
+        async with uow:
+            user = await uow.users.get_by_sso_id(sso_id)
             if user:
+                # most logins change nothing; publishing those would stop
+                # every fresh token from being trusted on its claims
+                if (user.name, user.email, user.role) == (name, email, role):
+                    return user
                 user.name = name
                 user.email = email
                 user.role = role
-                uow.users.update(user)
+                user.updated_at = datetime.now(timezone.utc)
+                await uow.users.update(user)
+            else:
+                now = datetime.now(timezone.utc)
+                user = User(
+                    id=uuid4(),
+                    sso_id=sso_id,
+                    name=name,
+                    email=email,
+                    role=role,
+                    created_at=now,
+                    updated_at=now,
+                )
+                await uow.users.add(user)
                 return user
+            uow.publish(TOPIC, str(user.id))
+        return user
 
-            now = datetime.now(timezone.utc)
-            user = User(
-                id=uuid4(),
-                sso_id=sso_id,
-                name=name,
-                email=email,
-                role=role,
-                created_at=now,
-                updated_at=now,
-            )
-            uow.users.add(user)
+    async def get_cached(
+        self, user_id: UUID, uow: AbstractAsyncUnitOfWork
+    ) -> Optional[User]:
+        """
+        The user from the per-process cache, loading it on a miss.
+        """
+        if user := user_cache.get(user_id):
             return user
+        generation = user_cache.generation()
+        async with uow:
+            user = await uow.users.get(user_id)
+        if user:
+            user_cache.put(user, generation)
+        return user
 
-    def is_admin(self, user_id: UUID, uow: AbstractUnitOfWork) -> bool:
-        with uow:
-            user = uow.users.get(user_id)
+    async def is_admin(self, user_id: UUID, uow: AbstractAsyncUnitOfWork) -> bool:
+        async with uow:
+            user = await uow.users.get(user_id)
             return bool(user and user.role == "Admin")
 
     def create_access_token(self, user: User) -> str:
+        now = datetime.now(timezone.utc)
         payload = {
             "sub": str(user.id),
             "email": user.email,
             "name": user.name,
-            "exp": datetime.now(timezone.utc)
-            + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+            "role": user.role,
+            # fractional, so a token issued right after a change is not
+            # mistaken for one issued before it (see `UserCache.changed_since`)
+            "iat": now.timestamp(),
+            "exp": now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
         }
         return jwt.encode(
             payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
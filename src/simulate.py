@@ -0,0 +1,55 @@
+"""
+Compare allocation tie-break policies from the command line, e.g.
+
+    python -m src.simulate --policy seniority --runs 1000 --seats 30
+
+Budget about 3 s of one core per run at 10 000 students × 200 electives,
+divided by the number of workers.
+"""
+
+import argparse
+import time
+
+from src.infrastructure.db.uow import UnitOfWork
+from src.services.allocation_service import AllocationService
+from src.services.allocation_simulation import TieBreak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--policy", choices=[p.value for p in TieBreak], default=TieBreak.LOTTERY
+    )
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--seats", type=int, required=True, help="seats of every elective"
+    )
+    args = parser.parse_args()
+
+    with UnitOfWork() as uow:
+        capacities = {e.id: args.seats for e in uow.electives.list()}
+
+    started = time.perf_counter()
+    summary = AllocationService().simulate(
+        UnitOfWork(),
+        policy=TieBreak(args.policy),
+        runs=args.runs,
+        seed=args.seed,
+        capacities=capacities,
+        workers=args.workers,
+    )
+    elapsed = time.perf_counter() - started
+
+    print(f"{args.runs} runs, policy={args.policy}, {elapsed:.1f}s")
+    print(f"{'priority':>8} {'mean':>10} {'std':>8} {'p5':>8} {'p95':>8}")
+    for row in summary:
+        label = "missed" if row.priority == 0 else str(row.priority)
+        print(
+            f"{label:>8} {row.mean:>10.1f} {row.std:>8.1f} {row.p5:>8.0f} {row.p95:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
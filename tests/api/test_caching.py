@@ -0,0 +1,64 @@
+import gzip
+
+import pytest
+from starlette.requests import Request
+
+from src.api.caching import _accepts_gzip, cached_json
+from src.services.catalog_cache import CachedCatalog
+
+BODY = b'[{"id": 1}]' * 200
+ENTRY = CachedCatalog(
+    version=0, etag='"electives-abc"', body=BODY, gzipped=gzip.compress(BODY)
+)
+
+
+def _request(**headers):
+    raw = [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()]
+    return Request({"type": "http", "method": "GET", "headers": raw})
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip", True),
+        ("gzip, deflate, br", True),
+        ("GZIP;q=0.5", True),
+        ("x-gzip", True),
+        ("*", True),
+        ("br;q=1.0, *;q=0.1", True),
+        ("", False),
+        ("identity", False),
+        ("br", False),
+        ("gzip;q=0", False),
+        ("gzip; q=0.000", False),
+        ("gzip;q=0, *", False),
+        ("*;q=0", False),
+        ("*;q=0, gzip;q=0.3", True),
+        ("gzip;q=zero", False),
+        ("nogzip", False),
+    ],
+)
+def test_accepts_gzip(accept_encoding, expected):
+    assert _accepts_gzip(accept_encoding) is expected
+
+
+def test_gzip_when_accepted():
+    response = cached_json(_request(accept_encoding="gzip, br"), ENTRY)
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == '"electives-abc-gzip"'
+    assert gzip.decompress(response.body) == BODY
+
+
+def test_identity_when_gzip_refused():
+    response = cached_json(_request(accept_encoding="gzip;q=0, br"), ENTRY)
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"electives-abc"'
+    assert response.body == BODY
+
+
+def test_not_modified_carries_the_etag_of_the_chosen_encoding():
+    response = cached_json(
+        _request(accept_encoding="gzip", if_none_match='"electives-abc"'), ENTRY
+    )
+    assert response.status_code == 304
+    assert response.headers["etag"] == '"electives-abc-gzip"'
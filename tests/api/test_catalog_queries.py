@@ -0,0 +1,76 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.app import app
+from src.config import settings
+from src.infrastructure.db.uow import UnitOfWork
+from src.services.catalog_cache import catalog_cache
+from tests.factories import course, elective
+
+BUDGETS = {
+    "GET /electives/": 1,
+    "GET /electives/{elective_id}": 1,
+}
+
+
+@pytest.fixture
+def catalog(db):
+    """A course with three electives, each offered to it and one more."""
+    b, m = course(name="test-B"), course(name="test-M")
+    electives = [elective(f"test-{i}", "Tech", [b, m]) for i in range(3)]
+    with UnitOfWork() as uow:
+        for c in (b, m):
+            uow.courses.add(c)
+        for e in electives:
+            uow.electives.add(e)
+            uow.electives.set_courses(e.id, [b.id, m.id])
+    catalog_cache.bump()
+    yield electives
+    with UnitOfWork() as uow:
+        for e in electives:
+            uow.electives.delete(e.id)
+        for c in (b, m):
+            uow.courses.delete(c.id)
+    catalog_cache.bump()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # an extra statement fails the request instead of being logged
+    monkeypatch.setattr(settings, "QUERY_BUDGET_ACTION", "reject")
+    monkeypatch.setattr(settings, "QUERY_BUDGET_ROUTES", BUDGETS)
+    return TestClient(app)
+
+
+def _by_code(items):
+    return {item["code"]: item for item in items}
+
+
+def test_catalog_is_one_query(catalog, client):
+    response = client.get("/electives/")
+
+    assert response.status_code == 200
+    listed = _by_code(response.json())
+    for e in catalog:
+        assert sorted(listed[e.code]["course_ids"]) == sorted(map(str, e.course_ids))
+
+
+def test_catalog_page_is_one_query(catalog, client):
+    response = client.get(
+        "/electives/", params={"after": "test-", "limit": 3, "fields": "code"}
+    )
+
+    assert response.status_code == 200
+    assert [item["code"] for item in response.json()] == [
+        "test-0",
+        "test-1",
+        "test-2",
+    ]
+
+
+def test_elective_is_one_query(catalog, client):
+    e = catalog[0]
+    response = client.get(f"/electives/{e.id}")
+
+    assert response.status_code == 200
+    assert sorted(response.json()["course_ids"]) == sorted(map(str, e.course_ids))
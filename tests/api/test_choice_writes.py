@@ -0,0 +1,219 @@
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.app import app
+from src.api.dependencies import get_uow
+from src.api.models import UserResponse
+from src.api.routers.auth import get_current_user
+from src.config import settings
+from src.infrastructure.memory.repositories import InMemoryAsyncChoiceRepo
+from src.infrastructure.memory.store import MemoryStore
+from src.infrastructure.memory.uow import InMemoryAsyncUnitOfWork, InMemoryUnitOfWork
+from tests.factories import course, elective, user
+
+
+@pytest.fixture
+def electives():
+    """
+    Ids of three electives in a fresh in-memory store, and the store; the
+    student "alice" is on their course.
+    """
+    store = MemoryStore()
+    b = course()
+    created = [elective(code, "Tech", [b]) for code in ("T1", "T2", "T3")]
+    with InMemoryUnitOfWork(store) as uow:
+        uow.courses.add(b)
+        uow.users.add(user("alice", course=b))
+        for e in created:
+            uow.electives.add(e)
+            uow.electives.set_courses(e.id, [b.id])
+    return store, [str(e.id) for e in created]
+
+
+@pytest.fixture
+def client(electives):
+    store, _ = electives
+    with InMemoryUnitOfWork(store) as uow:
+        student = uow.users.get_by_sso_id("alice")
+
+    async def uow():
+        async with InMemoryAsyncUnitOfWork(store) as u:
+            yield u
+
+    app.dependency_overrides[get_uow] = uow
+    app.dependency_overrides[get_current_user] = lambda: UserResponse(
+        sub=str(student.id), email=student.email, name=student.name, role="Student"
+    )
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def _items(response):
+    return [item["elective_id"] for item in response.json()]
+
+
+def test_if_match_accepts_the_current_version_only(client, electives):
+    _, ids = electives
+    assert client.get("/choices/").headers["ETag"] == '"0"'
+
+    first = client.post("/choices/", json=ids[:2], headers={"If-Match": '"0"'})
+    assert first.status_code == 200
+    assert first.headers["ETag"] == '"1"'
+
+    stale = client.post("/choices/", json=ids[1:], headers={"If-Match": '"0"'})
+    assert stale.status_code == 409
+    assert _items(client.get("/choices/")) == ids[:2]
+
+    removed = client.delete("/choices/1", headers={"If-Match": '"1"'})
+    assert removed.status_code == 200
+    assert removed.headers["ETag"] == '"2"'
+    assert client.delete("/choices/1", headers={"If-Match": '"1"'}).status_code == 409
+
+
+def test_if_match_star_and_malformed(client, electives):
+    _, ids = electives
+    assert (
+        client.post("/choices/", json=ids, headers={"If-Match": "*"}).status_code == 200
+    )
+    assert (
+        client.post("/choices/", json=ids, headers={"If-Match": "v1"}).status_code
+        == 422
+    )
+
+
+def test_busy_student_is_a_conflict(client, electives, monkeypatch):
+    _, ids = electives
+
+    async def taken(self, user_id):
+        return False
+
+    monkeypatch.setattr(InMemoryAsyncChoiceRepo, "try_lock", taken)
+
+    assert client.post("/choices/", json=ids).status_code == 409
+    assert client.delete("/choices/1").status_code == 409
+
+
+def test_retry_with_the_same_key_is_replayed(client, electives):
+    _, ids = electives
+    headers = {"Idempotency-Key": str(uuid4())}
+    first = client.post("/choices/", json=ids, headers=headers)
+    # someone else's write in between does not change the replayed answer
+    client.post("/choices/", json=ids[:1])
+
+    retry = client.post("/choices/", json=ids, headers=headers)
+
+    assert retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.headers["ETag"] == first.headers["ETag"] == '"1"'
+    assert _items(retry) == ids
+    assert client.get("/choices/").headers["ETag"] == '"2"'
+    assert _items(client.get("/choices/")) == ids[:1]
+
+
+def test_retry_waits_for_the_attempt_still_writing(client, electives, monkeypatch):
+    _, ids = electives
+    headers = {"Idempotency-Key": "k"}
+    first = client.post("/choices/", json=ids, headers=headers)
+    # the retry finds the lock held twice before the first attempt lets go
+    answers = iter([False, False])
+
+    async def busy_for_a_while(self, user_id):
+        return next(answers, True)
+
+    monkeypatch.setattr(InMemoryAsyncChoiceRepo, "try_lock", busy_for_a_while)
+
+    retry = client.post("/choices/", json=ids, headers=headers)
+
+    assert retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.headers["ETag"] == first.headers["ETag"]
+
+
+def test_retry_gives_up_with_retry_after(client, electives, monkeypatch):
+    _, ids = electives
+
+    async def taken(self, user_id):
+        return False
+
+    monkeypatch.setattr(InMemoryAsyncChoiceRepo, "try_lock", taken)
+    monkeypatch.setattr(settings, "IDEMPOTENCY_WAIT_SECONDS", 0.1)
+
+    retry = client.post("/choices/", json=ids, headers={"Idempotency-Key": "k"})
+
+    assert retry.status_code == 409
+    assert retry.headers["Retry-After"] == "1"
+    assert "same key" in retry.json()["detail"]
+
+
+def test_same_key_for_other_choices_is_rejected(client, electives):
+    _, ids = electives
+    headers = {"Idempotency-Key": "k"}
+    client.post("/choices/", json=ids, headers=headers)
+
+    reused = client.post("/choices/", json=ids[:2], headers=headers)
+
+    assert reused.status_code == 422
+    assert _items(client.get("/choices/")) == ids
+
+
+def test_expired_key_writes_again(client, electives, monkeypatch):
+    _, ids = electives
+    headers = {"Idempotency-Key": "k"}
+    client.post("/choices/", json=ids, headers=headers)
+    monkeypatch.setattr(settings, "IDEMPOTENCY_TTL_SECONDS", -1)
+
+    again = client.post("/choices/", json=ids[:2], headers=headers)
+
+    assert again.status_code == 200
+    assert "Idempotent-Replayed" not in again.headers
+    assert again.headers["ETag"] == '"2"'
+
+
+def test_only_electives_of_the_students_course(client, electives):
+    store, ids = electives
+    other = course("B23")
+    elsewhere = elective("X1", "Tech", [other])
+    with InMemoryUnitOfWork(store) as uow:
+        uow.courses.add(other)
+        uow.electives.add(elsewhere)
+        uow.electives.set_courses(elsewhere.id, [other.id])
+
+    outside = client.post("/choices/", json=[ids[0], str(elsewhere.id)])
+    assert outside.status_code == 422
+    assert "not offered" in outside.json()["detail"]
+    assert client.post("/choices/", json=[ids[0], str(uuid4())]).status_code == 404
+    assert _items(client.get("/choices/")) == []
+
+
+def test_a_student_without_a_course_cannot_choose(client, electives):
+    store, ids = electives
+    with InMemoryUnitOfWork(store) as uow:
+        alice = uow.users.get_by_sso_id("alice")
+        uow.users.update(alice.model_copy(update={"course_id": None}))
+
+    refused = client.post("/choices/", json=ids[:1])
+    assert refused.status_code == 422
+    assert "No course" in refused.json()["detail"]
+    # clearing one's choices needs no course
+    assert client.post("/choices/", json=[]).status_code == 200
+
+
+def test_the_first_submission_time_survives_later_edits(client, electives):
+    store, ids = electives
+
+    def first_choice_at():
+        with InMemoryUnitOfWork(store) as uow:
+            return uow.users.get_by_sso_id("alice").first_choice_at
+
+    assert client.post("/choices/", json=[]).status_code == 200
+    assert first_choice_at() is None
+
+    client.post("/choices/", json=ids[:1])
+    first = first_choice_at()
+    assert first is not None
+
+    client.post("/choices/", json=ids[1:])
+    client.delete("/choices/1")
+    assert first_choice_at() == first
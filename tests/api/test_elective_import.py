@@ -0,0 +1,81 @@
+import asyncio
+import csv
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.app import app
+from src.api.dependencies import get_uow
+from src.api.models import UserResponse
+from src.api.routers.auth import get_current_user
+from src.infrastructure.memory.store import MemoryStore
+from src.infrastructure.memory.uow import InMemoryAsyncUnitOfWork, InMemoryUnitOfWork
+from tests.factories import course
+
+
+@pytest.fixture
+def store():
+    store = MemoryStore()
+    with InMemoryUnitOfWork(store) as uow:
+        uow.courses.add(course("B24"))
+    return store
+
+
+@pytest.fixture
+def client(store):
+    async def uow():
+        async with InMemoryAsyncUnitOfWork(store) as u:
+            yield u
+
+    app.dependency_overrides[get_uow] = uow
+    app.dependency_overrides[get_current_user] = lambda: UserResponse(
+        sub="admin", email="admin@example.com", name="Admin", role="Admin"
+    )
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def _upload(client, text):
+    return client.post(
+        "/electives/from_file", files={"file": ("catalog.csv", text.encode())}
+    )
+
+
+def test_the_upload_is_parsed_off_the_event_loop(store, client, monkeypatch):
+    with InMemoryUnitOfWork(store) as uow:
+        b24 = uow.courses.get_by_name("B24")
+    parsed_on = []
+    reader = csv.DictReader
+
+    def recording(*args, **kwargs):
+        try:
+            parsed_on.append(asyncio.get_running_loop())
+        except RuntimeError:
+            parsed_on.append(None)
+        return reader(*args, **kwargs)
+
+    monkeypatch.setattr(csv, "DictReader", recording)
+    rows = "".join(
+        f"T{i},Title {i},,I. Instructor,Tech,{b24.id}\n" for i in range(1200)
+    )
+
+    response = _upload(
+        client, "code,title,description,instructor,category,course_ids\n" + rows
+    )
+
+    assert response.status_code == 200
+    assert len(response.json()["imported"]) == 1200
+    assert parsed_on == [None]
+    with InMemoryUnitOfWork(store) as uow:
+        assert len(uow.electives.list()) == 1200
+
+
+def test_a_bad_line_is_reported(client):
+    response = _upload(
+        client,
+        "code,title,description,instructor,category,course_ids\n"
+        "T1,Title,,I. Instructor,Sport,\n",
+    )
+
+    assert response.status_code == 422
+    assert "CSV line 2" in response.json()["detail"]
@@ -0,0 +1,180 @@
+import asyncio
+from uuid import uuid4
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.app import app
+from src.api.dependencies import get_uow
+from src.api.metrics import MetricsMiddleware
+from src.api.models import UserResponse
+from src.api.routers.auth import get_current_user
+from src.infrastructure.memory.store import MemoryStore
+from src.infrastructure.memory.uow import InMemoryAsyncUnitOfWork
+from src.metrics import COUNT_BUCKETS, LATENCY_BUCKETS, current_request, render
+
+HISTOGRAMS = {
+    "http_request_duration_seconds": LATENCY_BUCKETS,
+    "http_request_db_statements": COUNT_BUCKETS,
+    "http_request_db_seconds": LATENCY_BUCKETS,
+}
+
+
+def _parse(text):
+    """`{'name{labels}': value}` of every sample line."""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def _le(bound):
+    return (
+        "+Inf"
+        if bound == float("inf")
+        else str(int(bound) if bound == int(bound) else bound)
+    )
+
+
+@pytest.fixture
+def client():
+    store = MemoryStore()
+
+    async def uow():
+        async with InMemoryAsyncUnitOfWork(store) as u:
+            yield u
+
+    app.dependency_overrides[get_uow] = uow
+    app.dependency_overrides[get_current_user] = lambda: UserResponse(
+        sub="admin", email="admin@example.com", name="Admin", role="Admin"
+    )
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def _scrape(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    return response.text, _parse(response.text)
+
+
+def test_requests_are_counted_by_route_template_and_status(client):
+    _, before = _scrape(client)
+    users = 'http_requests_total{method="GET",route="/users/",status="200"}'
+    missing = (
+        'http_requests_total{method="PUT",route="/users/{user_id}/course",'
+        'status="404"}'
+    )
+    unmatched = 'http_requests_total{method="GET",route="unmatched",status="404"}'
+
+    client.get("/users/")
+    client.get("/users/")
+    user_id, junk = uuid4(), uuid4()
+    client.put(f"/users/{user_id}/course", json={"course_id": None})
+    client.get(f"/no/such/{junk}")
+    _, after = _scrape(client)
+
+    assert after[users] - before.get(users, 0) == 2
+    assert after[missing] - before.get(missing, 0) == 1
+    assert after[unmatched] - before.get(unmatched, 0) == 1
+    # raw paths never become labels
+    text, _ = _scrape(client)
+    assert str(user_id) not in text and str(junk) not in text
+
+
+def test_histograms_have_every_bucket_cumulative(client):
+    client.get("/users/")
+    text, samples = _scrape(client)
+
+    for name, buckets in HISTOGRAMS.items():
+        assert f"# TYPE {name} histogram" in text
+        assert f"# HELP {name} " in text
+        labels = 'method="GET",route="/users/"'
+        counts = [
+            samples[f'{name}_bucket{{{labels},le="{_le(b)}"}}']
+            for b in (*buckets, float("inf"))
+        ]
+        assert counts == sorted(counts)
+        assert counts[-1] == samples[f"{name}_count{{{labels}}}"] >= 1
+        assert f"{name}_sum{{{labels}}}" in samples
+
+    # the in-memory store issues no SQL: every request sits in le="0"
+    statements = (
+        'http_request_db_statements_bucket{method="GET",route="/users/",le="0"}'
+    )
+    count = 'http_request_db_statements_count{method="GET",route="/users/"}'
+    assert samples[statements] == samples[count]
+
+
+def test_every_metric_has_help_and_type(client):
+    text, _ = _scrape(client)
+    lines = text.splitlines()
+    declared = [line.split()[2] for line in lines if line.startswith("# TYPE")]
+    helped = [line.split()[2] for line in lines if line.startswith("# HELP")]
+    assert declared == helped
+    assert len(declared) == len(set(declared))
+    for name in (
+        "http_requests_total",
+        "http_request_query_budget_exceeded_total",
+        "db_statements_total",
+        "db_pool_checked_out",
+    ):
+        assert name in declared
+
+
+def test_the_statement_count_is_per_request():
+    """Two requests interleaving their statements each see only their own."""
+    tiny = FastAPI()
+    tiny.add_middleware(MetricsMiddleware)
+    b_started = asyncio.Event()
+
+    @tiny.get("/ctx-a")
+    async def a():
+        current_request.get().statements += 1
+        await b_started.wait()
+        current_request.get().statements += 2
+        return {}
+
+    @tiny.get("/ctx-b")
+    async def b():
+        current_request.get().statements += 5
+        b_started.set()
+        return {}
+
+    async def both():
+        transport = httpx.ASGITransport(app=tiny)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            await asyncio.gather(c.get("/ctx-a"), c.get("/ctx-b"))
+
+    asyncio.run(both())
+    samples = _parse(render())
+
+    assert samples['http_request_db_statements_sum{method="GET",route="/ctx-a"}'] == 3
+    assert samples['http_request_db_statements_sum{method="GET",route="/ctx-b"}'] == 5
+    assert current_request.get() is None
+
+
+def test_sql_is_counted_against_the_request_that_ran_it(db):
+    # the real unit of work, so the engine's events fire
+    app.dependency_overrides[get_current_user] = lambda: UserResponse(
+        sub="admin", email="admin@example.com", name="Admin", role="Admin"
+    )
+    try:
+        client = TestClient(app)
+        _, before = _scrape(client)
+        assert client.get("/users/", params={"limit": 1}).status_code == 200
+        _, after = _scrape(client)
+    finally:
+        app.dependency_overrides.clear()
+
+    key = 'http_request_db_statements_sum{method="GET",route="/users/"}'
+    assert after[key] - before.get(key, 0) >= 1
+    total = sum(v for k, v in after.items() if k.startswith("db_statements_total"))
+    assert total > sum(
+        v for k, v in before.items() if k.startswith("db_statements_total")
+    )
@@ -0,0 +1,74 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.api.metrics import MetricsMiddleware, budget_exceeded_total
+from src.config import settings
+from src.metrics import current_request
+
+
+def _issue(n):
+    """Count `n` statements against the current request, as the engine does."""
+    current_request.get().statements += n
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_BUDGET_ACTION", "reject")
+    monkeypatch.setattr(
+        settings,
+        "QUERY_BUDGET_ROUTES",
+        {"GET /work/{n}": 2, "GET /stream/{n}": 2},
+    )
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/work/{n}")
+    async def work(n: int):
+        _issue(n)
+        return {"n": n}
+
+    @app.get("/stream/{n}")
+    async def stream(n: int):
+        async def body():
+            yield b"first"
+            _issue(n)
+            yield b"second"
+
+        return StreamingResponse(body())
+
+    return TestClient(app)
+
+
+def _exceeded(route):
+    return budget_exceeded_total._values.get(("GET", route), 0)
+
+
+def test_within_budget(client):
+    response = client.get("/work/2")
+    assert response.status_code == 200
+    assert response.json() == {"n": 2}
+
+
+def test_over_budget_is_rejected_before_the_response(client):
+    before = _exceeded("/work/{n}")
+
+    response = client.get("/work/3")
+
+    assert response.status_code == 500
+    assert response.json() == {
+        "detail": "GET /work/{n} issued 3 SQL statements, budget is 2"
+    }
+    assert _exceeded("/work/{n}") == before + 1
+
+
+def test_a_streamed_body_going_over_is_only_logged(client, caplog):
+    before = _exceeded("/stream/{n}")
+
+    response = client.get("/stream/3")
+
+    assert response.status_code == 200
+    assert response.content == b"firstsecond"
+    assert _exceeded("/stream/{n}") == before + 1
+    assert "budget is 2" in caplog.text
@@ -0,0 +1,123 @@
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.app import app
+from src.api.dependencies import get_uow
+from src.api.models import UserResponse
+from src.api.pagination import NEXT_CURSOR_HEADER, parse_time_cursor, time_cursor
+from src.api.routers.auth import get_current_user
+from src.domain.exceptions import ValidationError
+from src.infrastructure.memory.store import MemoryStore
+from src.infrastructure.memory.uow import InMemoryAsyncUnitOfWork, InMemoryUnitOfWork
+from tests.factories import NOW, user
+
+
+@pytest.fixture
+def users():
+    """
+    Five users, oldest first by (created_at, id): three created at the
+    same moment, one a microsecond later, one a day later.
+    """
+    created = [user(f"u{i}") for i in range(3)]
+    created += [
+        user("u3").model_copy(update={"created_at": NOW + timedelta(microseconds=1)}),
+        user("u4").model_copy(update={"created_at": NOW + timedelta(days=1)}),
+    ]
+    store = MemoryStore()
+    with InMemoryUnitOfWork(store) as uow:
+        for u in created:
+            uow.users.add(u)
+    ordered = sorted(created, key=lambda u: (u.created_at, u.id))
+    return store, [str(u.id) for u in ordered]
+
+
+@pytest.fixture
+def client(users):
+    store, _ = users
+
+    async def uow():
+        async with InMemoryAsyncUnitOfWork(store) as u:
+            yield u
+
+    app.dependency_overrides[get_uow] = uow
+    app.dependency_overrides[get_current_user] = lambda: UserResponse(
+        sub="admin", email="admin@example.com", name="Admin", role="Admin"
+    )
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def _walk(client, limit, **params):
+    """Every page up to the one without a cursor, and the cursors sent."""
+    pages, cursors, after = [], [], None
+    while True:
+        query = {"limit": limit, **params, **({"after": after} if after else {})}
+        response = client.get("/users/", params=query)
+        assert response.status_code == 200
+        pages.append(response.json())
+        after = response.headers.get(NEXT_CURSOR_HEADER)
+        if after is None:
+            return pages, cursors
+        cursors.append(after)
+
+
+def test_cursor_round_trips_to_the_microsecond(users):
+    row = {"created_at": NOW + timedelta(microseconds=1), "id": users[1][0]}
+    created_at, row_id = parse_time_cursor(time_cursor(row))
+    assert created_at == row["created_at"]
+    assert str(row_id) == row["id"]
+
+
+@pytest.mark.parametrize("cursor", ["", "123", "abc:def", "1:2:3"])
+def test_malformed_cursor(cursor):
+    with pytest.raises(ValidationError):
+        parse_time_cursor(cursor)
+
+
+def test_pages_cover_everyone_once_across_ties(client, users):
+    _, ordered = users
+
+    pages, cursors = _walk(client, 2)
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [row["id"] for page in pages for row in page] == ordered
+    assert len(cursors) == 2
+
+
+def test_a_full_last_page_is_followed_by_an_empty_one(client, users):
+    _, ordered = users
+
+    pages, _ = _walk(client, 5)
+
+    assert [len(page) for page in pages] == [5, 0]
+    assert [row["id"] for row in pages[0]] == ordered
+
+
+def test_no_cursor_on_a_short_page(client):
+    response = client.get("/users/", params={"limit": 10})
+    assert len(response.json()) == 5
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+def test_fields_trim_the_rows_but_not_the_cursor(client, users):
+    _, ordered = users
+
+    pages, _ = _walk(client, 3, fields="sso_id")
+
+    assert [len(page) for page in pages] == [3, 2]
+    assert all(set(row) == {"sso_id"} for page in pages for row in page)
+    seen = [row["sso_id"] for page in pages for row in page]
+    assert sorted(seen) == [f"u{i}" for i in range(len(ordered))]
+
+
+def test_unknown_fields_are_rejected(client):
+    response = client.get("/users/", params={"fields": "sso_id,password"})
+    assert response.status_code == 422
+    assert "password" in response.json()["detail"]
+
+
+def test_malformed_cursor_is_a_422(client):
+    response = client.get("/users/", params={"after": "not-a-cursor"})
+    assert response.status_code == 422
@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+# src.config reads these at import time; tests that need a database ask
+# for the `db` fixture, which skips them when none is reachable
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/electives_test")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+
+
+@pytest.fixture(scope="session")
+def db():
+    """The migrated database from `DATABASE_URL`; tests clean up after themselves."""
+    from sqlalchemy.exc import OperationalError
+
+    from src.infrastructure.db.session import engine
+
+    try:
+        with engine.connect():
+            pass
+    except OperationalError as err:
+        pytest.skip(f"no database: {err.orig}")
+    return engine
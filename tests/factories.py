@@ -0,0 +1,63 @@
+"""Entities with every field filled in, for building test data."""
+
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence
+from uuid import UUID, uuid4
+
+from src.domain.entities import Choice, Course, Elective, User
+from src.domain.entities.choice import choice_id
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def course(name: str = "B24", tech_quota: int = 1, hum_quota: int = 1) -> Course:
+    return Course(
+        id=uuid4(),
+        name=name,
+        tech_quota=tech_quota,
+        hum_quota=hum_quota,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+def elective(code: str, category: str, courses: Sequence[Course]) -> Elective:
+    return Elective(
+        id=uuid4(),
+        code=code,
+        title=code,
+        description=None,
+        instructor="I. Instructor",
+        category=category,
+        course_ids=[c.id for c in courses],
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+def user(sso_id: str, role: str = "Student", course: Optional[Course] = None) -> User:
+    return User(
+        id=uuid4(),
+        sso_id=sso_id,
+        name=sso_id,
+        email=f"{sso_id}@example.com",
+        role=role,
+        course_id=course.id if course else None,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+def ranking(user_id: UUID, electives: Sequence[Elective]) -> List[Choice]:
+    """`electives` as `user_id`'s choices, first = priority 1."""
+    return [
+        Choice(
+            id=choice_id(user_id, e.id),
+            user_id=user_id,
+            elective_id=e.id,
+            priority=p,
+            created_at=NOW,
+            updated_at=NOW,
+        )
+        for p, e in enumerate(electives, start=1)
+    ]
@@ -0,0 +1,95 @@
+from uuid import uuid4
+
+import pytest
+
+from src.config import settings
+from src.infrastructure.db import choice_storage
+from src.infrastructure.db.choice_storage import ChoiceStorageError
+from src.infrastructure.db.repositories import (
+    SqlAlchemyChoiceRepo,
+    SqlAlchemyCourseRepo,
+    SqlAlchemyElectiveRepo,
+    SqlAlchemyRankingChoiceRepo,
+    SqlAlchemyUserRepo,
+)
+from src.infrastructure.db.session import create_session
+from tests.factories import course, elective, ranking, user
+
+REPOS = {"rows": SqlAlchemyChoiceRepo, "rankings": SqlAlchemyRankingChoiceRepo}
+
+
+@pytest.fixture
+def session(db):
+    session = create_session()
+    yield session
+    # the switch and everything else here is undone
+    session.rollback()
+    session.close()
+
+
+@pytest.fixture
+def electives(session):
+    b = course(name=f"test-{uuid4()}")
+    created = [elective(f"test-{uuid4()}", "Hum", [b]) for _ in range(3)]
+    SqlAlchemyCourseRepo(session).add(b)
+    for e in created:
+        SqlAlchemyElectiveRepo(session).add(e)
+    session.flush()
+    return created
+
+
+def _student(session):
+    someone = user(f"test-{uuid4()}")
+    SqlAlchemyUserRepo(session).add(someone)
+    session.flush()
+    return someone.id
+
+
+def _ranked(session, mode, user_id):
+    return [c.elective_id for c in REPOS[mode](session).list_by_user(user_id)]
+
+
+def test_switch_carries_the_choices_both_ways(session, electives):
+    start = choice_storage.current_mode(session)
+    other = "rankings" if start == "rows" else "rows"
+    alice, bob = _student(session), _student(session)
+    REPOS[start](session).replace_for_user(alice, ranking(alice, electives))
+    session.flush()
+
+    choice_storage.switch(session, other)
+
+    assert choice_storage.current_mode(session) == other
+    assert _ranked(session, other, alice) == [e.id for e in electives]
+    assert _ranked(session, other, bob) == []
+
+    # written while `other` is current, then carried back
+    REPOS[other](session).replace_for_user(bob, ranking(bob, electives[:1]))
+    REPOS[other](session).remove_and_compact(alice, 1)
+    session.flush()
+    choice_storage.switch(session, start)
+
+    assert _ranked(session, start, alice) == [e.id for e in electives[1:]]
+    assert _ranked(session, start, bob) == [electives[0].id]
+
+
+def test_switch_to_the_current_storage_copies_nothing(session):
+    assert choice_storage.switch(session, choice_storage.current_mode(session)) == 0
+
+
+def test_check_refuses_the_other_storage(session, monkeypatch):
+    current = choice_storage.current_mode(session)
+    monkeypatch.setattr(settings, "MAX_CHOICES", 5)
+    monkeypatch.setattr(settings, "CHOICE_STORAGE", current)
+    choice_storage.check(session)
+
+    other = "rankings" if current == "rows" else "rows"
+    monkeypatch.setattr(settings, "CHOICE_STORAGE", other)
+    with pytest.raises(ChoiceStorageError, match="switch"):
+        choice_storage.check(session)
+
+
+def test_check_refuses_more_choices_than_rows_hold(session, monkeypatch):
+    monkeypatch.setattr(settings, "CHOICE_STORAGE", "rows")
+    monkeypatch.setattr(settings, "MAX_CHOICES", 6)
+    with pytest.raises(ChoiceStorageError, match="MAX_CHOICES"):
+        choice_storage.check(session)
@@ -0,0 +1,148 @@
+from dataclasses import dataclass
+
+import pytest
+
+from src.infrastructure.memory.store import MemoryStore, Table
+from src.infrastructure.memory.uow import InMemoryUnitOfWork
+from tests.factories import user
+
+
+@dataclass(frozen=True)
+class Row:
+    email: str
+    group: str
+
+
+@pytest.fixture
+def store():
+    return MemoryStore()
+
+
+@pytest.fixture
+def table(store):
+    return Table(store, unique=("email",), indexed=("group",))
+
+
+def _state(table):
+    """Rows and both kinds of index, as plain values to compare."""
+    return (
+        dict(table.rows),
+        {c: dict(i) for c, i in table.unique.items()},
+        {c: {v: set(k) for v, k in i.items()} for c, i in table.indexed.items()},
+    )
+
+
+def test_put_indexes_and_replacing_reindexes(table):
+    table.put(1, Row("a@x", "g1"))
+    table.put(2, Row("b@x", "g1"))
+    table.put(1, Row("c@x", "g2"))
+
+    assert table.get_by("email", "c@x") == Row("c@x", "g2")
+    assert table.get_by("email", "a@x") is None
+    assert table.keys_by("group", "g1") == {2}
+    assert table.keys_by("group", "g2") == {1}
+
+
+def test_unique_clash_writes_nothing(store, table):
+    table.put(1, Row("a@x", "g1"))
+    table.put(2, Row("b@x", "g2"))
+    before = _state(table)
+
+    store.begin()
+    with pytest.raises(ValueError, match="duplicate email"):
+        table.put(2, Row("a@x", "g1"))
+    assert _state(table) == before
+    # nothing was journaled for it either
+    store.rollback()
+    assert _state(table) == before
+
+
+def test_remove_unindexes_and_drops_empty_groups(table):
+    table.put(1, Row("a@x", "g1"))
+
+    assert table.remove(1) == Row("a@x", "g1")
+    assert table.remove(1) is None
+    assert _state(table) == ({}, {"email": {}}, {"group": {}})
+
+
+def test_restore_puts_back_a_row_or_its_absence(table):
+    table.put(1, Row("a@x", "g1"))
+
+    table._restore(1, Row("b@x", "g2"))
+    assert table.get_by("email", "b@x") == Row("b@x", "g2")
+    assert table.get_by("email", "a@x") is None
+    assert table.keys_by("group", "g2") == {1}
+
+    table._restore(1, None)
+    assert _state(table) == ({}, {"email": {}}, {"group": {}})
+
+
+def test_rollback_restores_rows_and_indexes(store, table):
+    table.put(1, Row("a@x", "g1"))
+    table.put(2, Row("b@x", "g1"))
+    before = _state(table)
+
+    store.begin()
+    table.put(3, Row("c@x", "g3"))
+    table.put(1, Row("a2@x", "g2"))
+    table.remove(2)
+    # the freed email can be taken inside the same transaction
+    table.put(4, Row("b@x", "g4"))
+    store.rollback()
+
+    assert _state(table) == before
+
+
+def test_nested_rollback_keeps_the_outer_writes(store, table):
+    store.begin()
+    table.put(1, Row("a@x", "g1"))
+    store.begin()
+    table.put(1, Row("b@x", "g2"))
+    table.put(2, Row("a@x", "g1"))
+    store.rollback()
+
+    assert _state(table) == (
+        {1: Row("a@x", "g1")},
+        {"email": {"a@x": 1}},
+        {"group": {"g1": {1}}},
+    )
+    store.commit()
+    assert store._undo == []
+
+
+def test_outer_rollback_undoes_a_committed_inner_block(store, table):
+    table.put(1, Row("a@x", "g1"))
+    before = _state(table)
+
+    store.begin()
+    store.begin()
+    table.put(1, Row("b@x", "g2"))
+    table.put(2, Row("a@x", "g1"))
+    store.commit()
+    table.remove(2)
+    store.rollback()
+
+    assert _state(table) == before
+
+
+def test_writes_outside_a_transaction_are_not_journaled(store, table):
+    table.put(1, Row("a@x", "g1"))
+    table.remove(1)
+    assert store._undo == []
+
+
+def test_a_failed_unit_of_work_leaves_the_user_indexes_as_they_were(store):
+    with InMemoryUnitOfWork(store) as uow:
+        uow.users.add(user("alice"))
+    before = _state(store.users)
+
+    with pytest.raises(RuntimeError):
+        with InMemoryUnitOfWork(store) as uow:
+            uow.users.add(user("bob"))
+            uow.users.update(
+                uow.users.get_by_sso_id("alice").model_copy(update={"name": "A"})
+            )
+            raise RuntimeError("abort")
+
+    assert _state(store.users) == before
+    assert store.users.get_by("email", "bob@example.com") is None
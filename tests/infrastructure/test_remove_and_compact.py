@@ -0,0 +1,126 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from src.infrastructure.memory.store import MemoryStore
+from src.infrastructure.memory.uow import InMemoryUnitOfWork
+from tests.factories import course, elective, ranking, user
+
+STORAGES = ("memory", "rows", "rankings")
+
+
+def _memory():
+    store = MemoryStore()
+    uow = InMemoryUnitOfWork(store).__enter__()
+    yield SimpleNamespace(
+        users=uow.users,
+        courses=uow.courses,
+        electives=uow.electives,
+        choices=uow.choices,
+        version=uow.choices.version,
+        flush=lambda: None,
+    )
+    uow.rollback()
+
+
+def _sql(storage):
+    from src.infrastructure.db.models import ChoiceVersionModel, UserRankingModel
+    from src.infrastructure.db.repositories import (
+        SqlAlchemyChoiceRepo,
+        SqlAlchemyCourseRepo,
+        SqlAlchemyElectiveRepo,
+        SqlAlchemyRankingChoiceRepo,
+        SqlAlchemyUserRepo,
+    )
+    from src.infrastructure.db.session import create_session
+
+    session = create_session()
+    if storage == "rows":
+        choices = SqlAlchemyChoiceRepo(session)
+        model, column = ChoiceVersionModel, ChoiceVersionModel.version
+    else:
+        choices = SqlAlchemyRankingChoiceRepo(session)
+        model, column = UserRankingModel, UserRankingModel.version
+
+    def version(user_id):
+        return session.scalar(select(column).where(model.user_id == user_id)) or 0
+
+    try:
+        yield SimpleNamespace(
+            users=SqlAlchemyUserRepo(session),
+            courses=SqlAlchemyCourseRepo(session),
+            electives=SqlAlchemyElectiveRepo(session),
+            choices=choices,
+            version=version,
+            flush=session.flush,
+        )
+    finally:
+        # nothing written here outlives the test
+        session.rollback()
+        session.close()
+
+
+@pytest.fixture(params=STORAGES)
+def repos(request):
+    if request.param == "memory":
+        yield from _memory()
+    else:
+        request.getfixturevalue("db")
+        yield from _sql(request.param)
+
+
+@pytest.fixture
+def student(repos):
+    """A student with four choices, and those electives in order."""
+    b = course(name=f"test-{uuid4()}")
+    electives = [elective(f"test-{uuid4()}", "Tech", [b]) for _ in range(4)]
+    someone = user(f"test-{uuid4()}")
+    repos.users.add(someone)
+    repos.courses.add(b)
+    for e in electives:
+        repos.electives.add(e)
+    repos.flush()
+    repos.choices.replace_for_user(someone.id, ranking(someone.id, electives))
+    repos.flush()
+    return someone.id, [e.id for e in electives]
+
+
+def _ranked(choices):
+    return [(c.priority, c.elective_id) for c in choices]
+
+
+@pytest.mark.parametrize("priority", [1, 2, 4])
+def test_removes_one_choice_and_closes_the_gap(repos, student, priority):
+    user_id, electives = student
+    before = repos.version(user_id)
+
+    remaining = repos.choices.remove_and_compact(user_id, priority)
+
+    kept = electives[: priority - 1] + electives[priority:]
+    assert _ranked(remaining) == list(enumerate(kept, start=1))
+    assert _ranked(repos.choices.list_by_user(user_id)) == _ranked(remaining)
+    assert repos.version(user_id) == before + 1
+
+
+def test_nothing_at_that_priority(repos, student):
+    user_id, electives = student
+    before = repos.version(user_id)
+
+    assert repos.choices.remove_and_compact(user_id, 5) is None
+    assert repos.choices.remove_and_compact(uuid4(), 1) is None
+    assert _ranked(repos.choices.list_by_user(user_id)) == list(
+        enumerate(electives, start=1)
+    )
+    assert repos.version(user_id) == before
+
+
+def test_removing_the_last_choice_leaves_an_empty_list(repos, student):
+    user_id, electives = student
+    for _ in electives:
+        remaining = repos.choices.remove_and_compact(user_id, 1)
+
+    assert remaining == []
+    assert repos.choices.list_by_user(user_id) == []
+    assert repos.choices.remove_and_compact(user_id, 1) is None
@@ -0,0 +1,52 @@
+import copy
+import pickle
+
+import pytest
+
+from benchmarks.builders import SAMPLES
+from src.infrastructure.db.repositories.rows import entity_builder
+
+
+@pytest.fixture(params=list(SAMPLES), ids=lambda e: e.__name__)
+def entity(request):
+    return request.param
+
+
+def _reversed_row(entity):
+    """A row of `entity` with its columns in reverse field order."""
+    names = tuple(reversed(SAMPLES[entity]))
+    return names, tuple(SAMPLES[entity][n] for n in names)
+
+
+def test_built_entity_is_the_validated_one(entity):
+    names, row = _reversed_row(entity)
+    built = entity_builder(entity, names)(row)
+    validated = entity.model_validate(SAMPLES[entity])
+
+    assert built == validated
+    assert built.model_dump_json() == validated.model_dump_json()
+    assert built.model_fields_set == validated.model_fields_set
+    assert built.__pydantic_extra__ == validated.__pydantic_extra__
+    assert built.__pydantic_private__ == validated.__pydantic_private__
+
+
+def test_built_entity_behaves_like_a_model(entity):
+    names, row = _reversed_row(entity)
+    built = entity_builder(entity, names)(row)
+    first = next(iter(SAMPLES[entity]))
+
+    assert pickle.loads(pickle.dumps(built)) == built
+    assert copy.deepcopy(built) == built
+    assert entity.model_validate(built.model_dump()) == built
+    changed = built.model_copy(update={first: SAMPLES[entity][first]})
+    assert changed == built
+    setattr(changed, first, getattr(built, first))
+    assert changed == built
+
+
+def test_rows_must_carry_every_field(entity):
+    names = tuple(SAMPLES[entity])
+    with pytest.raises(ValueError):
+        entity_builder(entity, names[1:])
+    with pytest.raises(ValueError):
+        entity_builder(entity, names + ("unknown",))
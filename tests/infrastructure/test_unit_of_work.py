@@ -0,0 +1,32 @@
+import asyncio
+import logging
+
+from src.infrastructure.memory.store import MemoryStore
+from src.infrastructure.memory.uow import InMemoryAsyncUnitOfWork
+from tests.factories import user
+
+
+def test_a_failing_callback_does_not_stop_the_others(caplog):
+    store = MemoryStore()
+    ran = []
+
+    def broken():
+        raise RuntimeError("boom")
+
+    async def write():
+        async with InMemoryAsyncUnitOfWork(store) as uow:
+            await uow.users.add(user("alice"))
+            uow.on_commit(broken)
+            uow.on_commit(lambda: ran.append("after"))
+
+    with caplog.at_level(logging.ERROR):
+        asyncio.run(write())
+
+    assert ran == ["after"]
+    assert "on_commit callback failed" in caplog.text
+
+    async def read():
+        async with InMemoryAsyncUnitOfWork(store) as uow:
+            return await uow.users.get_by_sso_id("alice")
+
+    assert asyncio.run(read()) is not None
@@ -0,0 +1,38 @@
+from uuid import uuid4
+
+import pytest
+
+from src.domain.exceptions import AllocationRunNotFoundError
+from src.infrastructure.memory.store import MemoryStore
+from src.infrastructure.memory.uow import InMemoryUnitOfWork
+from src.services.allocation_service import AllocationService
+
+
+@pytest.fixture
+def service():
+    yield AllocationService()
+    AllocationService()._serially(lambda: setattr(AllocationService, "_live", None))
+
+
+def test_a_run_that_seats_nobody_is_still_stored(service):
+    store = MemoryStore()
+    run = service.run(InMemoryUnitOfWork(store), capacities={}, seed=3)
+
+    assert (run.seats, run.seed, run.capacities) == (0, 3, {})
+    assert service.list_runs(InMemoryUnitOfWork(store)) == [run]
+    assert service.get_page(run.id, InMemoryUnitOfWork(store)) == []
+
+    service.delete_run(run.id, InMemoryUnitOfWork(store))
+    assert service.list_runs(InMemoryUnitOfWork(store)) == []
+
+
+def test_unknown_runs_are_not_found(service):
+    uow = InMemoryUnitOfWork(MemoryStore())
+    run_id = uuid4()
+
+    with pytest.raises(AllocationRunNotFoundError):
+        service.get_run(run_id, uow)
+    with pytest.raises(AllocationRunNotFoundError):
+        service.get_page(run_id, uow)
+    with pytest.raises(AllocationRunNotFoundError):
+        service.delete_run(run_id, uow)
@@ -0,0 +1,39 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.services.allocation_simulation import simulate
+from src.services.allocation_solver import Allocator
+from tests.services.test_allocation_solver import _problem
+
+
+def _in_process(problem, key, seeds):
+    rows = []
+    for seed in seeds:
+        rng = np.random.default_rng(seed)
+        order = np.lexsort((rng.random(problem.n_students), key))
+        allocator = Allocator(problem)
+        allocator.solve(order)
+        rows.append(allocator.histogram(int(problem.priority.max())))
+    return np.array(rows)
+
+
+def test_workers_match_in_process_runs():
+    problem = _problem(3)
+    key = np.arange(problem.n_students, dtype=np.float64) % 3
+    counts = simulate(problem, key, runs=20, seed=7, workers=2)
+    assert (counts == _in_process(problem, key, range(7, 27))).all()
+
+
+def test_runs_from_a_threadpool_thread():
+    """What the API does: the sync endpoint runs in a threadpool."""
+    problem = _problem(5)
+    key = np.zeros(problem.n_students)
+    with ThreadPoolExecutor(2) as threads:
+        busy = threads.submit(lambda: sum(range(10**6)))
+        counts = threads.submit(
+            simulate, problem, key, runs=10, seed=0, workers=2
+        ).result(timeout=60)
+        busy.result()
+    assert counts.shape == (10, int(problem.priority.max()) + 1)
+    assert (counts == _in_process(problem, key, range(10))).all()
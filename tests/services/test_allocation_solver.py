@@ -0,0 +1,134 @@
+from collections import Counter
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from src.services.allocation_solver import (
+    HUM,
+    TECH,
+    UNLIMITED,
+    AllocationProblem,
+    Allocator,
+)
+
+
+def _problem(seed, n_students=14, n_electives=7, max_capacity=3):
+    """A random instance with few seats, so students compete for them."""
+    rng = np.random.default_rng(seed)
+    kind = rng.integers(0, 2, n_electives)
+    kind[:2] = [TECH, HUM]
+    rows = []
+    for s in range(n_students):
+        picked = rng.permutation(n_electives)[: rng.integers(1, 6)]
+        rows += [(s, e, p, kind[e]) for p, e in enumerate(picked, start=1)]
+    table = np.array(rows, dtype=np.int32)
+    return AllocationProblem(
+        student_ids=[uuid4() for _ in range(n_students)],
+        elective_ids=[uuid4() for _ in range(n_electives)],
+        student=table[:, 0].copy(),
+        elective=table[:, 1].copy(),
+        priority=table[:, 2].astype(np.int8),
+        category=table[:, 3].astype(np.int8),
+        quota=rng.integers(0, 3, (n_students, 2)).astype(np.int16),
+        capacity=rng.integers(0, max_capacity + 1, n_electives).astype(np.int32),
+        kind=kind.astype(np.int8),
+    )
+
+
+def _reference(problem, demand):
+    """
+    (seats, total priority) of a min-cost flow source → (student, category)
+    → elective → sink, by successive shortest paths with Bellman-Ford.
+    `demand[(s, k)]` caps the first edge.
+    """
+    edges = []  # [to, capacity, cost, reverse edge index]
+    graph = {}
+
+    def add(u, v, capacity, cost):
+        graph.setdefault(u, []).append(len(edges))
+        edges.append([v, capacity, cost, len(edges) + 1])
+        graph.setdefault(v, []).append(len(edges))
+        edges.append([u, 0, -cost, len(edges) - 1])
+
+    for (s, k), amount in demand.items():
+        add("source", ("student", s, k), amount, 0)
+    for s, e, p, k in zip(
+        problem.student, problem.elective, problem.priority, problem.category
+    ):
+        add(("student", int(s), int(k)), ("elective", int(e)), 1, int(p))
+    for e, capacity in enumerate(problem.capacity):
+        add(("elective", e), "sink", int(capacity), 0)
+
+    seats = cost = 0
+    while True:
+        dist, via = {"source": 0}, {}
+        for _ in range(len(graph)):
+            changed = False
+            for u in list(dist):
+                for i in graph[u]:
+                    v, capacity, c, _ = edges[i]
+                    if capacity > 0 and dist[u] + c < dist.get(v, np.inf):
+                        dist[v], via[v] = dist[u] + c, i
+                        changed = True
+            if not changed:
+                break
+        if "sink" not in dist:
+            return seats, cost
+        v = "sink"
+        while v != "source":
+            i = via[v]
+            edges[i][1] -= 1
+            edges[edges[i][3]][1] += 1
+            v = edges[edges[i][3]][0]
+        seats += 1
+        cost += dist["sink"]
+
+
+def _check_feasible(problem, allocator):
+    ranked = {
+        (int(s), int(e)): int(k)
+        for s, e, k in zip(problem.student, problem.elective, problem.category)
+    }
+    got = Counter()
+    for s, e, _ in allocator.assignments():
+        got[(s, ranked[(s, e)])] += 1
+    for (s, k), n in got.items():
+        assert n <= problem.quota[s][k]
+    load = np.bincount(
+        [e for _, e, _ in allocator.assignments()], minlength=problem.n_electives
+    )
+    assert (load <= problem.capacity).all()
+    return got
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_solve_matches_a_reference_min_cost_flow(seed):
+    problem = _problem(seed)
+    allocator = Allocator(problem)
+    allocator.solve(np.random.default_rng(seed).permutation(problem.n_students))
+
+    got = _check_feasible(problem, allocator)
+    cost = sum(p for _, _, p in allocator.assignments())
+
+    # as many seats as any allocation could hand out ...
+    wanted = Counter()
+    for s, k in zip(problem.student.tolist(), problem.category.tolist()):
+        wanted[(s, k)] += 1
+    most = {(s, k): min(n, int(problem.quota[s][k])) for (s, k), n in wanted.items()}
+    assert sum(got.values()) == _reference(problem, most)[0]
+    # ... at the lowest total priority for who got how many
+    assert (sum(got.values()), cost) == _reference(problem, got)
+
+
+def test_unlimited_seats_give_everyone_their_top_picks():
+    problem = _problem(0)
+    problem.capacity[:] = UNLIMITED
+    allocator = Allocator(problem)
+    allocator.solve()
+
+    for s in range(problem.n_students):
+        tech, hum = allocator.prefs[s]
+        for k, prefs in ((TECH, tech), (HUM, hum)):
+            top = sorted(prefs, key=prefs.__getitem__)[: problem.quota[s][k]]
+            assert set(top) <= allocator.assigned[s]
@@ -0,0 +1,115 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from src.domain.exceptions import AllocationInputError, ElectiveNotFoundError
+from src.services.allocation_service import _tie_break_key, build_problem
+from src.services.allocation_simulation import TieBreak
+from tests.factories import course, elective, ranking, user
+
+
+@pytest.fixture
+def catalog():
+    """B24 (2 Tech, 0 Hum) and B23 (0 Tech, 1 Hum), sharing electives."""
+    b24, b23 = course("B24", 2, 0), course("B23", 0, 1)
+    electives = [
+        elective("T1", "Tech", [b24, b23]),
+        elective("T2", "Tech", [b24, b23]),
+        elective("H1", "Hum", [b23]),
+    ]
+    return [b24, b23], electives
+
+
+def _seats(electives, seats=5):
+    return {e.id: seats for e in electives}
+
+
+def test_quotas_come_from_the_students_own_course(catalog):
+    (b24, b23), (t1, t2, h1) = catalog
+    # mostly B24's electives, but on B23
+    student = user("alice", course=b23)
+    problem = build_problem(
+        ranking(student.id, [t1, t2, h1]),
+        [t1, t2, h1],
+        [b24, b23],
+        [student],
+        capacities=_seats([t1, t2, h1]),
+    )
+    assert problem.student_ids == [student.id]
+    assert problem.quota.tolist() == [[0, 1]]
+    assert len(problem.elective) == 3
+
+
+def test_students_without_a_course_are_rejected(catalog):
+    courses, electives = catalog
+    student = user("alice")
+    with pytest.raises(AllocationInputError, match="no course"):
+        build_problem(
+            ranking(student.id, electives[:1]),
+            electives,
+            courses,
+            [student],
+            capacities=_seats(electives),
+        )
+
+
+def test_choices_outside_the_course_are_rejected_not_dropped(catalog):
+    (b24, b23), (t1, t2, h1) = catalog
+    student = user("alice", course=b24)
+    with pytest.raises(AllocationInputError, match="does not offer"):
+        build_problem(
+            ranking(student.id, [t1, h1]),
+            [t1, t2, h1],
+            [b24, b23],
+            [student],
+            capacities=_seats([t1, t2, h1]),
+        )
+
+
+def test_every_elective_needs_a_seat_count(catalog):
+    courses, electives = catalog
+    student = user("alice", course=courses[0])
+    choices = ranking(student.id, electives[:1])
+
+    with pytest.raises(AllocationInputError, match="no seat count"):
+        build_problem(
+            choices, electives, courses, [student], capacities=_seats(electives[:2])
+        )
+    with pytest.raises(ElectiveNotFoundError):
+        build_problem(
+            choices,
+            electives[:2],
+            courses,
+            [student],
+            capacities=_seats(electives),
+        )
+
+    problem = build_problem(
+        choices, electives, courses, [student], capacities=_seats(electives, 0)
+    )
+    assert np.array_equal(problem.capacity, [0, 0, 0])
+
+
+def test_submission_order_is_the_first_submission(catalog):
+    (b24, _), (t1, t2, _) = catalog
+    early, late, never = (user(n, course=b24) for n in ("early", "late", "never"))
+    early.first_choice_at = datetime(2026, 9, 1, tzinfo=timezone.utc)
+    late.first_choice_at = datetime(2026, 9, 2, tzinfo=timezone.utc)
+    # `early` edited their ranking last, which must not move them back
+    choices = (
+        ranking(late.id, [t1])
+        + ranking(never.id, [t2])
+        + [c.model_copy(update={"created_at": _now()}) for c in ranking(early.id, [t1])]
+    )
+    problem = build_problem(
+        choices, [t1, t2], [b24], [early, late, never], capacities=_seats([t1, t2])
+    )
+
+    key = _tie_break_key(TieBreak.SUBMISSION, problem, [early, late, never])
+    order = [problem.student_ids[s] for s in np.argsort(key)]
+    assert order == [early.id, late.id, never.id]
+
+
+def _now():
+    return datetime.now(timezone.utc)
@@ -0,0 +1,36 @@
+import asyncio
+
+from src.infrastructure.memory.store import MemoryStore
+from src.infrastructure.memory.uow import InMemoryAsyncUnitOfWork, InMemoryUnitOfWork
+from src.services.elective_service import ElectiveService
+from tests.factories import course, elective
+
+
+class _Recording(InMemoryAsyncUnitOfWork):
+    def __init__(self, store):
+        super().__init__(store)
+        self.sent = []
+
+    def publish(self, topic, key=""):
+        self.sent.append((topic, key))
+
+
+def test_deleting_nothing_invalidates_nothing():
+    store = MemoryStore()
+    b24 = course()
+    t1 = elective("T1", "Tech", [b24])
+    with InMemoryUnitOfWork(store) as uow:
+        uow.courses.add(b24)
+        uow.electives.add(t1)
+
+    missing = _Recording(store)
+    assert not asyncio.run(ElectiveService().delete_elective(course().id, missing))
+    assert missing.sent == []
+
+    found = _Recording(store)
+    assert asyncio.run(ElectiveService().delete_elective(t1.id, found))
+    assert found.sent == [("catalog", "")]
+
+    empty = _Recording(store)
+    assert asyncio.run(ElectiveService().delete_all_electives(empty)) == 0
+    assert empty.sent == []
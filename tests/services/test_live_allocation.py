@@ -0,0 +1,162 @@
+import threading
+
+import pytest
+
+from src.domain.exceptions import AllocationPendingError
+from src.infrastructure.memory.store import MemoryStore
+from src.infrastructure.memory.uow import InMemoryUnitOfWork
+from src.services.allocation_service import AllocationService
+from tests.factories import course, elective, ranking, user
+
+
+@pytest.fixture
+def catalog():
+    """Two Tech and two Hum electives of one course, one seat of each kind."""
+    b24 = course(tech_quota=1, hum_quota=1)
+    electives = {
+        code: elective(code, category, [b24])
+        for code, category in [
+            ("T1", "Tech"),
+            ("T2", "Tech"),
+            ("H1", "Hum"),
+            ("H2", "Hum"),
+        ]
+    }
+    store = MemoryStore()
+    with InMemoryUnitOfWork(store) as uow:
+        uow.courses.add(b24)
+        for e in electives.values():
+            uow.electives.add(e)
+            uow.electives.set_courses(e.id, [b24.id])
+        for name in ("alice", "bob"):
+            uow.users.add(user(name, course=b24))
+    return store, electives
+
+
+def _ids(store, *names):
+    with InMemoryUnitOfWork(store) as uow:
+        return [uow.users.get_by_sso_id(name).id for name in names]
+
+
+def _seats_for_all(electives, seats=10):
+    return {e.id: seats for e in electives.values()}
+
+
+@pytest.fixture
+def service():
+    svc = AllocationService()
+    yield svc
+
+    def reset():
+        AllocationService._live = AllocationService._snapshot = None
+        AllocationService._never_run = False
+
+    svc._serially(reset)
+
+
+def _choose(store, user_id, electives):
+    with InMemoryUnitOfWork(store) as uow:
+        uow.choices.replace_for_user(user_id, ranking(user_id, electives))
+
+
+def _settle(svc):
+    """Wait for the queued changes to the live allocation."""
+    svc._serially(lambda: None)
+
+
+def _seats(svc, store, user_id):
+    return {
+        a.elective_id
+        for a in svc.current_assignment(user_id, InMemoryUnitOfWork(store))
+    }
+
+
+def test_switch_to_an_elective_nobody_has_chosen(catalog, service):
+    store, e = catalog
+    alice, bob = _ids(store, "alice", "bob")
+    _choose(store, alice, [e["T1"], e["H1"]])
+    _choose(store, bob, [e["T2"], e["H1"]])
+    service.allocate(InMemoryUnitOfWork(store), capacities=_seats_for_all(e))
+
+    # H2 was in no choice row when the live allocation was built
+    _choose(store, alice, [e["T1"], e["H2"]])
+    service.choices_changed(str(alice), InMemoryUnitOfWork(store))
+    _settle(service)
+
+    assert AllocationService._live is not None
+    assert _seats(service, store, alice) == {e["T1"].id, e["H2"].id}
+    assert _seats(service, store, bob) == {e["T2"].id, e["H1"].id}
+
+
+def test_failed_update_drops_the_live_allocation(catalog, service, monkeypatch):
+    store, e = catalog
+    (alice,) = _ids(store, "alice")
+    _choose(store, alice, [e["T1"]])
+    service.run(InMemoryUnitOfWork(store), capacities=_seats_for_all(e))
+
+    def broken(updates):
+        raise IndexError("boom")
+
+    monkeypatch.setattr(AllocationService._live.allocator, "replace_students", broken)
+    _choose(store, alice, [e["T2"]])
+    service.choices_changed(str(alice), InMemoryUnitOfWork(store))
+    _settle(service)
+
+    # the next read rebuilds from the stored choices
+    with pytest.raises(AllocationPendingError):
+        _seats(service, store, alice)
+    _settle(service)
+    assert _seats(service, store, alice) == {e["T2"].id}
+
+
+def test_rebuild_follows_the_latest_run(catalog, service):
+    store, e = catalog
+    alice, bob = _ids(store, "alice", "bob")
+    _choose(store, alice, [e["T1"], e["T2"]])
+    _choose(store, bob, [e["T1"], e["T2"]])
+    capacities = {**_seats_for_all(e), e["T1"].id: 1}
+    service.run(InMemoryUnitOfWork(store), capacities=capacities, seed=7)
+    before = {u: _seats(service, store, u) for u in (alice, bob)}
+
+    service.drop_live()
+    _settle(service)
+    assert AllocationService._live is None
+    _seats(service, store, alice)
+    _settle(service)
+    assert AllocationService._live is not None
+    after = {u: _seats(service, store, u) for u in (alice, bob)}
+
+    assert after == before
+    assert sorted(len(s) for s in after.values()) == [1, 1]
+    assert {e["T1"].id, e["T2"].id} == before[alice] | before[bob]
+
+
+def test_reads_do_not_wait_for_a_rebuild(catalog, service):
+    store, e = catalog
+    (alice,) = _ids(store, "alice")
+    _choose(store, alice, [e["T1"]])
+    service.run(InMemoryUnitOfWork(store), capacities=_seats_for_all(e))
+    service.drop_live()
+    _settle(service)
+
+    # hold the live allocation's thread so the rebuild cannot start
+    release = threading.Event()
+    service._live_thread.submit(release.wait)
+    try:
+        _choose(store, alice, [e["T2"]])
+        assert _seats(service, store, alice) == {e["T1"].id}
+    finally:
+        release.set()
+    _settle(service)
+
+    assert _seats(service, store, alice) == {e["T2"].id}
+
+
+def test_no_run_yet(catalog, service):
+    store, e = catalog
+    (alice,) = _ids(store, "alice")
+
+    with pytest.raises(AllocationPendingError):
+        _seats(service, store, alice)
+    _settle(service)
+    assert _seats(service, store, alice) == set()
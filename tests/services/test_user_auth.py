@@ -0,0 +1,103 @@
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from src.infrastructure.memory.store import MemoryStore
+from src.infrastructure.memory.uow import InMemoryAsyncUnitOfWork
+from src.services import user_cache as user_cache_module
+from src.services.user_cache import UserCache
+from src.services.user_service import UserService
+from tests.factories import user
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A settable `time` for `UserCache`, starting at 1000.0."""
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(
+        user_cache_module,
+        "time",
+        SimpleNamespace(time=lambda: now.value, monotonic=lambda: now.value),
+    )
+    return now
+
+
+@pytest.fixture
+def cache(clock):
+    return UserCache(maxsize=10, ttl=60, remember_changes_for=3600)
+
+
+def test_token_issued_right_after_a_change_is_trusted(cache, clock):
+    user_id = uuid4()
+    clock.value = 1010.2
+    cache.invalidate(user_id)
+
+    assert cache.changed_since(user_id, 1010.1)
+    assert not cache.changed_since(user_id, 1010.3)
+
+
+def test_tokens_from_before_the_process_started_are_not_trusted(cache):
+    assert cache.changed_since(uuid4(), 999.0)
+    assert not cache.changed_since(uuid4(), 1000.5)
+
+
+def test_clear_distrusts_older_tokens(cache, clock):
+    clock.value = 1050.0
+    cache.clear()
+
+    assert cache.changed_since(uuid4(), 1049.0)
+    assert not cache.changed_since(uuid4(), 1051.0)
+
+
+def test_a_load_that_raced_an_invalidation_is_not_cached(cache):
+    alice = user("alice")
+    generation = cache.generation()
+    # the change lands while the old row is being read
+    cache.invalidate(alice.id)
+    cache.put(alice, generation)
+    assert cache.get(alice.id) is None
+
+    cache.put(alice, cache.generation())
+    assert cache.get(alice.id) == alice
+
+
+class _Recording(InMemoryAsyncUnitOfWork):
+    def __init__(self, store):
+        super().__init__(store)
+        self.sent = []
+
+    def publish(self, topic, key=""):
+        self.sent.append((topic, key))
+
+
+def _login(store, role="Student"):
+    uow = _Recording(store)
+    user = asyncio.run(
+        UserService().register_sso(
+            sso_id="alice", name="Alice", email="alice@example.com", role=role, uow=uow
+        )
+    )
+    return user, uow.sent
+
+
+def test_login_without_changes_publishes_nothing():
+    store = MemoryStore()
+    _login(store)
+
+    user, sent = _login(store)
+
+    assert sent == []
+    assert user.role == "Student"
+
+
+def test_login_with_a_new_role_publishes_the_user():
+    store = MemoryStore()
+    first, _ = _login(store)
+
+    user, sent = _login(store, role="Admin")
+
+    assert user.id == first.id
+    assert user.role == "Admin"
+    assert sent == [("user", str(user.id))]
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from src.domain.exceptions import CourseNotFoundError, ElectiveNotOfferedError
+from src.infrastructure.memory.store import MemoryStore
+from src.infrastructure.memory.uow import InMemoryAsyncUnitOfWork, InMemoryUnitOfWork
+from src.services.user_service import UserService
+from tests.factories import course, elective, ranking, user
+
+
+class _Recording(InMemoryAsyncUnitOfWork):
+    def __init__(self, store):
+        super().__init__(store)
+        self.sent = []
+
+    def publish(self, topic, key=""):
+        self.sent.append((topic, key))
+
+
+@pytest.fixture
+def store():
+    """Alice on no course, T1 offered to B24 only and T2 to B23 as well."""
+    b24, b23 = course("B24"), course("B23")
+    t1 = elective("T1", "Tech", [b24])
+    t2 = elective("T2", "Tech", [b24, b23])
+    store = MemoryStore()
+    with InMemoryUnitOfWork(store) as uow:
+        for c in (b24, b23):
+            uow.courses.add(c)
+        for e in (t1, t2):
+            uow.electives.add(e)
+            uow.electives.set_courses(e.id, e.course_ids)
+        uow.users.add(user("alice"))
+    return store
+
+
+def _get(store, sso_id=None, name=None):
+    with InMemoryUnitOfWork(store) as uow:
+        if sso_id:
+            return uow.users.get_by_sso_id(sso_id)
+        return uow.courses.get_by_name(name)
+
+
+def test_set_course_publishes_the_user_and_their_choices(store):
+    alice, b24 = _get(store, sso_id="alice"), _get(store, name="B24")
+    uow = _Recording(store)
+
+    updated = asyncio.run(UserService().set_course(alice.id, b24.id, uow))
+
+    assert updated.course_id == b24.id
+    assert _get(store, sso_id="alice").course_id == b24.id
+    assert sorted(uow.sent) == [("choices", str(alice.id)), ("user", str(alice.id))]
+
+
+def test_course_must_offer_what_the_student_chose(store):
+    alice = _get(store, sso_id="alice")
+    b24, b23 = _get(store, name="B24"), _get(store, name="B23")
+    asyncio.run(UserService().set_course(alice.id, b24.id, _Recording(store)))
+    with InMemoryUnitOfWork(store) as uow:
+        t1 = uow.electives.get_by_code("T1")
+        uow.choices.replace_for_user(alice.id, ranking(alice.id, [t1]))
+
+    with pytest.raises(ElectiveNotOfferedError):
+        asyncio.run(UserService().set_course(alice.id, b23.id, _Recording(store)))
+    with pytest.raises(ElectiveNotOfferedError):
+        asyncio.run(UserService().set_course(alice.id, None, _Recording(store)))
+    assert _get(store, sso_id="alice").course_id == b24.id
+
+
+def test_unknown_course(store):
+    alice = _get(store, sso_id="alice")
+    with pytest.raises(CourseNotFoundError):
+        asyncio.run(
+            UserService().set_course(alice.id, course("X").id, _Recording(store))
+        )
+
+
+def test_deleting_a_course_takes_its_students_off_it(store):
+    alice, b24 = _get(store, sso_id="alice"), _get(store, name="B24")
+    asyncio.run(UserService().set_course(alice.id, b24.id, _Recording(store)))
+    with InMemoryUnitOfWork(store) as uow:
+        uow.courses.delete(b24.id)
+    assert _get(store, sso_id="alice").course_id is None